@@ -1,10 +1,24 @@
 import asyncio
 import functools
+import multiprocessing
+import typing
 
+import definition.entity.solution
+
+import libs.codec
+import libs.hub
+import libs.in_memory.frame_cache
+import libs.in_memory.job_deduplicator
+import libs.in_memory.routing_index
+import libs.in_memory.timer_wheel
 import libs.kafka.consumer
+import libs.kafka.producer
 import libs.logger
 import libs.rabbitmq.producer
+import libs.redis.job_deduplicator
+import libs.redis.job_reconciler
 import libs.server
+import libs.supervisor
 
 import apps.node_server.settings
 import apps.node_server.usecase
@@ -12,6 +26,7 @@ import apps.node_server.usecase
 
 async def main(
     cfg: apps.node_server.settings.Settings,
+    stats_queue: typing.Optional[multiprocessing.Queue] = None,
 ) -> None:
     logger = libs.logger.get(
         name=cfg.logger.name,
@@ -23,49 +38,178 @@ async def main(
         user=cfg.job_producer.rabbitmq_user,
         password=cfg.job_producer.rabbitmq_password,
         exchange=cfg.job_producer.rabbitmq_exchange,
+        window_size=cfg.job_producer.rabbitmq_confirm_window,
     )
     await job_producer.open()
 
+    job_deduplicator = libs.in_memory.job_deduplicator.Deduplicator(
+        window_size=cfg.job_deduplicator.window_size,
+    )
+    if cfg.job_deduplicator.shared:
+        job_deduplicator = libs.redis.job_deduplicator.Deduplicator(
+            local=job_deduplicator,
+            logger=logger,
+            redis_dsn=cfg.job_deduplicator.redis_dsn,
+            window_seconds=cfg.job_deduplicator.window_seconds,
+        )
+    await job_deduplicator.open()
+
+    server = libs.server.Server(
+        port=cfg.server.port,
+        reuse_port=cfg.server.processes > 1,
+        subprotocols=libs.codec.SUBPROTOCOLS if cfg.server.binary_protocol else (),
+    )
+
     solution_consumer_factory = libs.kafka.consumer.ConsumerFactory(
         servers=cfg.solution_consumer.kafka_servers,
         user=cfg.solution_consumer.kafka_user,
         password=cfg.solution_consumer.kafka_password,
         topic=cfg.solution_consumer.kafka_topic,
+        broadcast=cfg.solution_consumer.kafka_broadcast,
+        start_lag=cfg.solution_consumer.kafka_start_lag,
+        start_seconds_ago=cfg.solution_consumer.kafka_start_seconds_ago,
+        partitions=cfg.solution_consumer.kafka_partitions,
     )
+    timer_wheel = libs.in_memory.timer_wheel.TimerWheel(
+        logger=logger,
+    )
+    timer_wheel.open()
 
-    server = libs.server.Server(
-        port=cfg.server.port,
+    job_broadcaster: typing.Optional[libs.kafka.producer.Producer] = None
+    job_reconciler: typing.Optional[libs.redis.job_reconciler.Reconciler] = None
+    if cfg.job_broadcaster.fast_path:
+        job_broadcaster = libs.kafka.producer.Producer(
+            servers=cfg.job_broadcaster.kafka_servers,
+            user=cfg.job_broadcaster.kafka_user,
+            password=cfg.job_broadcaster.kafka_password,
+            topic=cfg.job_broadcaster.kafka_topic,
+            get_key=lambda job: job.task_id,
+            profile=cfg.job_broadcaster.kafka_profile,
+            logger=logger,
+        )
+        await job_broadcaster.open()
+        job_reconciler = libs.redis.job_reconciler.Reconciler(
+            timer_wheel=timer_wheel,
+            job_producer=job_producer,
+            logger=logger,
+            redis_dsn=cfg.job_broadcaster.redis_dsn,
+            delay_seconds=cfg.job_broadcaster.reconcile_delay_seconds,
+            attempts=cfg.job_broadcaster.reconcile_attempts,
+        )
+        await job_reconciler.open()
+
+    solution_hub = libs.hub.RoutingHub(
+        consumer=await solution_consumer_factory.spawn(),
+        message_cls=definition.entity.solution.SolutionTransferData,
+        logger=logger,
+        index=libs.in_memory.routing_index.Index(
+            timer_wheel=timer_wheel,
+            wait_time_seconds=cfg.solution_broadcaster.wait_time_seconds,
+        ),
+        get_route=lambda solution_data: (solution_data.solution_height, solution_data.solution_target),
+        queue_size=cfg.solution_broadcaster.queue_size,
+        batch_size=cfg.solution_broadcaster.kafka_batch_size,
+    )
+    solution_hub.open(
+        on_stop=server.stop,
+    )
+    solution_frame_cache = libs.in_memory.frame_cache.Cache(
+        max_size=cfg.solution_broadcaster.frame_cache_size,
     )
 
+    stats_task = asyncio.get_event_loop().create_task(libs.supervisor.report_stats(
+        get_stats=lambda: {
+            **server.stats(),
+            **job_deduplicator.stats(),
+            **(job_reconciler.stats() if job_reconciler is not None else {}),
+            **(job_broadcaster.stats() if job_broadcaster is not None else {}),
+        },
+        logger=logger,
+        interval_seconds=cfg.server.stats_interval_seconds,
+        stats_queue=stats_queue,
+    ))
+
     logger.debug(f"Starting server")
     try:
         await server.start(
             handler=functools.partial(
                 apps.node_server.usecase.handle_node_connection,
                 logger=logger,
-                solution_consumer_factory=solution_consumer_factory,
+                solution_hub=solution_hub,
                 job_producer=job_producer,
+                job_deduplicator=job_deduplicator,
+                solution_frame_cache=solution_frame_cache,
+                job_broadcaster=job_broadcaster,
+                job_reconciler=job_reconciler,
+                job_window_size=cfg.job_producer.connection_window,
+                solution_batch_window_seconds=cfg.solution_broadcaster.batch_window_seconds,
+                solution_batch_size=cfg.solution_broadcaster.batch_size,
             ),
         )
     except Exception as exc:
         logger.exception(exc)
         logger.debug(f"Server halt")
     finally:
+        stats_task.cancel()
+        await solution_hub.close(
+            logger=logger,
+        )
+        timer_wheel.close()
+        if job_reconciler is not None:
+            await job_reconciler.close(
+                logger=logger,
+            )
+        if job_broadcaster is not None:
+            await job_broadcaster.close(
+                logger=logger,
+            )
+        await job_deduplicator.close(
+            logger=logger,
+        )
         await job_producer.close(
             logger=logger,
         )
         logger.debug(f"Server stopped")
 
 
+def run(
+    cfg: apps.node_server.settings.Settings,
+    stats_queue: typing.Optional[multiprocessing.Queue] = None,
+) -> None:
+    libs.logger.configure(
+        level=cfg.logger.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=cfg,
+        stats_queue=stats_queue,
+    ))
+
+
 if __name__ == "__main__":
     import simple_dataclass_settings
 
     simple_dataclass_settings.read_envfile()
     settings = simple_dataclass_settings.populate(apps.node_server.settings.Settings)
-    libs.logger.configure(
-        level=settings.logger.root_level,
-    )
 
-    asyncio.run(main(
-        cfg=settings,
-    ))
+    if settings.server.processes > 1:
+        libs.logger.configure(
+            level=settings.logger.root_level,
+        )
+        libs.supervisor.Supervisor(
+            target=functools.partial(
+                run,
+                settings,
+            ),
+            processes=settings.server.processes,
+            logger=libs.logger.get(
+                name=settings.logger.name,
+                level=settings.logger.level,
+            ),
+            stop_wait_time_seconds=settings.server.stop_wait_time_seconds,
+            stats_interval_seconds=settings.server.stats_interval_seconds,
+        ).run()
+    else:
+        run(
+            cfg=settings,
+        )
@@ -37,6 +37,23 @@ class _SolutionConsumer:
         var="NODE_SERVER_KAFKA_TOPIC",
         default="solution",
     )
+    kafka_broadcast: bool = simple_dataclass_settings.field.bool_(
+        var="NODE_SERVER_KAFKA_BROADCAST",
+        default=True,
+    )
+    kafka_start_lag: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_KAFKA_START_LAG",
+        default=0,
+    )
+    kafka_start_seconds_ago: float = simple_dataclass_settings.field.float(
+        var="NODE_SERVER_KAFKA_START_SECONDS_AGO",
+        default=0,
+    )
+    kafka_partitions: typing.Sequence[int] = simple_dataclass_settings.field.list(
+        var="NODE_SERVER_KAFKA_PARTITIONS",
+        sub_cast=int,
+        default=(),
+    )
 
 
 @simple_dataclass_settings.settings
@@ -45,6 +62,26 @@ class _SolutionBroadcaster:
         var="NODE_SERVER_SOLUTION_WAIT_TIME_SECONDS",
         default=20 * 60,
     )
+    queue_size: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SOLUTION_QUEUE_SIZE",
+        default=16,
+    )
+    kafka_batch_size: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SOLUTION_KAFKA_BATCH_SIZE",
+        default=100,
+    )
+    frame_cache_size: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SOLUTION_FRAME_CACHE_SIZE",
+        default=64,
+    )
+    batch_window_seconds: float = simple_dataclass_settings.field.float(
+        var="NODE_SERVER_SOLUTION_BATCH_WINDOW_SECONDS",
+        default=0,
+    )
+    batch_size: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SOLUTION_BATCH_SIZE",
+        default=64,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -65,6 +102,74 @@ class _JobProducer:
         var="NODE_SERVER_RABBITMQ_EXCHANGE",
         default="job",
     )
+    rabbitmq_confirm_window: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_RABBITMQ_CONFIRM_WINDOW",
+        default=32,
+    )
+    connection_window: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_JOB_CONNECTION_WINDOW",
+        default=16,
+    )
+
+
+@simple_dataclass_settings.settings
+class _JobDeduplicator:
+    window_size: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_JOB_DEDUPLICATOR_WINDOW_SIZE",
+        default=1024,
+    )
+    shared: bool = simple_dataclass_settings.field.bool_(
+        var="NODE_SERVER_JOB_DEDUPLICATOR_SHARED",
+        default=False,
+    )
+    redis_dsn: str = simple_dataclass_settings.field.str(
+        var="NODE_SERVER_JOB_DEDUPLICATOR_REDIS_DSN",
+        default="redis://redis:6379/",
+    )
+    window_seconds: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_JOB_DEDUPLICATOR_WINDOW_SECONDS",
+        default=60,
+    )
+
+
+@simple_dataclass_settings.settings
+class _JobBroadcaster:
+    fast_path: bool = simple_dataclass_settings.field.bool_(
+        var="NODE_SERVER_JOB_BROADCASTER_FAST_PATH",
+        default=False,
+    )
+    kafka_servers: typing.Sequence[str] = simple_dataclass_settings.field.list(
+        var="NODE_SERVER_JOB_BROADCASTER_KAFKA_SERVERS",
+        default=("kafka:9093",),
+    )
+    kafka_user: str = simple_dataclass_settings.field.str(
+        var="NODE_SERVER_JOB_BROADCASTER_KAFKA_USER",
+        default="kafka",
+    )
+    kafka_password: str = simple_dataclass_settings.field.str(
+        var="NODE_SERVER_JOB_BROADCASTER_KAFKA_PASSWORD",
+        default="kafka_password",
+    )
+    kafka_topic: str = simple_dataclass_settings.field.str(
+        var="NODE_SERVER_JOB_BROADCASTER_KAFKA_TOPIC",
+        default="job",
+    )
+    kafka_profile: str = simple_dataclass_settings.field.str(
+        var="NODE_SERVER_JOB_BROADCASTER_KAFKA_PROFILE",
+        default="latency",
+    )
+    redis_dsn: str = simple_dataclass_settings.field.str(
+        var="NODE_SERVER_JOB_BROADCASTER_REDIS_DSN",
+        default="redis://redis:6379/",
+    )
+    reconcile_delay_seconds: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_JOB_BROADCASTER_RECONCILE_DELAY_SECONDS",
+        default=30,
+    )
+    reconcile_attempts: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_JOB_BROADCASTER_RECONCILE_ATTEMPTS",
+        default=3,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -73,6 +178,22 @@ class _Server:
         var="NODE_SERVER_SERVER_PORT",
         default=8001,
     )
+    binary_protocol: bool = simple_dataclass_settings.field.bool_(
+        var="NODE_SERVER_SERVER_BINARY_PROTOCOL",
+        default=False,
+    )
+    processes: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SERVER_PROCESSES",
+        default=1,
+    )
+    stop_wait_time_seconds: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SERVER_STOP_WAIT_TIME_SECONDS",
+        default=30,
+    )
+    stats_interval_seconds: int = simple_dataclass_settings.field.int(
+        var="NODE_SERVER_SERVER_STATS_INTERVAL_SECONDS",
+        default=60,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -81,4 +202,6 @@ class Settings:
     solution_consumer: _SolutionConsumer
     solution_broadcaster: _SolutionBroadcaster
     job_producer: _JobProducer
+    job_deduplicator: _JobDeduplicator
+    job_broadcaster: _JobBroadcaster
     server: _Server
@@ -1,24 +1,38 @@
 import asyncio
+import datetime
 import functools
 import logging
 import typing
 
 import definition.entity.job
 import definition.entity.solution
-import definition.consumer
+import definition.frame_cache
+import definition.hub
+import definition.job_deduplicator
+import definition.job_reconciler
 import definition.producer
-import definition.storage.expected_solutions_storage
 import definition.server
 
-import libs.in_memory.expected_solutions_storage
-import libs.json
+import libs.codec
+import libs.frame_batcher
+import libs.in_memory.job_deduplicator
 import libs.parsing
 
 
+def _get_solution_key(
+    solution_data: definition.entity.solution.SolutionTransferData,
+    codec: libs.codec.Codec,
+) -> typing.Tuple[str, str, str]:
+    # the same unique key solution storage deduplicates on
+    return codec.name, solution_data.task_id, str(solution_data.solution["partial_solution"]["nonce"])
+
+
 async def _handle_solution(
     solution_data: definition.entity.solution.SolutionTransferData,
     logger: logging.Logger,
-    expected_solution_storage: definition.storage.expected_solutions_storage.Storage,
+    solution_frame_cache: definition.frame_cache.Cache,
+    codec: libs.codec.Codec,
+    send: typing.Callable[[bytes], typing.Awaitable[None]],
     connection: definition.server.Connection,
 ) -> None:
     log_prefix = (
@@ -27,16 +41,12 @@ async def _handle_solution(
     )
     logger.debug(f"{log_prefix} Got solution data")
 
-    if not expected_solution_storage.is_waits(
-        height=solution_data.solution_height,
-        target=solution_data.solution_target,
-    ):
-        logger.debug(f"{log_prefix} Solution is not eligible")
-        return
-
     try:
-        message = libs.json.dumps(
-            definition.entity.solution.SolutionOutput(**solution_data.solution)
+        message = solution_frame_cache.get(
+            key=_get_solution_key(solution_data, codec),
+            build=lambda: codec.dumps(
+                definition.entity.solution.SolutionOutput(**solution_data.solution)
+            ),
         )
     except Exception as exc:
         logger.debug(f"{log_prefix} Can not create solution message")
@@ -44,7 +54,7 @@ async def _handle_solution(
         return
 
     try:
-        await connection.send(message)
+        await send(message)
         logger.debug(f"{log_prefix} Solution sent")
     except Exception as exc:
         logger.debug(f"{log_prefix} Can not send solution to connection")
@@ -53,112 +63,262 @@ async def _handle_solution(
     logger.debug(f"{log_prefix} Solution processing done")
 
 
-async def _consume_solutions(
-    connection: definition.server.Connection,
-    solution_consumer: definition.consumer.Consumer,
-    expected_solution_storage: definition.storage.expected_solutions_storage.Storage,
+async def _start_job_broadcast(
+    job: definition.entity.job.JobInput,
+    logger: logging.Logger,
+    job_broadcaster: definition.producer.PipelinedProducer,
+    log_prefix: str,
+) -> typing.Optional[typing.Awaitable[None]]:
+    try:
+        # the receive loop does not wait for Kafka, the delivery is checked before the job is persisted
+        return await job_broadcaster.publish(definition.entity.job.JobTransferMetadata(
+            task_id=libs.in_memory.job_deduplicator.get_task_id(job),
+            epoch_challenge=job.epoch_challenge,
+            block_height=job.block_height,
+            created_at=datetime.datetime.utcnow(),
+            proof_target=job.proof_target,
+        ))
+    except Exception as exc:
+        logger.debug(f"{log_prefix}[Height: {job.block_height}] Could not broadcast job ahead of persistence")
+        logger.exception(exc)
+        return None
+
+
+async def _confirm_job_broadcast(
+    job: definition.entity.job.JobInput,
+    broadcast: typing.Awaitable[None],
     logger: logging.Logger,
+    job_reconciler: definition.job_reconciler.Reconciler,
+    log_prefix: str,
 ) -> None:
+    task_id = libs.in_memory.job_deduplicator.get_task_id(job)
+    log_prefix = f"{log_prefix}[Height: {job.block_height}][Task: {task_id}]"
+
     try:
-        await solution_consumer.consume(
-            message_cls=definition.entity.solution.SolutionTransferData,
-            handler=functools.partial(
-                _handle_solution,
-                logger=logger,
-                expected_solution_storage=expected_solution_storage,
-                connection=connection,
-            ),
-            logger=logger,
-        )
+        await broadcast
     except Exception as exc:
-        if not isinstance(exc, definition.consumer.DisconnectError):
-            logger.exception(exc)
-    finally:
-        if connection.open:
-            try:
-                await connection.close(1011)
-            except Exception as exc:
-                logger.exception(exc)
+        logger.debug(f"{log_prefix} Could not broadcast job ahead of persistence")
+        logger.exception(exc)
+        # process_job_worker broadcasts it after persistence then
+        return
+
+    # only a delivered job is persisted without a broadcast of its own
+    job.task_id = task_id
+    logger.debug(f"{log_prefix} Job broadcast ahead of persistence")
+    job_reconciler.track(job)
 
 
-async def _create_connection_consumer(
+def _check_job_confirmation(
+    confirmation: asyncio.Future,
+    job: definition.entity.job.JobInput,
+    job_window: asyncio.Semaphore,
+    job_deduplicator: definition.job_deduplicator.Deduplicator,
     connection: definition.server.Connection,
-    solution_consumer_factory: definition.consumer.ConsumerFactory,
-    expected_solution_storage: definition.storage.expected_solutions_storage.Storage,
     logger: logging.Logger,
-) -> typing.Tuple[definition.consumer.Consumer, asyncio.Task]:
-    solution_consumer = await solution_consumer_factory.spawn()
-    consume_task = asyncio.get_event_loop().create_task(_consume_solutions(
-        connection=connection,
-        solution_consumer=solution_consumer,
-        expected_solution_storage=expected_solution_storage,
-        logger=logger,
-    ))
-    return solution_consumer, consume_task
+    log_prefix: str,
+) -> None:
+    job_window.release()
+    if confirmation.cancelled():
+        return
+
+    exc = confirmation.exception()
+    if exc is None:
+        logger.debug(f"{log_prefix} Job confirmed")
+        return
+
+    logger.debug(f"{log_prefix} Error while processing job")
+    logger.exception(exc, exc_info=exc)
+    # a copy from another node may still get through
+    asyncio.get_event_loop().create_task(job_deduplicator.release(job))
+    if connection.open:
+        asyncio.get_event_loop().create_task(connection.close(1011))
+
+
+async def _release_job(
+    job: definition.entity.job.JobInput,
+    job_deduplicator: definition.job_deduplicator.Deduplicator,
+    logger: logging.Logger,
+) -> None:
+    try:
+        # a copy from another node or a resend after reconnect may still get through
+        await job_deduplicator.release(job)
+    except Exception as exc:
+        logger.exception(exc)
+
+
+async def _publish_jobs(
+    jobs: asyncio.Queue,
+    logger: logging.Logger,
+    job_producer: definition.producer.PipelinedProducer,
+    job_deduplicator: definition.job_deduplicator.Deduplicator,
+    job_reconciler: typing.Optional[definition.job_reconciler.Reconciler],
+    job_window: asyncio.Semaphore,
+    connection: definition.server.Connection,
+    log_prefix: str,
+) -> None:
+    # jobs are taken in receive order, so they reach RabbitMQ in order on the connection channel
+    is_failed = False
+    while True:
+        item = await jobs.get()
+        if item is None:
+            return
+
+        job, broadcast = item
+        if is_failed:
+            job_window.release()
+            await _release_job(job, job_deduplicator, logger)
+            continue
+
+        try:
+            if broadcast is not None:
+                await _confirm_job_broadcast(
+                    job=job,
+                    broadcast=broadcast,
+                    logger=logger,
+                    job_reconciler=job_reconciler,
+                    log_prefix=log_prefix,
+                )
+
+            confirmation = await job_producer.publish(
+                message=job,
+                key=id(connection),
+            )
+        except Exception as exc:
+            job_window.release()
+            logger.debug(f"{log_prefix}[Height: {job.block_height}] Error while processing job")
+            logger.exception(exc)
+            await _release_job(job, job_deduplicator, logger)
+            # jobs left in the queue are released as well, the node sends them again after reconnect
+            is_failed = True
+            if connection.open:
+                await connection.close(1011)
+            continue
+
+        confirmation.add_done_callback(functools.partial(
+            _check_job_confirmation,
+            job=job,
+            job_window=job_window,
+            job_deduplicator=job_deduplicator,
+            connection=connection,
+            logger=logger,
+            log_prefix=f"{log_prefix}[Height: {job.block_height}]",
+        ))
 
 
 async def handle_node_connection(
     connection: definition.server.Connection,
     logger: logging.Logger,
-    solution_consumer_factory: definition.consumer.ConsumerFactory,
-    job_producer: definition.producer.Producer,
+    solution_hub: definition.hub.RoutingHub,
+    job_producer: definition.producer.PipelinedProducer,
+    job_deduplicator: definition.job_deduplicator.Deduplicator,
+    solution_frame_cache: definition.frame_cache.Cache,
+    job_broadcaster: typing.Optional[definition.producer.PipelinedProducer] = None,
+    job_reconciler: typing.Optional[definition.job_reconciler.Reconciler] = None,
+    job_window_size: int = 16,
+    solution_batch_window_seconds: float = 0,
+    solution_batch_size: int = 64,
 ) -> None:
+    codec = libs.codec.get(connection.subprotocol)
+
     log_prefix = f"[Connection {id(connection)}]"
-    logger.debug(f"{log_prefix} Connection started")
+    logger.debug(f"{log_prefix} Connection started ({codec.name})")
 
-    expected_solution_storage = libs.in_memory.expected_solutions_storage.Storage(
-        logger=logger,
-    )
+    job_window = asyncio.Semaphore(job_window_size)
 
-    try:
-        solution_consumer, consume_task = await _create_connection_consumer(
-            connection=connection,
-            solution_consumer_factory=solution_consumer_factory,
-            expected_solution_storage=expected_solution_storage,
+    solution_batcher: typing.Optional[libs.frame_batcher.Batcher] = None
+    if solution_batch_window_seconds > 0:
+        solution_batcher = libs.frame_batcher.Batcher(
+            send=connection.send,
+            join=codec.join,
             logger=logger,
+            window_seconds=solution_batch_window_seconds,
+            max_size=solution_batch_size,
+        )
+
+    try:
+        solution_subscription = solution_hub.subscribe(
+            handler=functools.partial(
+                _handle_solution,
+                logger=logger,
+                solution_frame_cache=solution_frame_cache,
+                codec=codec,
+                send=connection.send if solution_batcher is None else solution_batcher.add,
+                connection=connection,
+            ),
         )
     except Exception as exc:
         logger.exception(exc)
-        logger.debug(f"{log_prefix} Could not start consumer")
+        logger.debug(f"{log_prefix} Could not subscribe to solutions")
         await connection.close(1011)
         return
 
+    jobs: asyncio.Queue = asyncio.Queue()
+    publisher = asyncio.get_event_loop().create_task(_publish_jobs(
+        jobs=jobs,
+        logger=logger,
+        job_producer=job_producer,
+        job_deduplicator=job_deduplicator,
+        job_reconciler=job_reconciler,
+        job_window=job_window,
+        connection=connection,
+        log_prefix=log_prefix,
+    ))
+
     try:
         async for data in connection:
             try:
-                job = libs.parsing.parse(definition.entity.job.JobInput, data)
+                job = libs.parsing.parse(definition.entity.job.JobInput, codec.loads(data))
             except Exception as exc:
                 logger.debug(f"{log_prefix} Got unknown job")
                 logger.exception(exc)
                 continue
+            # task id is assigned by the pool, never taken from a node
+            job.task_id = None
+
+            # registered before publishing, a solution may come back faster than the publish confirmation
+            solution_hub.wait(
+                subscription=solution_subscription,
+                height=job.block_height,
+                target=job.proof_target,
+            )
 
             try:
-                await job_producer.produce(
-                    message=job,
-                )
+                is_claimed = await job_deduplicator.claim(job)
             except Exception as exc:
-                logger.debug(f"{log_prefix}[Height: {job.block_height}] Error while processing job")
+                logger.debug(f"{log_prefix}[Height: {job.block_height}] Could not deduplicate job")
                 logger.exception(exc)
-                await connection.close(1011)
-                break
-            else:
-                expected_solution_storage.wait(
-                    height=job.block_height,
-                    target=job.proof_target,
+                is_claimed = True
+            if not is_claimed:
+                logger.debug(f"{log_prefix}[Height: {job.block_height}] Job is already published by other connection")
+                continue
+
+            if job_window.locked():
+                logger.debug(f"{log_prefix}[Height: {job.block_height}] Job window is full, waiting")
+            await job_window.acquire()
+
+            broadcast = None
+            if job_broadcaster is not None:
+                broadcast = await _start_job_broadcast(
+                    job=job,
+                    logger=logger,
+                    job_broadcaster=job_broadcaster,
+                    log_prefix=log_prefix,
                 )
+            jobs.put_nowait((job, broadcast))
     except Exception as exc:
         logger.debug(f"{log_prefix} Critical error during connection")
         logger.exception(exc)
     finally:
-        if consume_task is not None:
-            if not consume_task.done():
-                consume_task.cancel()
+        # jobs already received are still published
+        jobs.put_nowait(None)
+        try:
+            await publisher
+        except Exception as exc:
+            logger.exception(exc)
 
-        expected_solution_storage.close()
+        solution_hub.unsubscribe(solution_subscription)
 
-        if solution_consumer is not None:
-            await solution_consumer.close(
-                logger=logger,
-            )
+        if solution_batcher is not None:
+            await solution_batcher.close()
 
         logger.debug(f"{log_prefix} Connection closed")
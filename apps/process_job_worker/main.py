@@ -4,9 +4,11 @@ import functools
 import definition.entity.job
 
 import libs.database.storage.job_storage
+import libs.in_memory.job_cache
 import libs.kafka.producer
 import libs.logger
 import libs.rabbitmq.consumer
+import libs.redis.job_cache
 
 import apps.process_job_worker.settings
 import apps.process_job_worker.usecase
@@ -25,14 +27,28 @@ async def main(
         user=cfg.job_consumer.rabbitmq_user,
         password=cfg.job_consumer.rabbitmq_password,
         queue=cfg.job_consumer.rabbitmq_queue,
+        prefetch_count=cfg.job_consumer.rabbitmq_prefetch_count,
+        concurrency=cfg.job_consumer.rabbitmq_concurrency,
+        max_attempts=cfg.job_consumer.rabbitmq_max_attempts,
     )
     await job_consumer.open()
 
-    job_storage = libs.database.storage.job_storage.Storage(
-        db_dsn=cfg.job_storage.postgresql_dsn,
-        redis_dsn=cfg.job_storage.redis_dsn,
-        record_ttl_seconds=cfg.job_storage.record_ttl_seconds,
-    )
+    if cfg.job_storage.micro_batching:
+        # concurrent handlers share upsert transactions
+        job_storage = libs.database.storage.job_storage.BatchStorage(
+            db_dsn=cfg.job_storage.postgresql_dsn,
+            redis_dsn=cfg.job_storage.redis_dsn,
+            record_ttl_seconds=cfg.job_storage.record_ttl_seconds,
+            batch_size=cfg.job_storage.batch_size,
+            batch_delay_seconds=cfg.job_storage.batch_delay_seconds,
+            batches_in_flight=cfg.job_storage.batches_in_flight,
+        )
+    else:
+        job_storage = libs.database.storage.job_storage.Storage(
+            db_dsn=cfg.job_storage.postgresql_dsn,
+            redis_dsn=cfg.job_storage.redis_dsn,
+            record_ttl_seconds=cfg.job_storage.record_ttl_seconds,
+        )
     await job_storage.open()
 
     job_producer = libs.kafka.producer.Producer(
@@ -40,9 +56,25 @@ async def main(
         user=cfg.job_producer.kafka_user,
         password=cfg.job_producer.kafka_password,
         topic=cfg.job_producer.kafka_topic,
+        get_key=lambda job: job.task_id,
+        profile=cfg.job_producer.kafka_profile,
+        logger=logger,
     )
     await job_producer.open()
 
+    job_cache = None
+    if cfg.job_cache.shared:
+        # stored jobs are shared with process_solution_worker, only the redis tier matters here
+        job_cache = libs.redis.job_cache.Cache(
+            local=libs.in_memory.job_cache.Cache(
+                max_size=1,
+            ),
+            logger=logger,
+            redis_dsn=cfg.job_cache.redis_dsn,
+            ttl_seconds=cfg.job_cache.ttl_seconds,
+        )
+        await job_cache.open()
+
     logger.debug(f"Starting worker")
     try:
         await job_consumer.consume(
@@ -52,8 +84,11 @@ async def main(
                 logger=logger,
                 job_storage=job_storage,
                 job_producer=job_producer,
+                job_cache=job_cache,
             ),
             logger=logger,
+            # copies of the same height are deduplicated one after another
+            get_key=lambda job: job.block_height,
         )
     except Exception as exc:
         logger.exception(exc)
@@ -68,6 +103,10 @@ async def main(
         await job_consumer.close(
             logger=logger,
         )
+        if job_cache is not None:
+            await job_cache.close(
+                logger=logger,
+            )
         logger.debug(f"Worker stopped")
 
 
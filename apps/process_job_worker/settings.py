@@ -37,6 +37,18 @@ class _JobConsumer:
         var="PROCESS_JOB_WORKER_RABBITMQ_QUEUE",
         default="job.persist_and_broadcast",
     )
+    rabbitmq_prefetch_count: int = simple_dataclass_settings.field.int(
+        var="PROCESS_JOB_WORKER_RABBITMQ_PREFETCH_COUNT",
+        default=32,
+    )
+    rabbitmq_concurrency: int = simple_dataclass_settings.field.int(
+        var="PROCESS_JOB_WORKER_RABBITMQ_CONCURRENCY",
+        default=16,
+    )
+    rabbitmq_max_attempts: int = simple_dataclass_settings.field.int(
+        var="PROCESS_JOB_WORKER_RABBITMQ_MAX_ATTEMPTS",
+        default=5,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -53,6 +65,22 @@ class _JobStorage:
         var="PROCESS_JOB_WORKER_RECORD_TTL_SECONDS",
         default=60 * 60,
     )
+    micro_batching: bool = simple_dataclass_settings.field.bool_(
+        var="PROCESS_JOB_WORKER_STORAGE_MICRO_BATCHING",
+        default=True,
+    )
+    batch_size: int = simple_dataclass_settings.field.int(
+        var="PROCESS_JOB_WORKER_STORAGE_BATCH_SIZE",
+        default=64,
+    )
+    batch_delay_seconds: float = simple_dataclass_settings.field.float(
+        var="PROCESS_JOB_WORKER_STORAGE_BATCH_DELAY_SECONDS",
+        default=0.01,
+    )
+    batches_in_flight: int = simple_dataclass_settings.field.int(
+        var="PROCESS_JOB_WORKER_STORAGE_BATCHES_IN_FLIGHT",
+        default=2,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -73,6 +101,26 @@ class _JobProducer:
         var="PROCESS_JOB_WORKER_KAFKA_TOPIC",
         default="job",
     )
+    kafka_profile: str = simple_dataclass_settings.field.str(
+        var="PROCESS_JOB_WORKER_KAFKA_PROFILE",
+        default="latency",
+    )
+
+
+@simple_dataclass_settings.settings
+class _JobCache:
+    shared: bool = simple_dataclass_settings.field.bool_(
+        var="PROCESS_JOB_WORKER_JOB_CACHE_SHARED",
+        default=False,
+    )
+    redis_dsn: str = simple_dataclass_settings.field.str(
+        var="PROCESS_JOB_WORKER_JOB_CACHE_REDIS_DSN",
+        default="redis://redis:6379/",
+    )
+    ttl_seconds: int = simple_dataclass_settings.field.int(
+        var="PROCESS_JOB_WORKER_JOB_CACHE_TTL_SECONDS",
+        default=60 * 60,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -81,3 +129,4 @@ class Settings:
     job_consumer: _JobConsumer
     job_storage: _JobStorage
     job_producer: _JobProducer
+    job_cache: _JobCache
@@ -1,6 +1,8 @@
 import logging
+import typing
 
 import definition.entity.job
+import definition.job_cache
 import definition.producer
 import definition.storage.job_storage
 
@@ -10,22 +12,45 @@ async def persist_and_broadcast_job(
     logger: logging.Logger,
     job_storage: definition.storage.job_storage.Storage,
     job_producer: definition.producer.Producer,
+    job_cache: typing.Optional[definition.job_cache.Cache] = None,
 ) -> None:
     logger.debug(f"[Height: {job.block_height}] Processing task")
     is_newly_stored, job_storage_metadata = await job_storage.store(job)
-    if not is_newly_stored:
+    if job_cache is not None:
+        await job_cache.put(job_storage_metadata)
+    is_orphan_broadcast = job.task_id is not None and job.task_id != job_storage_metadata.task_id
+    if is_orphan_broadcast:
+        # workers got a task the database does not know, the stored one is broadcast to replace it
+        logger.info(
+            f"[Height: {job.block_height}][Task: {job.task_id}] "
+            f"Broadcast task differs from stored task {job_storage_metadata.task_id}, broadcasting stored task"
+        )
+    elif not is_newly_stored:
         logger.debug(f"[Height: {job.block_height}][Task: {job_storage_metadata.task_id}] Task already processed, skipping")
         return
+    elif job.task_id is not None:
+        # node_server has already broadcast the job, only persistence is left
+        await job_storage.mark_stored(job_storage_metadata)
+        logger.debug(f"[Height: {job.block_height}][Task: {job_storage_metadata.task_id}] Task persisted")
+        return
 
     job_transfer_metadata = definition.entity.job.JobTransferMetadata(
         task_id=job_storage_metadata.task_id,
         epoch_challenge=job.epoch_challenge,
         block_height=job.block_height,
-        created_at=job_storage_metadata.created_at
+        created_at=job_storage_metadata.created_at,
+        proof_target=job.proof_target,
     )
 
     logger.debug(f"[Height: {job.block_height}][Task: {job_storage_metadata.task_id}] Sending task to broadcast")
     await job_producer.produce(job_transfer_metadata)
+    if is_orphan_broadcast:
+        # node_server reconciler stops publishing the replaced task again
+        await job_storage.mark_stored(definition.entity.job.JobStorageMetadata(
+            task_id=job.task_id,
+            block_height=job_storage_metadata.block_height,
+            created_at=job_storage_metadata.created_at,
+        ))
     marked_as_stored = await job_storage.mark_stored(job_storage_metadata)
     if marked_as_stored is False:
         logger.info(
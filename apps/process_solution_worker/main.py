@@ -1,18 +1,38 @@
 import asyncio
 import functools
+import typing
 
+import definition.entity.job
 import definition.entity.solution
 
 import libs.database.storage.job_reader
 import libs.database.storage.solution_storage
+import libs.hub
+import libs.in_memory.job_cache
+import libs.kafka.consumer
 import libs.kafka.producer
 import libs.logger
 import libs.rabbitmq.consumer
+import libs.redis.job_cache
 
 import apps.process_solution_worker.settings
 import apps.process_solution_worker.usecase
 
 
+class Error(Exception):
+    ...
+
+
+def _stop(
+    stop_marker: asyncio.Future,
+    exception: typing.Optional[Exception] = None,
+) -> None:
+    if stop_marker.done():
+        return
+
+    stop_marker.set_result(exception)
+
+
 async def main(
     cfg: apps.process_solution_worker.settings.Settings,
 ):
@@ -26,46 +46,114 @@ async def main(
         user=cfg.solution_consumer.rabbitmq_user,
         password=cfg.solution_consumer.rabbitmq_password,
         queue=cfg.solution_consumer.rabbitmq_queue,
+        prefetch_count=cfg.solution_consumer.rabbitmq_prefetch_count,
+        concurrency=cfg.solution_consumer.rabbitmq_concurrency,
+        max_attempts=cfg.solution_consumer.rabbitmq_max_attempts,
     )
     await solution_consumer.open()
 
-    solution_storage = libs.database.storage.solution_storage.Storage(
-        db_dsn=cfg.solution_storage.postgresql_dsn,
-        redis_dsn=cfg.solution_storage.redis_dsn,
-        record_ttl_seconds=cfg.solution_storage.record_ttl_seconds,
-    )
+    if cfg.solution_storage.micro_batching:
+        # concurrent handlers share upsert transactions
+        solution_storage = libs.database.storage.solution_storage.BatchStorage(
+            db_dsn=cfg.solution_storage.postgresql_dsn,
+            redis_dsn=cfg.solution_storage.redis_dsn,
+            record_ttl_seconds=cfg.solution_storage.record_ttl_seconds,
+            batch_size=cfg.solution_storage.batch_size,
+            batch_delay_seconds=cfg.solution_storage.batch_delay_seconds,
+            batches_in_flight=cfg.solution_storage.batches_in_flight,
+        )
+    else:
+        solution_storage = libs.database.storage.solution_storage.Storage(
+            db_dsn=cfg.solution_storage.postgresql_dsn,
+            redis_dsn=cfg.solution_storage.redis_dsn,
+            record_ttl_seconds=cfg.solution_storage.record_ttl_seconds,
+        )
     await solution_storage.open()
 
-    job_reader = libs.database.storage.job_reader.Reader(
+    job_cache = libs.in_memory.job_cache.Cache(
+        max_size=cfg.job_cache.size,
+        ttl_seconds=cfg.job_cache.ttl_seconds,
+    )
+    if cfg.job_cache.shared:
+        job_cache = libs.redis.job_cache.Cache(
+            local=job_cache,
+            logger=logger,
+            redis_dsn=cfg.job_cache.redis_dsn,
+            ttl_seconds=cfg.job_cache.ttl_seconds,
+        )
+    await job_cache.open()
+
+    job_reader = libs.database.storage.job_reader.CachedReader(
+        cache=job_cache,
         db_dsn=cfg.job_reader.postgresql_dsn,
     )
     await job_reader.open()
 
+    job_hub = None
+    # resolved when the job hub stops, the worker does not go on with a cache that no longer follows the topic
+    job_hub_stop_marker = asyncio.get_event_loop().create_future()
+    if cfg.job_consumer.prewarm:
+        # the cache follows the job topic, the database is left for misses
+        job_hub = libs.hub.Hub(
+            consumer=await libs.kafka.consumer.ConsumerFactory(
+                servers=cfg.job_consumer.kafka_servers,
+                user=cfg.job_consumer.kafka_user,
+                password=cfg.job_consumer.kafka_password,
+                topic=cfg.job_consumer.kafka_topic,
+                broadcast=cfg.job_consumer.kafka_broadcast,
+                start_lag=cfg.job_consumer.kafka_start_lag,
+                start_seconds_ago=cfg.job_consumer.kafka_start_seconds_ago,
+                partitions=cfg.job_consumer.kafka_partitions,
+            ).spawn(),
+            message_cls=definition.entity.job.JobTransferMetadata,
+            logger=logger,
+            observers=(job_cache, ),
+            batch_size=cfg.job_consumer.batch_size,
+        )
+        job_hub.open(
+            on_stop=functools.partial(_stop, job_hub_stop_marker),
+        )
+
     solution_producer = libs.kafka.producer.Producer(
         servers=cfg.solution_producer.kafka_servers,
         user=cfg.solution_producer.kafka_user,
         password=cfg.solution_producer.kafka_password,
         topic=cfg.solution_producer.kafka_topic,
+        # solutions of the same height keep their order
+        get_key=lambda solution: solution.solution_height,
+        profile=cfg.solution_producer.kafka_profile,
+        logger=logger,
     )
     await solution_producer.open()
 
     logger.debug(f"Starting worker")
-    try:
-        await solution_consumer.consume(
-            message_cls=definition.entity.solution.SolutionInput,
-            handler=functools.partial(
-                apps.process_solution_worker.usecase.persist_and_broadcast_solution,
-                logger=logger,
-                solution_storage=solution_storage,
-                job_reader=job_reader,
-                solution_producer=solution_producer,
-            ),
+    worker = asyncio.get_event_loop().create_task(solution_consumer.consume(
+        message_cls=definition.entity.solution.SolutionInput,
+        handler=functools.partial(
+            apps.process_solution_worker.usecase.persist_and_broadcast_solution,
             logger=logger,
+            solution_storage=solution_storage,
+            job_reader=job_reader,
+            solution_producer=solution_producer,
+        ),
+        logger=logger,
+        # copies of the same solution are deduplicated one after another
+        get_key=lambda solution: str(solution.solution["partial_solution"]["nonce"]),
+    ))
+    try:
+        await asyncio.wait(
+            (worker, job_hub_stop_marker),
+            return_when=asyncio.FIRST_COMPLETED,
         )
+        if job_hub_stop_marker.done():
+            raise Error("Job hub stopped") from job_hub_stop_marker.result()
+        await worker
     except Exception as exc:
         logger.exception(exc)
         logger.debug(f"Worker halt")
     finally:
+        if not worker.done():
+            worker.cancel()
         await solution_storage.close(
             logger=logger,
         )
@@ -75,9 +163,16 @@ async def main(
         await solution_consumer.close(
             logger=logger,
         )
+        if job_hub is not None:
+            await job_hub.close(
+                logger=logger,
+            )
         await job_reader.close(
             logger=logger,
         )
+        await job_cache.close(
+            logger=logger,
+        )
         logger.debug(f"Worker stopped")
 
 
@@ -1,3 +1,5 @@
+import typing
+
 import simple_dataclass_settings
 
 
@@ -35,6 +37,18 @@ class _SolutionConsumer:
         var="PROCESS_SOLUTION_WORKER_RABBITMQ_QUEUE",
         default="solution.persist_and_broadcast",
     )
+    rabbitmq_prefetch_count: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_RABBITMQ_PREFETCH_COUNT",
+        default=32,
+    )
+    rabbitmq_concurrency: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_RABBITMQ_CONCURRENCY",
+        default=16,
+    )
+    rabbitmq_max_attempts: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_RABBITMQ_MAX_ATTEMPTS",
+        default=5,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -51,6 +65,22 @@ class _SolutionStorage:
         var="PROCESS_SOLUTION_WORKER_RECORD_TTL_SECONDS",
         default=60 * 60,
     )
+    micro_batching: bool = simple_dataclass_settings.field.bool_(
+        var="PROCESS_SOLUTION_WORKER_STORAGE_MICRO_BATCHING",
+        default=True,
+    )
+    batch_size: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_STORAGE_BATCH_SIZE",
+        default=64,
+    )
+    batch_delay_seconds: float = simple_dataclass_settings.field.float(
+        var="PROCESS_SOLUTION_WORKER_STORAGE_BATCH_DELAY_SECONDS",
+        default=0.01,
+    )
+    batches_in_flight: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_STORAGE_BATCHES_IN_FLIGHT",
+        default=2,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -61,6 +91,71 @@ class _JobReader:
     )
 
 
+@simple_dataclass_settings.settings
+class _JobCache:
+    size: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_JOB_CACHE_SIZE",
+        default=4096,
+    )
+    ttl_seconds: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_JOB_CACHE_TTL_SECONDS",
+        default=60 * 60,
+    )
+    shared: bool = simple_dataclass_settings.field.bool_(
+        var="PROCESS_SOLUTION_WORKER_JOB_CACHE_SHARED",
+        default=False,
+    )
+    redis_dsn: str = simple_dataclass_settings.field.str(
+        var="PROCESS_SOLUTION_WORKER_JOB_CACHE_REDIS_DSN",
+        default="redis://redis:6379/",
+    )
+
+
+@simple_dataclass_settings.settings
+class _JobConsumer:
+    prewarm: bool = simple_dataclass_settings.field.bool_(
+        var="PROCESS_SOLUTION_WORKER_JOB_CACHE_PREWARM",
+        default=True,
+    )
+    kafka_servers: typing.Sequence[str] = simple_dataclass_settings.field.list(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_SERVERS",
+        default=("kafka:9093",),
+    )
+    kafka_user: str = simple_dataclass_settings.field.str(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_USER",
+        default="kafka",
+    )
+    kafka_password: str = simple_dataclass_settings.field.str(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_PASSWORD",
+        default="kafka_password",
+    )
+    kafka_topic: str = simple_dataclass_settings.field.str(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_TOPIC",
+        default="job",
+    )
+    kafka_broadcast: bool = simple_dataclass_settings.field.bool_(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_BROADCAST",
+        default=True,
+    )
+    kafka_start_lag: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_START_LAG",
+        default=0,
+    )
+    kafka_start_seconds_ago: float = simple_dataclass_settings.field.float(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_START_SECONDS_AGO",
+        default=3600,
+    )
+    kafka_partitions: typing.Sequence[int] = simple_dataclass_settings.field.list(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_PARTITIONS",
+        sub_cast=int,
+        default=(),
+    )
+    batch_size: int = simple_dataclass_settings.field.int(
+        var="PROCESS_SOLUTION_WORKER_JOB_KAFKA_BATCH_SIZE",
+        default=500,
+    )
+
+
 @simple_dataclass_settings.settings
 class _SolutionProducer:
     kafka_servers: str = simple_dataclass_settings.field.list(
@@ -79,6 +174,10 @@ class _SolutionProducer:
         var="PROCESS_SOLUTION_WORKER_KAFKA_TOPIC",
         default="solution",
     )
+    kafka_profile: str = simple_dataclass_settings.field.str(
+        var="PROCESS_SOLUTION_WORKER_KAFKA_PROFILE",
+        default="balanced",
+    )
 
 
 @simple_dataclass_settings.settings
@@ -87,4 +186,6 @@ class Settings:
     solution_consumer: _SolutionConsumer
     solution_storage: _SolutionStorage
     job_reader: _JobReader
+    job_cache: _JobCache
+    job_consumer: _JobConsumer
     solution_producer: _SolutionProducer
@@ -34,9 +34,15 @@ async def persist_and_broadcast_solution(
     if not job_storage_metadata:
         logger.info(
             f"{log_prefix}[Solution: {solution_storage_metadata.unique_key}] "
-            f"Got unknown solution"
+            f"Got unknown solution{' (already relayed)' if solution.relayed else ''}"
         )
         return
+
+    if solution.relayed:
+        # worker_server has already sent it to the nodes, only the persisted mark is left
+        await solution_storage.mark_stored(solution_storage_metadata)
+        logger.debug(f"{log_prefix} Relayed solution persisted")
+        return
     solution_transfer_metadata = definition.entity.solution.SolutionTransferData(
         task_id=solution.task_id,
         solution_target=solution.solution_target,
@@ -1,11 +1,25 @@
 import asyncio
 import functools
+import multiprocessing
+import typing
 
+import definition.entity.job
+
+import libs.codec
+import libs.database.storage.job_reader
 import libs.database.storage.worker_storage
+import libs.hub
+import libs.in_memory.admission
+import libs.in_memory.frame_cache
+import libs.in_memory.job_snapshot
+import libs.in_memory.solution_filter
+import libs.in_memory.solution_limiter
 import libs.kafka.consumer
+import libs.kafka.producer
 import libs.logger
 import libs.rabbitmq.producer
 import libs.server
+import libs.supervisor
 
 import apps.worker_server.settings
 import apps.worker_server.usecase
@@ -13,15 +27,25 @@ import apps.worker_server.usecase
 
 async def main(
     cfg: apps.worker_server.settings.Settings,
+    stats_queue: typing.Optional[multiprocessing.Queue] = None,
 ):
     logger = libs.logger.get(
         name=cfg.logger.name,
         level=cfg.logger.level,
     )
 
-    worker_storage = libs.database.storage.worker_storage.Storage(
-        db_dsn=cfg.worker_storage.postgresql_dsn,
-    )
+    if cfg.worker_storage.write_behind:
+        worker_storage = libs.database.storage.worker_storage.BatchStorage(
+            db_dsn=cfg.worker_storage.postgresql_dsn,
+            logger=logger,
+            flush_interval_seconds=cfg.worker_storage.flush_interval_seconds,
+            ids_batch_size=cfg.worker_storage.ids_batch_size,
+            flush_attempts=cfg.worker_storage.flush_attempts,
+        )
+    else:
+        worker_storage = libs.database.storage.worker_storage.Storage(
+            db_dsn=cfg.worker_storage.postgresql_dsn,
+        )
     await worker_storage.open()
 
     solution_producer = libs.rabbitmq.producer.Producer(
@@ -29,11 +53,27 @@ async def main(
         user=cfg.solution_producer.rabbitmq_user,
         password=cfg.solution_producer.rabbitmq_password,
         exchange=cfg.solution_producer.rabbitmq_exchange,
+        window_size=cfg.solution_producer.rabbitmq_confirm_window,
     )
     await solution_producer.open()
 
+    solution_relay: typing.Optional[libs.kafka.producer.Producer] = None
+    if cfg.solution_relay.fast_path:
+        solution_relay = libs.kafka.producer.Producer(
+            servers=cfg.solution_relay.kafka_servers,
+            user=cfg.solution_relay.kafka_user,
+            password=cfg.solution_relay.kafka_password,
+            topic=cfg.solution_relay.kafka_topic,
+            get_key=lambda solution: solution.solution_height,
+            profile=cfg.solution_relay.kafka_profile,
+            logger=logger,
+        )
+        await solution_relay.open()
+
     server = libs.server.Server(
         port=cfg.server.port,
+        reuse_port=cfg.server.processes > 1,
+        subprotocols=libs.codec.SUBPROTOCOLS if cfg.server.binary_protocol else (),
     )
 
     job_consumer_factory = libs.kafka.consumer.ConsumerFactory(
@@ -41,7 +81,80 @@ async def main(
         user=cfg.job_consumer.kafka_user,
         password=cfg.job_consumer.kafka_password,
         topic=cfg.job_consumer.kafka_topic,
+        broadcast=cfg.job_consumer.kafka_broadcast,
+        start_lag=cfg.job_consumer.kafka_start_lag,
+        start_seconds_ago=cfg.job_consumer.kafka_start_seconds_ago,
+        partitions=cfg.job_consumer.kafka_partitions,
+    )
+    job_snapshot = libs.in_memory.job_snapshot.Snapshot()
+    solution_filter = libs.in_memory.solution_filter.Filter(
+        jobs_size=cfg.solution_filter.jobs_size,
+        nonces_size=cfg.solution_filter.nonces_size,
+        max_height_lag=cfg.solution_filter.max_height_lag,
+    )
+    solution_limiter = libs.in_memory.solution_limiter.Limiter(
+        connection_rate=cfg.solution_limiter.connection_rate,
+        connection_burst=cfg.solution_limiter.connection_burst,
+        worker_rate=cfg.solution_limiter.worker_rate,
+        worker_burst=cfg.solution_limiter.worker_burst,
+        workers_size=cfg.solution_limiter.workers_size,
+        max_throttle_seconds=cfg.solution_limiter.max_throttle_seconds,
+        penalty_decay_rate=cfg.solution_limiter.penalty_decay_rate,
+        throttle_score=cfg.solution_limiter.throttle_score,
+        drop_score=cfg.solution_limiter.drop_score,
+        disconnect_score=cfg.solution_limiter.disconnect_score,
     )
+    if cfg.job_snapshot.seed_from_database:
+        job_reader = libs.database.storage.job_reader.Reader(
+            db_dsn=cfg.job_snapshot.postgresql_dsn,
+        )
+        await job_reader.open()
+        try:
+            latest_job = await job_reader.get_latest()
+            job_snapshot.update(latest_job)
+            solution_filter.update(latest_job)
+        except Exception as exc:
+            logger.exception(exc)
+            logger.debug(f"Could not seed job snapshot")
+        finally:
+            await job_reader.close(
+                logger=logger,
+            )
+
+    job_hub = libs.hub.Hub(
+        consumer=await job_consumer_factory.spawn(),
+        message_cls=definition.entity.job.JobTransferMetadata,
+        logger=logger,
+        queue_size=cfg.job_hub.queue_size,
+        batch_size=cfg.job_hub.batch_size,
+        observers=(job_snapshot, solution_filter),
+    )
+    job_hub.open(
+        on_stop=server.stop,
+    )
+    job_frame_cache = libs.in_memory.frame_cache.Cache(
+        max_size=cfg.job_hub.frame_cache_size,
+    )
+
+    admission = libs.in_memory.admission.Admission(
+        concurrency=cfg.admission.concurrency,
+        rate=cfg.admission.rate,
+        burst=cfg.admission.burst,
+        queue_size=cfg.admission.queue_size,
+        max_wait_seconds=cfg.admission.max_wait_seconds,
+    )
+    stats_task = asyncio.get_event_loop().create_task(libs.supervisor.report_stats(
+        get_stats=lambda: {
+            **server.stats(),
+            **admission.stats(),
+            **solution_filter.stats(),
+            **solution_limiter.stats(),
+            **(solution_relay.stats() if solution_relay is not None else {}),
+        },
+        logger=logger,
+        interval_seconds=cfg.server.stats_interval_seconds,
+        stats_queue=stats_queue,
+    ))
 
     logger.debug(f"Starting server")
     try:
@@ -49,33 +162,77 @@ async def main(
             handler=functools.partial(
                 apps.worker_server.usecase.handle_worker_connection,
                 logger=logger,
-                job_consumer_factory=job_consumer_factory,
+                admission=admission,
+                job_hub=job_hub,
+                job_frame_cache=job_frame_cache,
+                job_snapshot=job_snapshot,
                 worker_storage=worker_storage,
+                solution_filter=solution_filter,
+                solution_limiter=solution_limiter,
                 solution_producer=solution_producer,
+                solution_relay=solution_relay,
+                solution_window_size=cfg.solution_producer.rabbitmq_confirm_window,
             ),
         )
     except Exception as exc:
         logger.exception(exc)
         logger.debug(f"Server halt")
     finally:
+        stats_task.cancel()
+        await job_hub.close(
+            logger=logger,
+        )
         await solution_producer.close(
             logger=logger,
         )
+        if solution_relay is not None:
+            await solution_relay.close(
+                logger=logger,
+            )
         await worker_storage.close(
             logger=logger,
         )
         logger.debug(f"Server stopped")
 
 
+def run(
+    cfg: apps.worker_server.settings.Settings,
+    stats_queue: typing.Optional[multiprocessing.Queue] = None,
+) -> None:
+    libs.logger.configure(
+        level=cfg.logger.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=cfg,
+        stats_queue=stats_queue,
+    ))
+
+
 if __name__ == "__main__":
     import simple_dataclass_settings
 
     simple_dataclass_settings.read_envfile()
     settings = simple_dataclass_settings.populate(apps.worker_server.settings.Settings)
-    libs.logger.configure(
-        level=settings.logger.root_level,
-    )
 
-    asyncio.run(main(
-        cfg=settings,
-    ))
+    if settings.server.processes > 1:
+        libs.logger.configure(
+            level=settings.logger.root_level,
+        )
+        libs.supervisor.Supervisor(
+            target=functools.partial(
+                run,
+                settings,
+            ),
+            processes=settings.server.processes,
+            logger=libs.logger.get(
+                name=settings.logger.name,
+                level=settings.logger.level,
+            ),
+            stop_wait_time_seconds=settings.server.stop_wait_time_seconds,
+            stats_interval_seconds=settings.server.stats_interval_seconds,
+        ).run()
+    else:
+        run(
+            cfg=settings,
+        )
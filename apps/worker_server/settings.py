@@ -37,6 +37,51 @@ class _JobConsumer:
         var="WORKER_SERVER_KAFKA_TOPIC",
         default="job",
     )
+    kafka_broadcast: bool = simple_dataclass_settings.field.bool_(
+        var="WORKER_SERVER_KAFKA_BROADCAST",
+        default=True,
+    )
+    kafka_start_lag: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_KAFKA_START_LAG",
+        default=1,
+    )
+    kafka_start_seconds_ago: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_KAFKA_START_SECONDS_AGO",
+        default=0,
+    )
+    kafka_partitions: typing.Sequence[int] = simple_dataclass_settings.field.list(
+        var="WORKER_SERVER_KAFKA_PARTITIONS",
+        sub_cast=int,
+        default=(),
+    )
+
+
+@simple_dataclass_settings.settings
+class _JobHub:
+    queue_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_JOB_HUB_QUEUE_SIZE",
+        default=16,
+    )
+    batch_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_JOB_HUB_BATCH_SIZE",
+        default=16,
+    )
+    frame_cache_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_JOB_FRAME_CACHE_SIZE",
+        default=16,
+    )
+
+
+@simple_dataclass_settings.settings
+class _JobSnapshot:
+    seed_from_database: bool = simple_dataclass_settings.field.bool_(
+        var="WORKER_SERVER_JOB_SNAPSHOT_SEED_FROM_DATABASE",
+        default=True,
+    )
+    postgresql_dsn: str = simple_dataclass_settings.field.str(
+        var="WORKER_SERVER_JOB_POSTGRESQL_DSN",
+        default="postgresql+asyncpg://postgres:postgres@db:5432/postgres",
+    )
 
 
 @simple_dataclass_settings.settings
@@ -57,6 +102,98 @@ class _SolutionProducer:
         var="WORKER_SERVER_RABBITMQ_EXCHANGE",
         default="solution",
     )
+    rabbitmq_confirm_window: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_RABBITMQ_CONFIRM_WINDOW",
+        default=32,
+    )
+
+
+@simple_dataclass_settings.settings
+class _SolutionFilter:
+    jobs_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SOLUTION_FILTER_JOBS_SIZE",
+        default=64,
+    )
+    nonces_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SOLUTION_FILTER_NONCES_SIZE",
+        default=100_000,
+    )
+    max_height_lag: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SOLUTION_FILTER_MAX_HEIGHT_LAG",
+        default=10,
+    )
+
+
+@simple_dataclass_settings.settings
+class _SolutionLimiter:
+    connection_rate: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_CONNECTION_RATE",
+        default=20,
+    )
+    connection_burst: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SOLUTION_LIMITER_CONNECTION_BURST",
+        default=50,
+    )
+    worker_rate: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_WORKER_RATE",
+        default=50,
+    )
+    worker_burst: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SOLUTION_LIMITER_WORKER_BURST",
+        default=100,
+    )
+    workers_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SOLUTION_LIMITER_WORKERS_SIZE",
+        default=100_000,
+    )
+    max_throttle_seconds: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_MAX_THROTTLE_SECONDS",
+        default=1,
+    )
+    penalty_decay_rate: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_PENALTY_DECAY_RATE",
+        default=1,
+    )
+    throttle_score: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_THROTTLE_SCORE",
+        default=10,
+    )
+    drop_score: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_DROP_SCORE",
+        default=30,
+    )
+    disconnect_score: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_SOLUTION_LIMITER_DISCONNECT_SCORE",
+        default=60,
+    )
+
+
+@simple_dataclass_settings.settings
+class _SolutionRelay:
+    fast_path: bool = simple_dataclass_settings.field.bool_(
+        var="WORKER_SERVER_SOLUTION_RELAY_FAST_PATH",
+        default=False,
+    )
+    kafka_servers: typing.Sequence[str] = simple_dataclass_settings.field.list(
+        var="WORKER_SERVER_SOLUTION_RELAY_KAFKA_SERVERS",
+        default=("kafka:9093",),
+    )
+    kafka_user: str = simple_dataclass_settings.field.str(
+        var="WORKER_SERVER_SOLUTION_RELAY_KAFKA_USER",
+        default="kafka",
+    )
+    kafka_password: str = simple_dataclass_settings.field.str(
+        var="WORKER_SERVER_SOLUTION_RELAY_KAFKA_PASSWORD",
+        default="kafka_password",
+    )
+    kafka_topic: str = simple_dataclass_settings.field.str(
+        var="WORKER_SERVER_SOLUTION_RELAY_KAFKA_TOPIC",
+        default="solution",
+    )
+    kafka_profile: str = simple_dataclass_settings.field.str(
+        var="WORKER_SERVER_SOLUTION_RELAY_KAFKA_PROFILE",
+        default="latency",
+    )
 
 
 @simple_dataclass_settings.settings
@@ -65,6 +202,46 @@ class _WorkerStorage:
         var="WORKER_SERVER_POSTGRESQL_DSN",
         default="postgresql+asyncpg://postgres:postgres@db:5432/postgres",
     )
+    write_behind: bool = simple_dataclass_settings.field.bool_(
+        var="WORKER_SERVER_WORKER_STORAGE_WRITE_BEHIND",
+        default=True,
+    )
+    flush_interval_seconds: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_WORKER_STORAGE_FLUSH_INTERVAL_SECONDS",
+        default=0.5,
+    )
+    ids_batch_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_WORKER_STORAGE_IDS_BATCH_SIZE",
+        default=500,
+    )
+    flush_attempts: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_WORKER_STORAGE_FLUSH_ATTEMPTS",
+        default=20,
+    )
+
+
+@simple_dataclass_settings.settings
+class _Admission:
+    concurrency: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_ADMISSION_CONCURRENCY",
+        default=100,
+    )
+    rate: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_ADMISSION_RATE",
+        default=200,
+    )
+    burst: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_ADMISSION_BURST",
+        default=200,
+    )
+    queue_size: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_ADMISSION_QUEUE_SIZE",
+        default=1000,
+    )
+    max_wait_seconds: float = simple_dataclass_settings.field.float(
+        var="WORKER_SERVER_ADMISSION_MAX_WAIT_SECONDS",
+        default=5,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -73,12 +250,34 @@ class _Server:
         var="WORKER_SERVER_SERVER_PORT",
         default=8002,
     )
+    binary_protocol: bool = simple_dataclass_settings.field.bool_(
+        var="WORKER_SERVER_SERVER_BINARY_PROTOCOL",
+        default=False,
+    )
+    processes: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SERVER_PROCESSES",
+        default=1,
+    )
+    stop_wait_time_seconds: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SERVER_STOP_WAIT_TIME_SECONDS",
+        default=30,
+    )
+    stats_interval_seconds: int = simple_dataclass_settings.field.int(
+        var="WORKER_SERVER_SERVER_STATS_INTERVAL_SECONDS",
+        default=60,
+    )
 
 
 @simple_dataclass_settings.settings
 class Settings:
     logger: _Logger
     job_consumer: _JobConsumer
+    job_hub: _JobHub
+    job_snapshot: _JobSnapshot
     solution_producer: _SolutionProducer
+    solution_filter: _SolutionFilter
+    solution_limiter: _SolutionLimiter
+    solution_relay: _SolutionRelay
     worker_storage: _WorkerStorage
+    admission: _Admission
     server: _Server
@@ -3,17 +3,22 @@ import functools
 import logging
 import typing
 
+import definition.admission
 import definition.entity.job
 import definition.entity.solution
 import definition.entity.worker
-import definition.consumer
+import definition.frame_cache
+import definition.hub
 import definition.producer
 import definition.job_priority_shield
+import definition.snapshot
+import definition.solution_filter
+import definition.solution_limiter
 import definition.storage.worker_storage
 import definition.server
 
+import libs.codec
 import libs.in_memory.job_priority_shield
-import libs.json
 import libs.parsing
 
 
@@ -21,6 +26,8 @@ async def _handle_job(
     job: definition.entity.job.JobTransferMetadata,
     logger: logging.Logger,
     priority_shield: definition.job_priority_shield.Shield,
+    job_frame_cache: definition.frame_cache.Cache,
+    codec: libs.codec.Codec,
     connection: definition.server.Connection,
 ) -> None:
     log_prefix = (
@@ -35,10 +42,13 @@ async def _handle_job(
             return
 
         try:
-            message = libs.json.dumps(definition.entity.job.JobOutput(
-                task_id=job.task_id,
-                epoch_challenge=job.epoch_challenge,
-            ))
+            message = job_frame_cache.get(
+                key=(codec.name, job.task_id),
+                build=lambda: codec.dumps(definition.entity.job.JobOutput(
+                    task_id=job.task_id,
+                    epoch_challenge=job.epoch_challenge,
+                )),
+            )
         except Exception as exc:
             logger.debug(f"{log_prefix} Can not create job message")
             logger.exception(exc)
@@ -54,72 +64,30 @@ async def _handle_job(
             priority_shield.store_priority(job.block_height)
 
 
-async def _consume_jobs(
-    connection: definition.server.Connection,
-    job_consumer: definition.consumer.Consumer,
-    priority_shield: definition.job_priority_shield.Shield,
-    logger: logging.Logger,
-) -> None:
-    try:
-        await job_consumer.consume(
-            message_cls=definition.entity.job.JobTransferMetadata,
-            handler=functools.partial(
-                _handle_job,
-                logger=logger,
-                priority_shield=priority_shield,
-                connection=connection,
-            ),
-            logger=logger,
-        )
-    except Exception as exc:
-        if not isinstance(exc, definition.consumer.DisconnectError):
-            logger.exception(exc)
-    finally:
-        if connection.open:
-            try:
-                await connection.close(1011)
-            except Exception as exc:
-                logger.exception(exc)
-
-
-async def _create_connection_consumer(
-    connection: definition.server.Connection,
-    job_consumer_factory: definition.consumer.ConsumerFactory,
-    priority_shield: definition.job_priority_shield.Shield,
-    logger: logging.Logger,
-) -> typing.Tuple[definition.consumer.Consumer, asyncio.Task]:
-    job_consumer = await job_consumer_factory.spawn()
-    consume_task = asyncio.get_event_loop().create_task(_consume_jobs(
-        connection=connection,
-        job_consumer=job_consumer,
-        priority_shield=priority_shield,
-        logger=logger,
-    ))
-    return job_consumer, consume_task
-
-
 async def _try_register_worker(
     data: bytes,
     connection: definition.server.Connection,
+    codec: libs.codec.Codec,
     logger: logging.Logger,
-    job_consumer_factory: definition.consumer.ConsumerFactory,
+    job_hub: definition.hub.Hub,
+    job_frame_cache: definition.frame_cache.Cache,
+    job_snapshot: definition.snapshot.Snapshot,
     worker_storage: definition.storage.worker_storage.Storage,
 ) -> typing.Tuple[
     bool,
     typing.Optional[definition.entity.worker.Worker],
     typing.Optional[definition.entity.worker.WorkerConnection],
-    typing.Optional[definition.consumer.Consumer],
-    typing.Optional[asyncio.Task],
+    typing.Optional[definition.hub.Subscription],
 ]:
     log_prefix = f"[Connection {id(connection)}]"
 
     try:
-        worker = libs.parsing.parse(definition.entity.worker.Worker, data)
+        worker = libs.parsing.parse(definition.entity.worker.Worker, codec.loads(data))
     except Exception as exc:
         logger.exception(exc)
         logger.debug(f"{log_prefix} Got unknown worker handshake")
         await connection.close(3000)
-        return False, None, None, None, None
+        return False, None, None, None
 
     try:
         worker_connection = await worker_storage.store_connect(worker)
@@ -127,57 +95,240 @@ async def _try_register_worker(
         logger.exception(exc)
         logger.debug(f"{log_prefix} Got error while saving worker connection")
         await connection.close(1011)
-        return False, worker, None, None, None
+        return False, worker, None, None
 
-    priority_shield = libs.in_memory.job_priority_shield.Shield()
+    job_handler = functools.partial(
+        _handle_job,
+        logger=logger,
+        priority_shield=libs.in_memory.job_priority_shield.Shield(),
+        job_frame_cache=job_frame_cache,
+        codec=codec,
+        connection=connection,
+    )
     try:
-        job_consumer, consume_task = await _create_connection_consumer(
-            connection=connection,
-            job_consumer_factory=job_consumer_factory,
-            priority_shield=priority_shield,
-            logger=logger,
+        job_subscription = job_hub.subscribe(
+            handler=job_handler,
         )
     except Exception as exc:
         logger.exception(exc)
-        logger.debug(f"{log_prefix} Could not start consumer")
+        logger.debug(f"{log_prefix} Could not subscribe to jobs")
         await connection.close(1011)
-        return False, worker, worker_connection, None, None
+        return False, worker, worker_connection, None
 
     logger.debug(f"{log_prefix} Worker registered")
-    return True, worker, worker_connection, job_consumer, consume_task
+
+    # sent right away in the handshake turn, later jobs come through the hub subscription
+    latest_job = job_snapshot.get()
+    if latest_job is not None:
+        await job_handler(latest_job)
+
+    return True, worker, worker_connection, job_subscription
+
+
+def _check_solution_confirmation(
+    confirmation: asyncio.Future,
+    solution: definition.entity.solution.SolutionInput,
+    solution_filter: definition.solution_filter.Filter,
+    connection: definition.server.Connection,
+    logger: logging.Logger,
+    log_prefix: str,
+    solution_window: typing.Optional[asyncio.Semaphore] = None,
+) -> None:
+    if solution_window is not None:
+        solution_window.release()
+    if confirmation.cancelled():
+        solution_filter.forget(solution)
+        return
+
+    exc = confirmation.exception()
+    if exc is None:
+        logger.debug(f"{log_prefix} Solution confirmed")
+        return
+
+    # the worker may send the solution again, its nonce is not a duplicate then
+    solution_filter.forget(solution)
+    logger.debug(f"{log_prefix} Error while processing solution")
+    logger.exception(exc, exc_info=exc)
+    if connection.open:
+        asyncio.get_event_loop().create_task(connection.close(1011))
+
+
+async def _start_solution_relay(
+    solution: definition.entity.solution.SolutionInput,
+    solution_height: typing.Optional[int],
+    logger: logging.Logger,
+    solution_relay: definition.producer.PipelinedProducer,
+    log_prefix: str,
+) -> typing.Optional[typing.Awaitable[None]]:
+    if solution_height is None:
+        return None
+
+    try:
+        # the receive loop does not wait for Kafka, the delivery is checked before the solution is persisted
+        return await solution_relay.publish(definition.entity.solution.SolutionTransferData(
+            task_id=solution.task_id,
+            solution_target=solution.solution_target,
+            solution=solution.solution,
+            solution_height=solution_height,
+        ))
+    except Exception as exc:
+        # process_solution_worker broadcasts it after persistence then
+        logger.debug(f"{log_prefix} Could not relay solution ahead of persistence")
+        logger.exception(exc)
+        return None
+
+
+async def _confirm_solution_relay(
+    relay: typing.Awaitable[None],
+    logger: logging.Logger,
+    log_prefix: str,
+) -> bool:
+    try:
+        # the solution counts as relayed only once Kafka has acknowledged it, a failure is not retried here
+        await relay
+    except Exception as exc:
+        logger.debug(f"{log_prefix} Could not relay solution ahead of persistence")
+        logger.exception(exc)
+        return False
+
+    logger.debug(f"{log_prefix} Solution relayed ahead of persistence")
+    return True
+
+
+async def _publish_relayed_solutions(
+    solutions: asyncio.Queue,
+    logger: logging.Logger,
+    solution_filter: definition.solution_filter.Filter,
+    solution_producer: definition.producer.PipelinedProducer,
+    solution_window: asyncio.Semaphore,
+    connection: definition.server.Connection,
+    log_prefix: str,
+) -> None:
+    is_failed = False
+    while True:
+        item = await solutions.get()
+        if item is None:
+            return
+
+        solution, relay = item
+        solution_log_prefix = f"{log_prefix}[Task ID: {solution.task_id}]"
+        if is_failed:
+            # the worker may send the solution again after reconnect
+            solution_window.release()
+            solution_filter.forget(solution)
+            continue
+
+        try:
+            if relay is not None:
+                solution.relayed = await _confirm_solution_relay(
+                    relay=relay,
+                    logger=logger,
+                    log_prefix=solution_log_prefix,
+                )
+
+            logger.debug(f"{solution_log_prefix} Processing solution")
+            confirmation = await solution_producer.publish(
+                message=solution,
+            )
+        except Exception as exc:
+            solution_window.release()
+            solution_filter.forget(solution)
+            logger.debug(f"{solution_log_prefix} Error while processing solution")
+            logger.exception(exc)
+            is_failed = True
+            if connection.open:
+                await connection.close(1011)
+            continue
+
+        confirmation.add_done_callback(functools.partial(
+            _check_solution_confirmation,
+            solution=solution,
+            solution_filter=solution_filter,
+            connection=connection,
+            logger=logger,
+            log_prefix=solution_log_prefix,
+            solution_window=solution_window,
+        ))
 
 
 async def handle_worker_connection(
     connection: definition.server.Connection,
     logger: logging.Logger,
-    job_consumer_factory: definition.consumer.ConsumerFactory,
+    admission: definition.admission.Admission,
+    job_hub: definition.hub.Hub,
+    job_frame_cache: definition.frame_cache.Cache,
+    job_snapshot: definition.snapshot.Snapshot,
     worker_storage: definition.storage.worker_storage.Storage,
-    solution_producer: definition.producer.Producer,
+    solution_filter: definition.solution_filter.Filter,
+    solution_limiter: definition.solution_limiter.Limiter,
+    solution_producer: definition.producer.PipelinedProducer,
+    solution_relay: typing.Optional[definition.producer.PipelinedProducer] = None,
+    solution_window_size: int = 32,
 ) -> None:
     worker: typing.Optional[definition.entity.worker.Worker] = None
     worker_connection: typing.Optional[definition.entity.worker.WorkerConnection] = None
-    job_consumer: typing.Optional[definition.consumer.Consumer] = None
-    consume_task: typing.Optional[asyncio.Task] = None
+    job_subscription: typing.Optional[definition.hub.Subscription] = None
+
+    codec = libs.codec.get(connection.subprotocol)
 
     log_prefix = f"[Connection {id(connection)}]"
-    logger.debug(f"{log_prefix} Connection started")
+    logger.debug(f"{log_prefix} Connection started ({codec.name})")
+
+    # relayed solutions go to RabbitMQ once their Kafka delivery is known, off the receive loop
+    solution_window = asyncio.Semaphore(solution_window_size)
+    relayed_solutions: asyncio.Queue = asyncio.Queue()
+    relayed_solutions_publisher: typing.Optional[asyncio.Task] = None
+    if solution_relay is not None:
+        relayed_solutions_publisher = asyncio.get_event_loop().create_task(_publish_relayed_solutions(
+            solutions=relayed_solutions,
+            logger=logger,
+            solution_filter=solution_filter,
+            solution_producer=solution_producer,
+            solution_window=solution_window,
+            connection=connection,
+            log_prefix=log_prefix,
+        ))
 
     try:
         async for data in connection:
             if worker is None:
-                is_success, worker, worker_connection, job_consumer, consume_task = await _try_register_worker(
-                    data=data,
-                    connection=connection,
-                    logger=logger,
-                    job_consumer_factory=job_consumer_factory,
-                    worker_storage=worker_storage,
-                )
+                async with admission.admit() as retry_after:
+                    if retry_after is not None:
+                        logger.debug(f"{log_prefix} Handshake rejected, retry after {retry_after:.1f}s")
+                        await connection.close(1013, f"retry after {retry_after:.1f}")
+                        break
+
+                    is_success, worker, worker_connection, job_subscription = await _try_register_worker(
+                        data=data,
+                        connection=connection,
+                        codec=codec,
+                        logger=logger,
+                        job_hub=job_hub,
+                        job_frame_cache=job_frame_cache,
+                        job_snapshot=job_snapshot,
+                        worker_storage=worker_storage,
+                    )
                 if not is_success:
                     break
                 continue
 
+            decision = solution_limiter.check(
+                connection_id=id(connection),
+                worker=worker,
+            )
+            if decision.action == definition.solution_limiter.DISCONNECT:
+                logger.debug(f"{log_prefix} Worker is penalized, disconnecting")
+                await connection.close(1008)
+                break
+            if decision.action == definition.solution_limiter.DROP:
+                logger.debug(f"{log_prefix} Solution rate limited, dropped")
+                continue
+            if decision.action == definition.solution_limiter.THROTTLE:
+                # the receive loop stalls, so the worker is slowed down by the socket backpressure
+                await asyncio.sleep(decision.delay)
+
             try:
-                raw_solution = libs.parsing.parse(definition.entity.solution.RawSolutionInput, data)
+                raw_solution = libs.parsing.parse(definition.entity.solution.RawSolutionInput, codec.loads(data))
                 solution = definition.entity.solution.SolutionInput(
                     hardware_id=worker.hardware_id,
                     caption=worker.caption,
@@ -188,14 +339,43 @@ async def handle_worker_connection(
             except Exception as exc:
                 logger.exception(exc)
                 logger.debug(f"{log_prefix} Got unknown solution")
+                solution_limiter.penalize(worker)
+                continue
+
+            rejection_reason = solution_filter.check(solution)
+            if rejection_reason is not None:
+                logger.debug(f"{log_prefix}[Task ID: {solution.task_id}] Solution dropped: {rejection_reason}")
+                solution_limiter.penalize(worker)
+                continue
+
+            if solution_relay is not None:
+                if solution_window.locked():
+                    logger.debug(f"{log_prefix}[Task ID: {solution.task_id}] Solution window is full, waiting")
+                await solution_window.acquire()
+                relayed_solutions.put_nowait((solution, await _start_solution_relay(
+                    solution=solution,
+                    solution_height=solution_filter.get_height(solution.task_id),
+                    logger=logger,
+                    solution_relay=solution_relay,
+                    log_prefix=f"{log_prefix}[Task ID: {solution.task_id}]",
+                )))
                 continue
 
             try:
                 logger.debug(f"{log_prefix}[Task ID: {solution.task_id}] Processing solution")
-                await solution_producer.produce(
+                confirmation = await solution_producer.publish(
                     message=solution,
                 )
+                confirmation.add_done_callback(functools.partial(
+                    _check_solution_confirmation,
+                    solution=solution,
+                    solution_filter=solution_filter,
+                    connection=connection,
+                    logger=logger,
+                    log_prefix=f"{log_prefix}[Task ID: {solution.task_id}]",
+                ))
             except Exception as exc:
+                solution_filter.forget(solution)
                 logger.debug(f"{log_prefix}[Task ID: {solution.task_id}] Error while processing solution")
                 logger.exception(exc)
                 await connection.close(1011)
@@ -204,6 +384,19 @@ async def handle_worker_connection(
         logger.debug(f"{log_prefix} Critical error during connection")
         logger.exception(exc)
     finally:
+        if relayed_solutions_publisher is not None:
+            # solutions already received are still published
+            relayed_solutions.put_nowait(None)
+            try:
+                await relayed_solutions_publisher
+            except Exception as exc:
+                logger.exception(exc)
+
+        solution_limiter.forget(id(connection))
+
+        if job_subscription is not None:
+            job_hub.unsubscribe(job_subscription)
+
         if worker_connection is not None:
             try:
                 await worker_storage.store_disconnect(worker_connection)
@@ -211,13 +404,4 @@ async def handle_worker_connection(
                 logger.exception(exc)
                 logger.debug(f"{log_prefix} Got error while saving worker disconnection")
 
-        if consume_task is not None:
-            if not consume_task.done():
-                consume_task.cancel()
-
-        if job_consumer is not None:
-            await job_consumer.close(
-                logger=logger,
-            )
-
         logger.debug(f"{log_prefix} Connection closed")
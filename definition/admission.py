@@ -0,0 +1,12 @@
+import typing
+
+
+RetryAfter = typing.TypeVar('RetryAfter', bound=float)
+
+
+class Admission(typing.Protocol):
+    async def admit(self) -> typing.AsyncContextManager[typing.Optional[RetryAfter]]:
+        ...
+
+    def stats(self) -> typing.Mapping[str, typing.Union[int, float]]:
+        ...
@@ -28,6 +28,16 @@ class Consumer(typing.Protocol):
         ...
 
 
+class BatchConsumer(Consumer, typing.Protocol):
+    async def consume_batch(
+        self,
+        message_cls: typing.Type[Data],
+        handler: typing.Callable[[typing.Sequence[Data]], typing.Awaitable[None]],
+        **_,
+    ) -> None:
+        ...
+
+
 class ConsumerFactory(typing.Protocol):
     async def spawn(self) -> Consumer:
         ...
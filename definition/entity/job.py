@@ -1,5 +1,6 @@
 import datetime
 import dataclasses
+import typing
 
 
 @dataclasses.dataclass(slots=True)
@@ -7,6 +8,8 @@ class JobInput:
     epoch_challenge: dict
     proof_target: int
     block_height: int
+    # set at ingest when the job is broadcast ahead of persistence
+    task_id: typing.Optional[str] = None
 
 
 @dataclasses.dataclass(slots=True)
@@ -22,6 +25,7 @@ class JobTransferMetadata:
     epoch_challenge: dict
     block_height: int
     created_at: datetime.datetime
+    proof_target: typing.Optional[int] = None
 
 
 @dataclasses.dataclass(slots=True)
@@ -17,6 +17,8 @@ class SolutionInput:
     task_id: str
     solution: dict
     solution_target: int
+    # already sent to the solution topic by worker_server, only persistence is left
+    relayed: bool = False
 
 
 @dataclasses.dataclass(slots=True)
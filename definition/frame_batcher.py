@@ -0,0 +1,12 @@
+import typing
+
+
+class Batcher(typing.Protocol):
+    async def add(
+        self,
+        item: bytes,
+    ) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
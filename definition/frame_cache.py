@@ -0,0 +1,13 @@
+import typing
+
+
+Key = typing.TypeVar("Key", bound=typing.Hashable)
+
+
+class Cache(typing.Protocol):
+    def get(
+        self,
+        key: Key,
+        build: typing.Callable[[], bytes],
+    ) -> bytes:
+        ...
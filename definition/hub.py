@@ -0,0 +1,50 @@
+import logging
+import typing
+
+
+Data = typing.TypeVar("Data")
+Subscription = typing.TypeVar("Subscription", bound=typing.Hashable)
+
+
+class Observer(typing.Protocol):
+    def update(
+        self,
+        data: Data,
+    ) -> bool:
+        ...
+
+
+class Hub(typing.Protocol):
+    def open(
+        self,
+        on_stop: typing.Optional[typing.Callable[[typing.Optional[Exception]], None]] = None,
+    ) -> None:
+        ...
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        ...
+
+    def subscribe(
+        self,
+        handler: typing.Callable[[Data], typing.Awaitable[None]],
+    ) -> Subscription:
+        ...
+
+    def unsubscribe(
+        self,
+        subscription: Subscription,
+    ) -> None:
+        ...
+
+
+class RoutingHub(Hub, typing.Protocol):
+    def wait(
+        self,
+        subscription: Subscription,
+        height: int,
+        target: int,
+    ) -> None:
+        ...
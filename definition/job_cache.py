@@ -0,0 +1,33 @@
+import logging
+import typing
+
+import definition.entity.job
+
+
+class Cache(typing.Protocol):
+    async def open(self) -> None:
+        ...
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        ...
+
+    async def get(
+        self,
+        task_id: str,
+    ) -> typing.Optional[definition.entity.job.JobStorageMetadata]:
+        ...
+
+    async def put(
+        self,
+        entry: definition.entity.job.JobStorageMetadata,
+    ) -> None:
+        ...
+
+    def update(
+        self,
+        data: definition.entity.job.JobTransferMetadata,
+    ) -> bool:
+        ...
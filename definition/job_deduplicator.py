@@ -0,0 +1,30 @@
+import logging
+import typing
+
+import definition.entity.job
+
+
+class Deduplicator(typing.Protocol):
+    async def open(self) -> None:
+        ...
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        ...
+
+    async def claim(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> bool:
+        ...
+
+    async def release(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> None:
+        ...
+
+    def stats(self) -> typing.Mapping[str, int]:
+        ...
@@ -0,0 +1,24 @@
+import logging
+import typing
+
+import definition.entity.job
+
+
+class Reconciler(typing.Protocol):
+    async def open(self) -> None:
+        ...
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        ...
+
+    def track(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> None:
+        ...
+
+    def stats(self) -> typing.Mapping[str, int]:
+        ...
@@ -20,3 +20,12 @@ class Producer(typing.Protocol):
         message: Message,
     ) -> None:
         ...
+
+
+class PipelinedProducer(Producer, typing.Protocol):
+    async def publish(
+        self,
+        message: Message,
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> typing.Awaitable[None]:
+        ...
@@ -0,0 +1,27 @@
+import typing
+
+
+Subscription = typing.TypeVar("Subscription", bound=typing.Hashable)
+
+
+class Index(typing.Protocol):
+    def add(
+        self,
+        subscription: Subscription,
+        height: int,
+        target: int,
+    ) -> None:
+        ...
+
+    def route(
+        self,
+        height: int,
+        target: int,
+    ) -> typing.Collection[Subscription]:
+        ...
+
+    def remove(
+        self,
+        subscription: Subscription,
+    ) -> None:
+        ...
@@ -13,6 +13,9 @@ class Server(typing.Protocol):
     ) -> None:
         ...
 
+    def stats(self) -> typing.Mapping[str, int]:
+        ...
+
     def stop(
         self,
         exception: typing.Optional[Exception] = None,
@@ -0,0 +1,15 @@
+import typing
+
+
+Data = typing.TypeVar("Data")
+
+
+class Snapshot(typing.Protocol):
+    def get(self) -> typing.Optional[Data]:
+        ...
+
+    def update(
+        self,
+        data: Data,
+    ) -> bool:
+        ...
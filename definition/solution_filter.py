@@ -0,0 +1,33 @@
+import typing
+
+import definition.entity.job
+import definition.entity.solution
+
+
+class Filter(typing.Protocol):
+    def update(
+        self,
+        data: typing.Optional[definition.entity.job.JobTransferMetadata],
+    ) -> bool:
+        ...
+
+    def check(
+        self,
+        solution: definition.entity.solution.SolutionInput,
+    ) -> typing.Optional[str]:
+        ...
+
+    def forget(
+        self,
+        solution: definition.entity.solution.SolutionInput,
+    ) -> None:
+        ...
+
+    def get_height(
+        self,
+        task_id: str,
+    ) -> typing.Optional[int]:
+        ...
+
+    def stats(self) -> typing.Mapping[str, int]:
+        ...
@@ -0,0 +1,38 @@
+import typing
+
+import definition.entity.worker
+
+
+PASS = "pass"
+THROTTLE = "throttle"
+DROP = "drop"
+DISCONNECT = "disconnect"
+
+
+class Decision(typing.NamedTuple):
+    action: str
+    delay: float = 0
+
+
+class Limiter(typing.Protocol):
+    def check(
+        self,
+        connection_id: typing.Hashable,
+        worker: definition.entity.worker.Worker,
+    ) -> Decision:
+        ...
+
+    def penalize(
+        self,
+        worker: definition.entity.worker.Worker,
+    ) -> None:
+        ...
+
+    def forget(
+        self,
+        connection_id: typing.Hashable,
+    ) -> None:
+        ...
+
+    def stats(self) -> typing.Mapping[str, int]:
+        ...
@@ -14,6 +14,9 @@ class Reader(typing.Protocol):
     ) -> typing.Optional[definition.entity.job.JobStorageMetadata]:
         ...
 
+    async def get_latest(self) -> typing.Optional[definition.entity.job.JobTransferMetadata]:
+        ...
+
     async def close(
         self,
         logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
@@ -18,6 +18,12 @@ class Storage(typing.Protocol):
     ) -> typing.Tuple[bool, typing.Optional[definition.entity.job.JobStorageMetadata]]:
         ...
 
+    async def store_many(
+        self,
+        entries: typing.Sequence[definition.entity.job.JobInput],
+    ) -> typing.Sequence[typing.Tuple[bool, definition.entity.job.JobStorageMetadata]]:
+        ...
+
     async def mark_stored(
         self,
         entry: definition.entity.job.JobStorageMetadata,
@@ -18,6 +18,12 @@ class Storage(typing.Protocol):
     ) -> typing.Tuple[bool, typing.Optional[definition.entity.solution.SolutionStorageData]]:
         ...
 
+    async def store_many(
+        self,
+        entries: typing.Sequence[definition.entity.solution.SolutionInput],
+    ) -> typing.Sequence[typing.Tuple[bool, definition.entity.solution.SolutionStorageData]]:
+        ...
+
     async def mark_stored(
         self,
         entry: definition.entity.solution.SolutionStorageData,
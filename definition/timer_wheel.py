@@ -0,0 +1,25 @@
+import typing
+
+
+Timer = typing.TypeVar("Timer")
+
+
+class TimerWheel(typing.Protocol):
+    def open(self) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def schedule(
+        self,
+        delay_seconds: float,
+        callback: typing.Callable[[], None],
+    ) -> Timer:
+        ...
+
+    def cancel(
+        self,
+        timer: Timer,
+    ) -> None:
+        ...
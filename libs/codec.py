@@ -0,0 +1,41 @@
+import typing
+
+import libs.json
+import libs.msgpack
+
+
+class Codec(typing.NamedTuple):
+    name: str
+    dumps: typing.Callable[[typing.Any], bytes]
+    loads: typing.Callable[[typing.Union[str, bytes]], typing.Any]
+    join: typing.Callable[[typing.Sequence[bytes]], bytes]
+
+
+JSON = Codec(
+    name="json",
+    dumps=libs.json.dumps,
+    loads=libs.json.loads,
+    join=libs.json.join,
+)
+MSGPACK = Codec(
+    name="msgpack",
+    dumps=libs.msgpack.dumps,
+    loads=libs.msgpack.loads,
+    join=libs.msgpack.join,
+)
+
+# JSON stays the default for clients that do not ask for any subprotocol
+SUBPROTOCOLS = (
+    MSGPACK.name,
+)
+
+_CODECS = {
+    codec.name: codec
+    for codec in (JSON, MSGPACK)
+}
+
+
+def get(
+    subprotocol: typing.Optional[str] = None,
+) -> Codec:
+    return _CODECS.get(subprotocol, JSON)
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import logging
 import typing
@@ -18,9 +19,10 @@ class StoredEntry(typing.Protocol):
 
 
 class Storage:
+    _store_attempts: int = 3
+
     table: sqlalchemy.Table
     index_elements: typing.Sequence[str]
-    bypass_column_name: str
     stored_entry_dedup_key: str
     dedup_prefix: str
     exception_class: typing.Type[Exception]
@@ -65,52 +67,123 @@ class Storage:
     ) -> StoredEntry:
         ...
 
-    async def _store_in_db(
+    def _get_index_key(
         self,
-        entry: Entry,
-    ) -> StoredEntry:
-        async with self._db_engine.begin() as connection:
-            query = sqlalchemy.dialects.postgresql.insert(
+        item,
+    ) -> typing.Tuple:
+        return tuple(libs.attrgetter.get_value(item, name) for name in self.index_elements)
+
+    def _get_existing_condition(
+        self,
+        keys: typing.Collection[typing.Tuple],
+    ):
+        if len(self.index_elements) == 1:
+            return self.table.c[self.index_elements[0]].in_([key for key, in keys])
+        return sqlalchemy.tuple_(*(self.table.c[name] for name in self.index_elements)).in_(list(keys))
+
+    async def _store_many_in_db(
+        self,
+        entries: typing.Sequence[Entry],
+    ) -> typing.Sequence[typing.Tuple[typing.Tuple, bool, StoredEntry]]:
+        values: typing.MutableMapping[typing.Tuple, dict] = {}
+        keys = []
+        for entry in entries:
+            value = self._prepare_database_values(entry)
+            key = self._get_index_key(value)
+            # one statement can not insert the same row twice, copies share the first value
+            values.setdefault(key, value)
+            keys.append(key)
+
+        records: typing.MutableMapping[typing.Tuple, typing.Tuple[bool, typing.Any]] = {}
+        missing_values = values
+        for _ in range(self._store_attempts):
+            # duplicates are skipped without rewriting the row, the select sees the table as it was before the insert
+            inserted = sqlalchemy.dialects.postgresql.insert(
                 self.table,
             ).values(
-                self._prepare_database_values(entry),
-            )
-            query = query.on_conflict_do_update(
+                list(missing_values.values()),
+            ).on_conflict_do_nothing(
                 index_elements=self.index_elements,
-                set_={
-                    self.bypass_column_name: libs.attrgetter.get_value(query.excluded, self.bypass_column_name),
-                },
-            ).returning(*self.table.c)
-            result = await connection.execute(query)
-            return self._prepare_result_entry(result.fetchone())
+            ).returning(*self.table.c).cte("inserted")
+            query = sqlalchemy.union_all(
+                sqlalchemy.select(
+                    *inserted.c,
+                    sqlalchemy.true().label("is_inserted"),
+                ),
+                sqlalchemy.select(
+                    *self.table.c,
+                    sqlalchemy.false().label("is_inserted"),
+                ).where(
+                    self._get_existing_condition(missing_values.keys()),
+                ),
+            )
+
+            async with self._db_engine.begin() as connection:
+                result = await connection.execute(query)
+                for record in result.fetchall():
+                    records[self._get_index_key(record)] = (record.is_inserted, record)
+
+            # a row committed by a concurrent insert after the statement has started is seen by neither part
+            missing_values = {key: value for key, value in missing_values.items() if key not in records}
+            if not missing_values:
+                break
+        else:
+            raise RuntimeError(f"Can not store {len(missing_values)} entries in {self._store_attempts} attempts")
 
-    async def _is_newly_stored(
+        return [(key, records[key][0], self._prepare_result_entry(records[key][1])) for key in keys]
+
+    async def _are_newly_stored(
         self,
-        stored_entry: StoredEntry,
-    ) -> bool:
-        delta = (datetime.datetime.utcnow() - stored_entry.created_at).total_seconds()
-        if delta > self._record_ttl_seconds:
-            # assume that the record was already processed long time ago
-            return True
-
-        key = f"{self.dedup_prefix}{libs.attrgetter.get_value(stored_entry, self.stored_entry_dedup_key)}"
-        flag = await self._redis_connection.get(
-            name=key,
-        )
+        stored_entries: typing.Sequence[typing.Tuple[typing.Tuple, bool, StoredEntry]],
+    ) -> typing.Sequence[bool]:
+        now = datetime.datetime.utcnow()
+        result: typing.MutableSequence[typing.Optional[bool]] = []
+        unchecked: typing.MutableMapping[int, str] = {}
+        seen_keys = set()
+        for key, is_inserted, stored_entry in stored_entries:
+            if key in seen_keys:
+                # the copy within the same batch is left to the first one
+                result.append(False)
+            elif is_inserted:
+                result.append(True)
+            elif (now - stored_entry.created_at).total_seconds() > self._record_ttl_seconds:
+                # assume that the record was already processed long time ago
+                result.append(True)
+            else:
+                # the row may be left by a handler failed before marking it, only the mark tells
+                unchecked[len(result)] = (
+                    f"{self.dedup_prefix}{libs.attrgetter.get_value(stored_entry, self.stored_entry_dedup_key)}"
+                )
+                result.append(None)
+            seen_keys.add(key)
 
-        return not bool(flag)
+        if unchecked:
+            flags = await self._redis_connection.mget(list(unchecked.values()))
+            for index, flag in zip(unchecked, flags):
+                result[index] = not bool(flag)
+        return result
 
-    async def store(
+    async def store_many(
         self,
-        entry: Entry,
-    ) -> typing.Tuple[bool, StoredEntry]:
+        entries: typing.Sequence[Entry],
+    ) -> typing.Sequence[typing.Tuple[bool, StoredEntry]]:
         try:
-            stored_entry = await self._store_in_db(entry)
-            is_newly_stored = await self._is_newly_stored(stored_entry)
-            return is_newly_stored, stored_entry
+            stored_entries = await self._store_many_in_db(entries)
+            are_newly_stored = await self._are_newly_stored(stored_entries)
+            return [
+                (is_newly_stored, stored_entry)
+                for is_newly_stored, (_, _, stored_entry) in zip(are_newly_stored, stored_entries)
+            ]
         except Exception as exc:
             raise self.exception_class from exc
 
+    async def store(
+        self,
+        entry: Entry,
+    ) -> typing.Tuple[bool, StoredEntry]:
+        (result, ) = await self.store_many((entry, ))
+        return result
+
     async def mark_stored(
         self,
         stored_entry: StoredEntry,
@@ -140,3 +213,116 @@ class Storage:
                 await self._redis_connection.close()
             except Exception as exc:
                 logger.exception(exc)
+
+
+class BatchStorage(Storage):
+    __slots__ = (
+        '_batch_size',
+        '_batch_delay_seconds',
+        '_batches_in_flight',
+
+        '_pending',
+        '_pending_since',
+        '_flush_handle',
+        '_flush_tasks',
+    )
+
+    def __init__(
+        self,
+        db_dsn: str = "postgresql+asyncpg://postgres:postgres@db:5432/postgres",
+        redis_dsn: str = "redis://redis:6379/",
+        record_ttl_seconds: int = 60 * 60,
+        batch_size: int = 64,
+        batch_delay_seconds: float = 0.01,
+        batches_in_flight: int = 2,
+    ) -> None:
+        super().__init__(
+            db_dsn=db_dsn,
+            redis_dsn=redis_dsn,
+            record_ttl_seconds=record_ttl_seconds,
+        )
+        self._batch_size = batch_size
+        self._batch_delay_seconds = batch_delay_seconds
+        self._batches_in_flight = batches_in_flight
+
+        self._pending: typing.MutableSequence[typing.Tuple[Entry, asyncio.Future]] = []
+        self._pending_since = 0.
+        self._flush_handle: typing.Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: typing.Set[asyncio.Task] = set()
+
+    def _schedule_flush(self) -> None:
+        if not self._pending or len(self._flush_tasks) >= self._batches_in_flight:
+            return
+
+        loop = asyncio.get_event_loop()
+        waited_seconds = loop.time() - self._pending_since
+        # an idle database takes the entry at once, a busy one lets the batch grow while it is within budget
+        if self._flush_tasks and len(self._pending) < self._batch_size and waited_seconds < self._batch_delay_seconds:
+            if self._flush_handle is None:
+                self._flush_handle = loop.call_later(self._batch_delay_seconds - waited_seconds, self._on_delay)
+            return
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending[:self._batch_size], self._pending[self._batch_size:]
+        self._pending_since = loop.time()
+        task = loop.create_task(self._flush(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flushed)
+
+    def _on_delay(self) -> None:
+        self._flush_handle = None
+        self._schedule_flush()
+
+    def _on_flushed(
+        self,
+        task: asyncio.Task,
+    ) -> None:
+        self._flush_tasks.discard(task)
+        self._schedule_flush()
+
+    async def _flush(
+        self,
+        batch: typing.Sequence[typing.Tuple[Entry, asyncio.Future]],
+    ) -> None:
+        try:
+            results = await self.store_many([entry for entry, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def store(
+        self,
+        entry: Entry,
+    ) -> typing.Tuple[bool, StoredEntry]:
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._pending_since = loop.time()
+        self._pending.append((entry, future))
+        self._schedule_flush()
+        return await future
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        for task in tuple(self._flush_tasks):
+            task.cancel()
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+
+        await super().close(
+            logger=logger,
+        )
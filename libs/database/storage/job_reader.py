@@ -6,9 +6,11 @@ import sqlalchemy
 import sqlalchemy.ext.asyncio
 
 import definition.entity.job
+import definition.job_cache
 import definition.storage.job_reader
 
 import libs.database.tables.job
+import libs.json
 
 
 class Reader(definition.storage.job_reader.Reader):
@@ -36,9 +38,9 @@ class Reader(definition.storage.job_reader.Reader):
         async with self._db_engine.connect() as connection:
             query = sqlalchemy.select(
                 *libs.database.tables.job.job.c,
-            )
+            ).limit(1)
             for key, value in params.items():
-                query.where(
+                query = query.where(
                     getattr(libs.database.tables.job.job.c, key) == value
                 )
             result = (await connection.execute(query)).fetchone()
@@ -50,6 +52,24 @@ class Reader(definition.storage.job_reader.Reader):
                 created_at=result.created_at,
             )
 
+    async def get_latest(self) -> typing.Optional[definition.entity.job.JobTransferMetadata]:
+        async with self._db_engine.connect() as connection:
+            query = sqlalchemy.select(
+                *libs.database.tables.job.job.c,
+            ).order_by(
+                libs.database.tables.job.job.c.block_height.desc(),
+            ).limit(1)
+            result = (await connection.execute(query)).fetchone()
+            if result is None:
+                return None
+            return definition.entity.job.JobTransferMetadata(
+                task_id=result.task_id,
+                epoch_challenge=libs.json.loads(result.epoch_challenge),
+                block_height=result.block_height,
+                created_at=result.created_at,
+                proof_target=None if result.proof_target is None else int(result.proof_target),
+            )
+
     async def close(
         self,
         logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
@@ -59,3 +79,35 @@ class Reader(definition.storage.job_reader.Reader):
                 await self._db_engine.dispose()
             except Exception as exc:
                 logger.exception(exc)
+
+
+class CachedReader(Reader):
+    __slots__ = (
+        '_cache',
+    )
+
+    def __init__(
+        self,
+        cache: definition.job_cache.Cache,
+        db_dsn: str = "postgresql+asyncpg://postgres:postgres@db:5432/postgres",
+    ) -> None:
+        super().__init__(
+            db_dsn=db_dsn,
+        )
+        self._cache = cache
+
+    async def get(
+        self,
+        **params: typing.Mapping[str, typing.Any],
+    ) -> typing.Optional[definition.entity.job.JobStorageMetadata]:
+        if set(params) != {"task_id"}:
+            return await super().get(**params)
+
+        entry = await self._cache.get(params["task_id"])
+        if entry is not None:
+            return entry
+
+        entry = await super().get(**params)
+        if entry is not None:
+            await self._cache.put(entry)
+        return entry
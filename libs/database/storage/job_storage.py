@@ -12,7 +12,6 @@ import libs.json
 class Storage(libs.database.storage.base.Storage, definition.storage.job_storage.Storage):
     table = libs.database.tables.job.job
     index_elements = ["block_height", ]
-    bypass_column_name = "block_height"
     stored_entry_dedup_key = "task_id"
     dedup_prefix = "job_"
     exception_class = definition.storage.job_storage.Error
@@ -24,7 +23,8 @@ class Storage(libs.database.storage.base.Storage, definition.storage.job_storage
         return {
             "block_height": entity.block_height,
             "epoch_challenge": libs.json.dumps(entity.epoch_challenge).decode(),
-            "task_id": str(uuid.uuid4()),
+            "proof_target": entity.proof_target,
+            "task_id": entity.task_id or str(uuid.uuid4()),
         }
 
     def _prepare_result_entry(
@@ -36,3 +36,7 @@ class Storage(libs.database.storage.base.Storage, definition.storage.job_storage
             block_height=record.block_height,
             created_at=record.created_at,
         )
+
+
+class BatchStorage(libs.database.storage.base.BatchStorage, Storage):
+    ...
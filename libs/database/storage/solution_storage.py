@@ -11,7 +11,6 @@ import libs.json
 class Storage(libs.database.storage.base.Storage, definition.storage.solution_storage.Storage):
     table = libs.database.tables.solution.solution
     index_elements = ["unique_key", ]
-    bypass_column_name = "unique_key"
     stored_entry_dedup_key = "unique_key"
     dedup_prefix = "solution_"
     exception_class = definition.storage.solution_storage.Error
@@ -36,3 +35,7 @@ class Storage(libs.database.storage.base.Storage, definition.storage.solution_st
             unique_key=record.unique_key,
             created_at=record.created_at,
         )
+
+
+class BatchStorage(libs.database.storage.base.BatchStorage, Storage):
+    ...
@@ -1,8 +1,11 @@
+import asyncio
+import collections
 import datetime
 import logging
 import typing
 
 import sqlalchemy
+import sqlalchemy.exc
 import sqlalchemy.ext.asyncio
 import sqlalchemy.dialects.postgresql
 
@@ -77,3 +80,308 @@ class Storage(definition.storage.worker_storage.Storage):
                 await self._db_engine.dispose()
             except Exception as exc:
                 logger.exception(exc)
+
+
+class BatchStorage(Storage):
+    # errors caused by the row itself, writing it again does not help
+    _row_errors = (
+        sqlalchemy.exc.DataError,
+        sqlalchemy.exc.IntegrityError,
+    )
+
+    __slots__ = (
+        '_logger',
+        '_flush_interval_seconds',
+        '_ids_batch_size',
+        '_flush_attempts',
+
+        '_ids',
+        '_ids_lock',
+        '_connects',
+        '_disconnects',
+        '_failed_flushes',
+        '_flush_lock',
+        '_flush_task',
+    )
+
+    def __init__(
+        self,
+        db_dsn: str = "postgresql+asyncpg://postgres:postgres@db:5432/postgres",
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+        flush_interval_seconds: float = 0.5,
+        ids_batch_size: int = 500,
+        flush_attempts: int = 20,
+    ) -> None:
+        super().__init__(
+            db_dsn=db_dsn,
+        )
+        self._logger = logger
+        self._flush_interval_seconds = flush_interval_seconds
+        self._ids_batch_size = ids_batch_size
+        self._flush_attempts = flush_attempts
+
+        self._ids: typing.Deque[int] = collections.deque()
+        self._ids_lock = asyncio.Lock()
+        self._connects: typing.MutableMapping[int, dict] = {}
+        self._disconnects: typing.MutableMapping[int, datetime.datetime] = {}
+        self._failed_flushes: typing.MutableMapping[int, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: typing.Optional[asyncio.Task] = None
+
+    async def open(self) -> None:
+        await super().open()
+        self._flush_task = asyncio.get_event_loop().create_task(self._flush_periodically())
+
+    async def _reserve_ids(self) -> None:
+        async with self._db_engine.connect() as connection:
+            query = sqlalchemy.text(
+                "SELECT nextval(pg_get_serial_sequence('worker', 'id')) AS id "
+                "FROM generate_series(1, :count)"
+            )
+            result = await connection.execute(query, {
+                "count": self._ids_batch_size,
+            })
+            self._ids.extend(record.id for record in result.fetchall())
+
+    async def _get_id(self) -> int:
+        if not self._ids:
+            async with self._ids_lock:
+                if not self._ids:
+                    await self._reserve_ids()
+        return self._ids.popleft()
+
+    async def store_connect(
+        self,
+        entry: definition.entity.worker.Worker,
+    ) -> definition.entity.worker.WorkerConnection:
+        connect = {
+            "ip": entry.ip,
+            "address": entry.address,
+            "hardware": entry.hardware,
+            "hardware_id": entry.hardware_id,
+            "caption": entry.caption,
+        }
+        # a row the database rejects would fail the whole batch, so it is rejected here
+        _validate(connect)
+
+        try:
+            connection_id = await self._get_id()
+        except Exception as exc:
+            raise definition.storage.worker_storage.Error from exc
+
+        self._connects[connection_id] = {
+            "id": connection_id,
+            **connect,
+            "connected_at": datetime.datetime.utcnow(),
+            "disconnected_at": None,
+        }
+        return definition.entity.worker.WorkerConnection(
+            id=connection_id,
+        )
+
+    async def store_disconnect(
+        self,
+        entry: definition.entity.worker.WorkerConnection,
+    ) -> None:
+        disconnected_at = datetime.datetime.utcnow()
+
+        connect = self._connects.get(entry.id)
+        if connect is not None:
+            connect["disconnected_at"] = disconnected_at
+            return
+
+        self._disconnects[entry.id] = disconnected_at
+
+    def _restore(
+        self,
+        connects: typing.Mapping[int, dict],
+        disconnects: typing.Mapping[int, datetime.datetime],
+    ) -> None:
+        for connection_id, disconnected_at in self._disconnects.items():
+            connect = connects.get(connection_id)
+            if connect is not None:
+                connect["disconnected_at"] = disconnected_at
+            else:
+                disconnects[connection_id] = disconnected_at
+
+        self._connects = {**connects, **self._connects}
+        self._disconnects = dict(disconnects)
+
+    async def _write(
+        self,
+        connects: typing.Collection[dict],
+        disconnects: typing.Mapping[int, datetime.datetime],
+    ) -> None:
+        async with self._db_engine.begin() as connection:
+            if connects:
+                await connection.execute(sqlalchemy.dialects.postgresql.insert(
+                    libs.database.tables.worker.worker,
+                ).values(
+                    list(connects),
+                ))
+            if disconnects:
+                await connection.execute(
+                    sqlalchemy.text(
+                        "UPDATE worker SET disconnected_at = disconnection.disconnected_at "
+                        "FROM unnest(CAST(:ids AS INTEGER[]), CAST(:disconnected_at AS TIMESTAMP[])) "
+                        "AS disconnection (id, disconnected_at) "
+                        "WHERE worker.id = disconnection.id"
+                    ),
+                    {
+                        "ids": list(disconnects.keys()),
+                        "disconnected_at": list(disconnects.values()),
+                    },
+                )
+
+    def _should_retry(
+        self,
+        connection_id: int,
+        exc: Exception,
+    ) -> bool:
+        attempt = self._failed_flushes.get(connection_id, 0) + 1
+        if not isinstance(exc, self._row_errors) and attempt < self._flush_attempts:
+            self._failed_flushes[connection_id] = attempt
+            return True
+
+        self._failed_flushes.pop(connection_id, None)
+        if self._logger is not None:
+            self._logger.info(f"[Connection ID: {connection_id}] Worker connection dropped after {attempt} failed flushes")
+            self._logger.exception(exc, exc_info=exc)
+        return False
+
+    async def _write_by_row(
+        self,
+        connects: typing.Mapping[int, dict],
+        disconnects: typing.Mapping[int, datetime.datetime],
+    ) -> typing.Tuple[typing.Mapping[int, dict], typing.Mapping[int, datetime.datetime]]:
+        failed_connects = {}
+        for connection_id, connect in connects.items():
+            try:
+                await self._write(
+                    connects=(connect,),
+                    disconnects={},
+                )
+            except Exception as exc:
+                if self._should_retry(connection_id, exc):
+                    failed_connects[connection_id] = connect
+            else:
+                self._failed_flushes.pop(connection_id, None)
+
+        failed_disconnects = {}
+        if not disconnects:
+            return failed_connects, failed_disconnects
+        try:
+            await self._write(
+                connects=(),
+                disconnects=disconnects,
+            )
+        except Exception as exc:
+            for connection_id, disconnected_at in disconnects.items():
+                if self._should_retry(connection_id, exc):
+                    failed_disconnects[connection_id] = disconnected_at
+        else:
+            for connection_id in disconnects:
+                self._failed_flushes.pop(connection_id, None)
+        return failed_connects, failed_disconnects
+
+    async def _flush(self) -> None:
+        async with self._flush_lock:
+            if not self._connects and not self._disconnects:
+                return
+
+            connects, self._connects = self._connects, {}
+            disconnects, self._disconnects = self._disconnects, {}
+            try:
+                await self._write(
+                    connects=connects.values(),
+                    disconnects=disconnects,
+                )
+            except self._row_errors:
+                # the rows are written one by one, the rejected ones are dropped
+                failed_connects, failed_disconnects = connects, disconnects
+                try:
+                    failed_connects, failed_disconnects = await self._write_by_row(
+                        connects=connects,
+                        disconnects=disconnects,
+                    )
+                finally:
+                    # rows written before an interruption are rejected as duplicates next time
+                    self._restore(
+                        connects=failed_connects,
+                        disconnects=failed_disconnects,
+                    )
+                return
+            except Exception as exc:
+                self._restore(
+                    connects={
+                        connection_id: connect
+                        for connection_id, connect in connects.items()
+                        if self._should_retry(connection_id, exc)
+                    },
+                    disconnects={
+                        connection_id: disconnected_at
+                        for connection_id, disconnected_at in disconnects.items()
+                        if self._should_retry(connection_id, exc)
+                    },
+                )
+                raise
+            except BaseException:
+                self._restore(
+                    connects=connects,
+                    disconnects=disconnects,
+                )
+                raise
+
+            for connection_id in (*connects, *disconnects):
+                self._failed_flushes.pop(connection_id, None)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            try:
+                await asyncio.shield(self._flush())
+            except Exception as exc:
+                if self._logger is not None:
+                    self._logger.exception(exc)
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        if self._flush_task is not None:
+            if not self._flush_task.done():
+                self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        if self._db_engine:
+            # a shielded flush may still be running, the last one waits for it and writes what is left
+            try:
+                await self._flush()
+            except Exception as exc:
+                logger.exception(exc)
+
+            left = len(self._connects) + len(self._disconnects)
+            if left and logger is not None:
+                logger.info(f"{left} worker connection updates are not stored on close")
+
+        await super().close(
+            logger=logger,
+        )
+
+
+def _validate(
+    values: typing.Mapping[str, typing.Any],
+) -> None:
+    for name, value in values.items():
+        column_type = libs.database.tables.worker.worker.c[name].type
+        if not isinstance(column_type, sqlalchemy.String):
+            continue
+        if not isinstance(value, str):
+            raise definition.storage.worker_storage.Error(f"Worker {name} is not a string")
+        if column_type.length is not None and len(value) > column_type.length:
+            raise definition.storage.worker_storage.Error(f"Worker {name} is longer than {column_type.length}")
+        if "\x00" in value:
+            raise definition.storage.worker_storage.Error(f"Worker {name} contains NUL character")
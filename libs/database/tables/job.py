@@ -9,5 +9,6 @@ job = sqlalchemy.Table(
     sqlalchemy.Column("block_height", sqlalchemy.Integer, index=True, unique=True, nullable=False),
     sqlalchemy.Column("epoch_challenge", sqlalchemy.Text, nullable=False),
     sqlalchemy.Column("task_id", sqlalchemy.String(36), index=True, unique=True, nullable=False),
+    sqlalchemy.Column("proof_target", sqlalchemy.Numeric(20, 0), nullable=True),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime(timezone=False), nullable=False, server_default=sqlalchemy.text("(now() at time zone 'utc')")),
 )
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import typing
+
+import definition.frame_batcher
+
+
+class Batcher(definition.frame_batcher.Batcher):
+    __slots__ = (
+        "_send",
+        "_join",
+        "_logger",
+        "_window_seconds",
+        "_max_size",
+
+        "_items",
+        "_flush_handle",
+        "_flush_tasks",
+    )
+
+    def __init__(
+        self,
+        send: typing.Callable[[bytes], typing.Awaitable[None]],
+        join: typing.Callable[[typing.Sequence[bytes]], bytes],
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        window_seconds: float = 0.005,
+        max_size: int = 64,
+    ) -> None:
+        self._send = send
+        self._join = join
+        self._logger = logger
+        self._window_seconds = window_seconds
+        self._max_size = max_size
+
+        self._items: typing.MutableSequence[bytes] = []
+        self._flush_handle: typing.Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: typing.Set[asyncio.Task] = set()
+
+    def _schedule_flush(self) -> None:
+        self._flush_handle = None
+        if not self._items:
+            return
+
+        items, self._items = self._items, []
+        task = asyncio.get_event_loop().create_task(self._flush(items))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(
+        self,
+        items: typing.Sequence[bytes],
+    ) -> None:
+        try:
+            await self._send(self._join(items))
+        except Exception as exc:
+            self._logger.debug(f"Can not send {len(items)} batched frames")
+            self._logger.exception(exc)
+
+    async def add(
+        self,
+        item: bytes,
+    ) -> None:
+        self._items.append(item)
+        if len(self._items) >= self._max_size:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            # the first item opens the window, later ones ride along
+            self._flush_handle = asyncio.get_event_loop().call_later(self._window_seconds, self._schedule_flush)
+
+    async def close(self) -> None:
+        # the connection is gone, there is nobody to flush to
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._items = []
+        for task in tuple(self._flush_tasks):
+            task.cancel()
@@ -0,0 +1,226 @@
+import asyncio
+import itertools
+import logging
+import typing
+
+import definition.consumer
+import definition.hub
+import definition.routing_index
+
+
+class _Subscriber(typing.NamedTuple):
+    queue: asyncio.Queue
+    task: asyncio.Task
+
+
+class Hub(definition.hub.Hub):
+    __slots__ = (
+        "_consumer",
+        "_message_cls",
+        "_logger",
+        "_queue_size",
+        "_observers",
+        "_batch_size",
+
+        "_ids",
+        "_subscribers",
+        "_consume_task",
+    )
+
+    def __init__(
+        self,
+        consumer: definition.consumer.Consumer,
+        message_cls: typing.Type[definition.hub.Data],
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        queue_size: int = 16,
+        observers: typing.Sequence[definition.hub.Observer] = (),
+        batch_size: int = 1,
+    ) -> None:
+        self._consumer = consumer
+        self._message_cls = message_cls
+        self._logger = logger
+        self._queue_size = queue_size
+        self._observers = observers
+        self._batch_size = batch_size
+
+        self._ids = itertools.count()
+        self._subscribers: typing.MutableMapping[int, _Subscriber] = {}
+        self._consume_task: typing.Optional[asyncio.Task] = None
+
+    def open(
+        self,
+        on_stop: typing.Optional[typing.Callable[[typing.Optional[Exception]], None]] = None,
+    ) -> None:
+        self._consume_task = asyncio.get_event_loop().create_task(self._consume(
+            on_stop=on_stop,
+        ))
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        if self._consume_task is not None:
+            if not self._consume_task.done():
+                self._consume_task.cancel()
+
+        for subscription in tuple(self._subscribers):
+            self.unsubscribe(subscription)
+
+        await self._consumer.close(
+            logger=logger,
+        )
+
+    async def _consume(
+        self,
+        on_stop: typing.Optional[typing.Callable[[typing.Optional[Exception]], None]] = None,
+    ) -> None:
+        error: typing.Optional[Exception] = None
+        try:
+            if self._batch_size > 1:
+                # bursts are fetched and decoded in one go, the subscribers still get messages one by one
+                await self._consumer.consume_batch(
+                    message_cls=self._message_cls,
+                    handler=self._dispatch_many,
+                    max_records=self._batch_size,
+                    logger=self._logger,
+                )
+            else:
+                await self._consumer.consume(
+                    message_cls=self._message_cls,
+                    handler=self._dispatch,
+                    logger=self._logger,
+                )
+        except Exception as exc:
+            if not isinstance(exc, definition.consumer.DisconnectError):
+                self._logger.exception(exc)
+            error = exc
+        finally:
+            if on_stop is not None:
+                on_stop(error)
+
+    @staticmethod
+    def _put(
+        queue: asyncio.Queue,
+        data: definition.hub.Data,
+    ) -> None:
+        if queue.full():
+            # slow subscriber loses the oldest pending message, not the newest one
+            queue.get_nowait()
+        queue.put_nowait(data)
+
+    async def _dispatch(
+        self,
+        data: definition.hub.Data,
+    ) -> None:
+        for observer in self._observers:
+            observer.update(data)
+
+        for subscriber in self._subscribers.values():
+            self._put(subscriber.queue, data)
+
+    async def _dispatch_many(
+        self,
+        batch: typing.Sequence[definition.hub.Data],
+    ) -> None:
+        for data in batch:
+            # one bad message or observer does not cost the rest of the batch
+            try:
+                await self._dispatch(data)
+            except Exception as exc:
+                self._logger.exception(exc)
+
+    async def _deliver(
+        self,
+        queue: asyncio.Queue,
+        handler: typing.Callable[[definition.hub.Data], typing.Awaitable[None]],
+    ) -> None:
+        while True:
+            data = await queue.get()
+            try:
+                await handler(data)
+            except Exception as exc:
+                self._logger.exception(exc)
+
+    def subscribe(
+        self,
+        handler: typing.Callable[[definition.hub.Data], typing.Awaitable[None]],
+    ) -> int:
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        subscription = next(self._ids)
+        self._subscribers[subscription] = _Subscriber(
+            queue=queue,
+            task=asyncio.get_event_loop().create_task(self._deliver(
+                queue=queue,
+                handler=handler,
+            )),
+        )
+        return subscription
+
+    def unsubscribe(
+        self,
+        subscription: int,
+    ) -> None:
+        subscriber = self._subscribers.pop(subscription, None)
+        if subscriber is None:
+            return
+
+        if not subscriber.task.done():
+            subscriber.task.cancel()
+
+
+class RoutingHub(Hub, definition.hub.RoutingHub):
+    __slots__ = (
+        "_index",
+        "_get_route",
+    )
+
+    def __init__(
+        self,
+        consumer: definition.consumer.Consumer,
+        message_cls: typing.Type[definition.hub.Data],
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        index: definition.routing_index.Index,
+        get_route: typing.Callable[[definition.hub.Data], typing.Tuple[int, int]],
+        queue_size: int = 16,
+        observers: typing.Sequence[definition.hub.Observer] = (),
+        batch_size: int = 1,
+    ) -> None:
+        super().__init__(
+            consumer=consumer,
+            message_cls=message_cls,
+            logger=logger,
+            queue_size=queue_size,
+            observers=observers,
+            batch_size=batch_size,
+        )
+        self._index = index
+        self._get_route = get_route
+
+    async def _dispatch(
+        self,
+        data: definition.hub.Data,
+    ) -> None:
+        for observer in self._observers:
+            observer.update(data)
+
+        height, target = self._get_route(data)
+        for subscription in self._index.route(height, target):
+            subscriber = self._subscribers.get(subscription)
+            if subscriber is not None:
+                self._put(subscriber.queue, data)
+
+    def wait(
+        self,
+        subscription: int,
+        height: int,
+        target: int,
+    ) -> None:
+        if subscription in self._subscribers:
+            self._index.add(subscription, height, target)
+
+    def unsubscribe(
+        self,
+        subscription: int,
+    ) -> None:
+        self._index.remove(subscription)
+        super().unsubscribe(subscription)
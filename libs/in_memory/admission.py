@@ -0,0 +1,115 @@
+import asyncio
+import contextlib
+import random
+import typing
+
+import definition.admission
+
+
+class Admission(definition.admission.Admission):
+    __slots__ = (
+        "_concurrency",
+        "_rate",
+        "_burst",
+        "_queue_size",
+        "_max_wait_seconds",
+
+        "_semaphore",
+        "_tokens",
+        "_refilled_at",
+        "_in_progress",
+        "_waiting",
+        "_admitted",
+        "_rejected",
+    )
+
+    def __init__(
+        self,
+        concurrency: int = 100,
+        rate: float = 200,
+        burst: int = 200,
+        queue_size: int = 1000,
+        max_wait_seconds: float = 5,
+    ) -> None:
+        self._concurrency = concurrency
+        self._rate = rate
+        self._burst = burst
+        self._queue_size = queue_size
+        self._max_wait_seconds = max_wait_seconds
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tokens = float(burst)
+        self._refilled_at: typing.Optional[float] = None
+        self._in_progress = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    def _take_token(self) -> float:
+        now = asyncio.get_event_loop().time()
+        if self._refilled_at is not None:
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+        # the token is reserved even if it is not available yet, the caller waits for it
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0
+        return -self._tokens / self._rate
+
+    def _reject(
+        self,
+        retry_after: float,
+    ) -> float:
+        self._rejected += 1
+        # spread retries of a reconnect storm instead of bringing it back at once
+        return retry_after + random.uniform(0, max(retry_after, 1))
+
+    async def _acquire(self) -> typing.Optional[float]:
+        if self._waiting >= self._queue_size:
+            return self._reject(self._max_wait_seconds)
+
+        self._waiting += 1
+        try:
+            delay = self._take_token()
+            if delay > self._max_wait_seconds:
+                self._tokens += 1
+                return self._reject(delay)
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self._max_wait_seconds)
+            except asyncio.TimeoutError:
+                return self._reject(self._max_wait_seconds)
+        finally:
+            self._waiting -= 1
+
+        return None
+
+    @contextlib.asynccontextmanager
+    async def admit(  # noqa
+        self,
+    ) -> typing.AsyncIterator[typing.Optional[float]]:
+        retry_after = await self._acquire()
+        if retry_after is not None:
+            yield retry_after
+            return
+
+        self._in_progress += 1
+        self._admitted += 1
+        try:
+            yield None
+        finally:
+            self._in_progress -= 1
+            self._semaphore.release()
+
+    def stats(self) -> typing.Mapping[str, typing.Union[int, float]]:
+        return {
+            "in_progress": self._in_progress,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "tokens": max(self._tokens, 0),
+        }
@@ -0,0 +1,34 @@
+import collections
+import typing
+
+import definition.frame_cache
+
+
+class Cache(definition.frame_cache.Cache):
+    __slots__ = (
+        "_max_size",
+        "_storage",
+    )
+
+    def __init__(
+        self,
+        max_size: int = 16,
+    ) -> None:
+        self._max_size = max_size
+        self._storage: typing.OrderedDict[definition.frame_cache.Key, bytes] = collections.OrderedDict()
+
+    def get(
+        self,
+        key: definition.frame_cache.Key,
+        build: typing.Callable[[], bytes],
+    ) -> bytes:
+        frame = self._storage.get(key)
+        if frame is not None:
+            self._storage.move_to_end(key)
+            return frame
+
+        frame = build()
+        self._storage[key] = frame
+        while len(self._storage) > self._max_size:
+            self._storage.popitem(last=False)
+        return frame
@@ -0,0 +1,86 @@
+import collections
+import logging
+import time
+import typing
+
+import definition.entity.job
+import definition.job_cache
+
+
+class Cache(definition.job_cache.Cache):
+    __slots__ = (
+        "_max_size",
+        "_ttl_seconds",
+
+        "_entries",
+    )
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        ttl_seconds: int = 60 * 60,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+
+        self._entries: typing.OrderedDict[str, typing.Tuple[float, definition.entity.job.JobStorageMetadata]] = (
+            collections.OrderedDict()
+        )
+
+    async def open(self) -> None:
+        ...
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        ...
+
+    def get_local(
+        self,
+        task_id: str,
+    ) -> typing.Optional[definition.entity.job.JobStorageMetadata]:
+        item = self._entries.get(task_id)
+        if item is None:
+            return None
+
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            del self._entries[task_id]
+            return None
+
+        self._entries.move_to_end(task_id)
+        return entry
+
+    def put_local(
+        self,
+        entry: definition.entity.job.JobStorageMetadata,
+    ) -> None:
+        self._entries[entry.task_id] = (time.monotonic() + self._ttl_seconds, entry)
+        self._entries.move_to_end(entry.task_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        task_id: str,
+    ) -> typing.Optional[definition.entity.job.JobStorageMetadata]:
+        return self.get_local(task_id)
+
+    async def put(
+        self,
+        entry: definition.entity.job.JobStorageMetadata,
+    ) -> None:
+        self.put_local(entry)
+
+    def update(
+        self,
+        data: definition.entity.job.JobTransferMetadata,
+    ) -> bool:
+        # broadcast jobs warm the cache before their solutions come in
+        self.put_local(definition.entity.job.JobStorageMetadata(
+            task_id=data.task_id,
+            block_height=data.block_height,
+            created_at=data.created_at,
+        ))
+        return True
@@ -0,0 +1,95 @@
+import collections
+import hashlib
+import logging
+import typing
+import uuid
+
+import definition.entity.job
+import definition.job_deduplicator
+
+import libs.json
+
+
+Key = typing.Tuple[int, str]
+
+
+def get_key(
+    job: definition.entity.job.JobInput,
+) -> Key:
+    # keys are sorted on dumps, so nodes sending the same challenge get the same hash
+    return job.block_height, hashlib.blake2b(libs.json.dumps(job.epoch_challenge), digest_size=16).hexdigest()
+
+
+def get_task_id(
+    job: definition.entity.job.JobInput,
+) -> str:
+    # every copy of a job gets the same task id, whichever pod or node it comes from
+    height, challenge_hash = get_key(job)
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{height}.{challenge_hash}"))
+
+
+class Deduplicator(definition.job_deduplicator.Deduplicator):
+    __slots__ = (
+        "_window_size",
+
+        "_keys",
+        "_claimed",
+        "_duplicated",
+    )
+
+    def __init__(
+        self,
+        window_size: int = 1024,
+    ) -> None:
+        self._window_size = window_size
+
+        self._keys: typing.OrderedDict[Key, None] = collections.OrderedDict()
+        self._claimed = 0
+        self._duplicated = 0
+
+    async def open(self) -> None:
+        ...
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        ...
+
+    def claim_key(
+        self,
+        key: Key,
+    ) -> bool:
+        if key in self._keys:
+            self._duplicated += 1
+            return False
+
+        self._keys[key] = None
+        while len(self._keys) > self._window_size:
+            self._keys.popitem(last=False)
+        self._claimed += 1
+        return True
+
+    def release_key(
+        self,
+        key: Key,
+    ) -> None:
+        self._keys.pop(key, None)
+
+    async def claim(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> bool:
+        return self.claim_key(get_key(job))
+
+    async def release(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> None:
+        self.release_key(get_key(job))
+
+    def stats(self) -> typing.Mapping[str, int]:
+        return {
+            "jobs_claimed": self._claimed,
+            "jobs_deduplicated": self._duplicated,
+        }
@@ -0,0 +1,29 @@
+import typing
+
+import definition.entity.job
+import definition.snapshot
+
+
+class Snapshot(definition.snapshot.Snapshot):
+    __slots__ = (
+        "_job",
+    )
+
+    def __init__(self) -> None:
+        self._job: typing.Optional[definition.entity.job.JobTransferMetadata] = None
+
+    def get(self) -> typing.Optional[definition.entity.job.JobTransferMetadata]:
+        return self._job
+
+    def update(
+        self,
+        data: typing.Optional[definition.entity.job.JobTransferMetadata],
+    ) -> bool:
+        if data is None:
+            return False
+
+        if (self._job is not None) and (self._job.block_height >= data.block_height):
+            return False
+
+        self._job = data
+        return True
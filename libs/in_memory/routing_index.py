@@ -0,0 +1,122 @@
+import bisect
+import collections
+import functools
+import typing
+
+import definition.routing_index
+import definition.timer_wheel
+
+
+class _Waiting:
+    __slots__ = (
+        "targets",
+        "subscriptions",
+    )
+
+    def __init__(self) -> None:
+        # both lists are ordered by target, so eligible subscriptions are always a prefix
+        self.targets: typing.MutableSequence[int] = []
+        self.subscriptions: typing.MutableSequence[definition.routing_index.Subscription] = []
+
+
+class Index(definition.routing_index.Index):
+    __slots__ = (
+        "_timer_wheel",
+        "_wait_time_seconds",
+
+        "_heights",
+        "_subscriptions",
+    )
+
+    def __init__(
+        self,
+        timer_wheel: definition.timer_wheel.TimerWheel,
+        wait_time_seconds: int = 20 * 60,
+    ) -> None:
+        self._timer_wheel = timer_wheel
+        self._wait_time_seconds = wait_time_seconds
+
+        self._heights: typing.MutableMapping[int, _Waiting] = {}
+        self._subscriptions: typing.MutableMapping[definition.routing_index.Subscription, typing.Counter[int]] = {}
+
+    def _discard(
+        self,
+        height: int,
+        target: int,
+        subscription: definition.routing_index.Subscription,
+    ) -> None:
+        waiting = self._heights.get(height)
+        if waiting is None:
+            return
+
+        start = bisect.bisect_left(waiting.targets, target)
+        end = bisect.bisect_right(waiting.targets, target, lo=start)
+        for index in range(start, end):
+            if waiting.subscriptions[index] == subscription:
+                del waiting.targets[index]
+                del waiting.subscriptions[index]
+                break
+        else:
+            return
+
+        if not waiting.targets:
+            del self._heights[height]
+
+        heights = self._subscriptions[subscription]
+        heights[height] -= 1
+        if heights[height] <= 0:
+            del heights[height]
+
+    def add(
+        self,
+        subscription: definition.routing_index.Subscription,
+        height: int,
+        target: int,
+    ) -> None:
+        waiting = self._heights.get(height)
+        if waiting is None:
+            waiting = self._heights[height] = _Waiting()
+        index = bisect.bisect_right(waiting.targets, target)
+        waiting.targets.insert(index, target)
+        waiting.subscriptions.insert(index, subscription)
+
+        self._subscriptions.setdefault(subscription, collections.Counter())[height] += 1
+        self._timer_wheel.schedule(
+            delay_seconds=self._wait_time_seconds,
+            callback=functools.partial(
+                self._discard,
+                height=height,
+                target=target,
+                subscription=subscription,
+            ),
+        )
+
+    def route(
+        self,
+        height: int,
+        target: int,
+    ) -> typing.Collection[definition.routing_index.Subscription]:
+        waiting = self._heights.get(height)
+        if (waiting is None) or (waiting.targets[0] > target):
+            return ()
+        return set(waiting.subscriptions[:bisect.bisect_right(waiting.targets, target)])
+
+    def remove(
+        self,
+        subscription: definition.routing_index.Subscription,
+    ) -> None:
+        heights = self._subscriptions.pop(subscription, None)
+        if heights is None:
+            return
+
+        for height in heights:
+            waiting = self._heights[height]
+            kept = [
+                (target, other) for target, other in zip(waiting.targets, waiting.subscriptions)
+                if other != subscription
+            ]
+            if kept:
+                waiting.targets = [target for target, _ in kept]
+                waiting.subscriptions = [other for _, other in kept]
+            else:
+                del self._heights[height]
@@ -0,0 +1,131 @@
+import collections
+import typing
+
+import definition.entity.job
+import definition.entity.solution
+import definition.solution_filter
+
+
+class _Job(typing.NamedTuple):
+    height: int
+    proof_target: typing.Optional[int]
+
+
+def _get_nonce(
+    solution: definition.entity.solution.SolutionInput,
+) -> typing.Optional[str]:
+    try:
+        # the same key solution storage deduplicates on
+        return str(solution.solution["partial_solution"]["nonce"])
+    except (KeyError, TypeError):
+        return None
+
+
+class Filter(definition.solution_filter.Filter):
+    __slots__ = (
+        "_jobs_size",
+        "_nonces_size",
+        "_max_height_lag",
+
+        "_jobs",
+        "_nonces",
+        "_height",
+        "_passed",
+        "_dropped",
+    )
+
+    def __init__(
+        self,
+        jobs_size: int = 64,
+        nonces_size: int = 100_000,
+        max_height_lag: int = 10,
+    ) -> None:
+        self._jobs_size = jobs_size
+        self._nonces_size = nonces_size
+        self._max_height_lag = max_height_lag
+
+        self._jobs: typing.OrderedDict[str, _Job] = collections.OrderedDict()
+        self._nonces: typing.OrderedDict[str, None] = collections.OrderedDict()
+        self._height: typing.Optional[int] = None
+        self._passed = 0
+        self._dropped = 0
+
+    def update(
+        self,
+        data: typing.Optional[definition.entity.job.JobTransferMetadata],
+    ) -> bool:
+        if data is None:
+            return False
+
+        self._jobs[data.task_id] = _Job(
+            height=data.block_height,
+            proof_target=data.proof_target,
+        )
+        self._jobs.move_to_end(data.task_id)
+        while len(self._jobs) > self._jobs_size:
+            self._jobs.popitem(last=False)
+
+        if (self._height is None) or (self._height < data.block_height):
+            self._height = data.block_height
+        return True
+
+    def _check(
+        self,
+        solution: definition.entity.solution.SolutionInput,
+    ) -> typing.Optional[str]:
+        job = self._jobs.get(solution.task_id)
+        if job is None:
+            return "unknown task"
+
+        if self._height - job.height > self._max_height_lag:
+            return "stale task"
+
+        if (job.proof_target is not None) and (solution.solution_target < job.proof_target):
+            return "target is below proof target"
+
+        nonce = _get_nonce(solution)
+        if nonce is None:
+            return "no nonce"
+
+        if nonce in self._nonces:
+            return "duplicate nonce"
+
+        self._nonces[nonce] = None
+        while len(self._nonces) > self._nonces_size:
+            self._nonces.popitem(last=False)
+        return None
+
+    def check(
+        self,
+        solution: definition.entity.solution.SolutionInput,
+    ) -> typing.Optional[str]:
+        reason = self._check(solution)
+        if reason is None:
+            self._passed += 1
+        else:
+            self._dropped += 1
+        return reason
+
+    def forget(
+        self,
+        solution: definition.entity.solution.SolutionInput,
+    ) -> None:
+        # the solution was not published, so the worker may send it again
+        nonce = _get_nonce(solution)
+        if nonce is not None:
+            self._nonces.pop(nonce, None)
+
+    def get_height(
+        self,
+        task_id: str,
+    ) -> typing.Optional[int]:
+        job = self._jobs.get(task_id)
+        if job is None:
+            return None
+        return job.height
+
+    def stats(self) -> typing.Mapping[str, int]:
+        return {
+            "solutions_passed": self._passed,
+            "solutions_dropped": self._dropped,
+        }
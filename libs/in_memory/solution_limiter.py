@@ -0,0 +1,205 @@
+import collections
+import time
+import typing
+
+import definition.entity.worker
+import definition.solution_limiter
+
+
+class _Bucket:
+    __slots__ = (
+        "tokens",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        tokens: float,
+        updated_at: float,
+    ) -> None:
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+    def take(
+        self,
+        rate: float,
+        burst: int,
+        now: float,
+    ) -> float:
+        self.tokens = min(burst, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        # the token is reserved even if it is not available yet, the caller waits for it
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / rate
+
+
+class _Penalty:
+    __slots__ = (
+        "score",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        updated_at: float,
+    ) -> None:
+        self.score = 0.
+        self.updated_at = updated_at
+
+    def decay(
+        self,
+        rate: float,
+        now: float,
+    ) -> float:
+        self.score = max(0., self.score - (now - self.updated_at) * rate)
+        self.updated_at = now
+        return self.score
+
+
+class _Worker(typing.NamedTuple):
+    bucket: _Bucket
+    penalty: _Penalty
+
+
+class Limiter(definition.solution_limiter.Limiter):
+    __slots__ = (
+        "_connection_rate",
+        "_connection_burst",
+        "_worker_rate",
+        "_worker_burst",
+        "_workers_size",
+        "_max_throttle_seconds",
+        "_penalty_decay_rate",
+        "_throttle_score",
+        "_drop_score",
+        "_disconnect_score",
+
+        "_connections",
+        "_workers",
+        "_throttled",
+        "_dropped",
+        "_disconnected",
+    )
+
+    def __init__(
+        self,
+        connection_rate: float = 20,
+        connection_burst: int = 50,
+        worker_rate: float = 50,
+        worker_burst: int = 100,
+        workers_size: int = 100_000,
+        max_throttle_seconds: float = 1,
+        penalty_decay_rate: float = 1,
+        throttle_score: float = 10,
+        drop_score: float = 30,
+        disconnect_score: float = 60,
+    ) -> None:
+        self._connection_rate = connection_rate
+        self._connection_burst = connection_burst
+        self._worker_rate = worker_rate
+        self._worker_burst = worker_burst
+        self._workers_size = workers_size
+        self._max_throttle_seconds = max_throttle_seconds
+        self._penalty_decay_rate = penalty_decay_rate
+        self._throttle_score = throttle_score
+        self._drop_score = drop_score
+        self._disconnect_score = disconnect_score
+
+        self._connections: typing.MutableMapping[typing.Hashable, _Bucket] = {}
+        self._workers: typing.OrderedDict[typing.Tuple[str, str], _Worker] = collections.OrderedDict()
+        self._throttled = 0
+        self._dropped = 0
+        self._disconnected = 0
+
+    def _get_worker(
+        self,
+        worker: definition.entity.worker.Worker,
+        now: float,
+    ) -> _Worker:
+        # the same hardware keeps its budget and penalties across reconnects
+        key = (worker.hardware_id, worker.caption)
+        state = self._workers.get(key)
+        if state is None:
+            state = self._workers[key] = _Worker(
+                bucket=_Bucket(tokens=self._worker_burst, updated_at=now),
+                penalty=_Penalty(updated_at=now),
+            )
+            while len(self._workers) > self._workers_size:
+                self._workers.popitem(last=False)
+        else:
+            self._workers.move_to_end(key)
+        return state
+
+    def _decide(
+        self,
+        connection_id: typing.Hashable,
+        worker: definition.entity.worker.Worker,
+        now: float,
+    ) -> definition.solution_limiter.Decision:
+        state = self._get_worker(worker, now)
+
+        score = state.penalty.decay(self._penalty_decay_rate, now)
+        if score >= self._disconnect_score:
+            return definition.solution_limiter.Decision(definition.solution_limiter.DISCONNECT)
+        if score >= self._drop_score:
+            return definition.solution_limiter.Decision(definition.solution_limiter.DROP)
+
+        connection = self._connections.get(connection_id)
+        if connection is None:
+            connection = self._connections[connection_id] = _Bucket(tokens=self._connection_burst, updated_at=now)
+
+        delay = max(
+            connection.take(self._connection_rate, self._connection_burst, now),
+            state.bucket.take(self._worker_rate, self._worker_burst, now),
+        )
+        if delay > self._max_throttle_seconds:
+            connection.tokens += 1
+            state.bucket.tokens += 1
+            # flooding past the throttle window counts as misbehaviour too
+            state.penalty.score += 1
+            return definition.solution_limiter.Decision(definition.solution_limiter.DROP)
+
+        if score >= self._throttle_score:
+            delay = max(delay, self._max_throttle_seconds * score / self._drop_score)
+
+        if delay > 0:
+            return definition.solution_limiter.Decision(definition.solution_limiter.THROTTLE, delay)
+        return definition.solution_limiter.Decision(definition.solution_limiter.PASS)
+
+    def check(
+        self,
+        connection_id: typing.Hashable,
+        worker: definition.entity.worker.Worker,
+    ) -> definition.solution_limiter.Decision:
+        decision = self._decide(connection_id, worker, time.monotonic())
+        if decision.action == definition.solution_limiter.THROTTLE:
+            self._throttled += 1
+        elif decision.action == definition.solution_limiter.DROP:
+            self._dropped += 1
+        elif decision.action == definition.solution_limiter.DISCONNECT:
+            self._disconnected += 1
+        return decision
+
+    def penalize(
+        self,
+        worker: definition.entity.worker.Worker,
+    ) -> None:
+        now = time.monotonic()
+        state = self._get_worker(worker, now)
+        state.penalty.decay(self._penalty_decay_rate, now)
+        state.penalty.score += 1
+
+    def forget(
+        self,
+        connection_id: typing.Hashable,
+    ) -> None:
+        self._connections.pop(connection_id, None)
+
+    def stats(self) -> typing.Mapping[str, int]:
+        return {
+            "solutions_throttled": self._throttled,
+            "solutions_rate_dropped": self._dropped,
+            "workers_disconnected": self._disconnected,
+        }
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import math
+import typing
+
+import definition.timer_wheel
+
+
+class _Timer:
+    __slots__ = (
+        "deadline",
+        "callback",
+        "cancelled",
+    )
+
+    def __init__(
+        self,
+        deadline: int,
+        callback: typing.Callable[[], None],
+    ) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+
+class TimerWheel(definition.timer_wheel.TimerWheel):
+    __slots__ = (
+        "_logger",
+        "_tick_seconds",
+        "_slots",
+        "_levels",
+
+        "_tick",
+        "_wheels",
+        "_started_at",
+        "_task",
+    )
+
+    def __init__(
+        self,
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        tick_seconds: float = 1,
+        slots: int = 64,
+        levels: int = 3,
+    ) -> None:
+        self._logger = logger
+        self._tick_seconds = tick_seconds
+        self._slots = slots
+        self._levels = levels
+
+        self._tick = 0
+        # level n slot covers slots ** n ticks, timers move down a level when their slot comes up
+        self._wheels: typing.Sequence[typing.Sequence[typing.MutableSequence[_Timer]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._started_at: typing.Optional[float] = None
+        self._task: typing.Optional[asyncio.Task] = None
+
+    def open(self) -> None:
+        loop = asyncio.get_event_loop()
+        self._started_at = loop.time() - self._tick * self._tick_seconds
+        self._task = loop.create_task(self._run())
+
+    def close(self) -> None:
+        if self._task is not None:
+            if not self._task.done():
+                self._task.cancel()
+
+    def _place(
+        self,
+        timer: _Timer,
+    ) -> bool:
+        remaining = timer.deadline - self._tick
+        if remaining <= 0:
+            return False
+
+        for level in range(self._levels):
+            if remaining < self._slots ** (level + 1):
+                self._wheels[level][(timer.deadline // self._slots ** level) % self._slots].append(timer)
+                return True
+
+        # beyond the wheel range: park in the last slot of the top level and place again on its cascade
+        level = self._levels - 1
+        deadline = self._tick + self._slots ** self._levels - 1
+        self._wheels[level][(deadline // self._slots ** level) % self._slots].append(timer)
+        return True
+
+    def _fire(
+        self,
+        timer: _Timer,
+    ) -> None:
+        try:
+            timer.callback()
+        except Exception as exc:
+            self._logger.exception(exc)
+
+    def _advance(self) -> None:
+        self._tick += 1
+
+        due: typing.MutableSequence[_Timer] = []
+        for level in range(self._levels - 1, 0, -1):
+            if self._tick % self._slots ** level:
+                continue
+            slot = self._wheels[level][(self._tick // self._slots ** level) % self._slots]
+            timers, slot[:] = list(slot), []
+            for timer in timers:
+                if not timer.cancelled and not self._place(timer):
+                    due.append(timer)
+
+        slot = self._wheels[0][self._tick % self._slots]
+        timers, slot[:] = list(slot), []
+        for timer in timers:
+            if not timer.cancelled and not self._place(timer):
+                due.append(timer)
+
+        for timer in due:
+            self._fire(timer)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self._tick_seconds)
+            # catch up with the ticks missed while the loop was busy
+            target = int((loop.time() - self._started_at) / self._tick_seconds)
+            while self._tick < target:
+                self._advance()
+
+    def schedule(
+        self,
+        delay_seconds: float,
+        callback: typing.Callable[[], None],
+    ) -> _Timer:
+        timer = _Timer(
+            deadline=self._tick + max(math.ceil(delay_seconds / self._tick_seconds), 1),
+            callback=callback,
+        )
+        self._place(timer)
+        return timer
+
+    def cancel(
+        self,
+        timer: _Timer,
+    ) -> None:
+        timer.cancelled = True
@@ -11,3 +11,16 @@ def dumps(
     option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS,
 ) -> bytes:
     return orjson.dumps(data, option=option)
+
+
+def loads(
+    data: typing.Union[str, bytes],
+) -> typing.Any:
+    return orjson.loads(data)
+
+
+def join(
+    items: typing.Sequence[bytes],
+) -> bytes:
+    # already encoded items make up an array without decoding them again
+    return b"[" + b",".join(items) + b"]"
@@ -23,7 +23,7 @@ class Error(Exception):
     ...
 
 
-class Consumer(definition.consumer.Consumer):
+class Consumer(definition.consumer.BatchConsumer):
     _connect_retry_attempts: int = 5
     _retry_attempts: int = 3
     _stop_wait_time_seconds: int = 15
@@ -130,6 +130,84 @@ class Consumer(definition.consumer.Consumer):
         except Exception as exc:
             raise Error from exc
 
+    @libs.retry.retry(
+        attempts=_retry_attempts,
+        ignore_exceptions=(definition.consumer.DisconnectError, ),
+    )
+    async def _commit_offsets(
+        self,
+        offsets: typing.Mapping[aiokafka.TopicPartition, int],
+    ) -> None:
+        try:
+            await self._consumer.commit(dict(offsets))
+        except aiokafka.errors.ConsumerStoppedError as exc:
+            raise definition.consumer.DisconnectError from exc
+        except Exception as exc:
+            raise Error from exc
+
+    @libs.retry.retry(
+        attempts=_retry_attempts,
+        ignore_exceptions=(definition.consumer.DisconnectError, ),
+    )
+    async def _get_messages(
+        self,
+        max_records: int,
+        timeout_ms: int,
+    ) -> typing.Sequence[_Message]:
+        try:
+            records = await self._consumer.getmany(
+                timeout_ms=timeout_ms,
+                max_records=max_records,
+            )
+        except aiokafka.errors.ConsumerStoppedError as exc:
+            raise definition.consumer.DisconnectError from exc
+        except Exception as exc:
+            raise Error from exc
+        return [message for messages in records.values() for message in messages]
+
+    async def consume_batch(
+        self,
+        message_cls: typing.Type[definition.consumer.Data],
+        handler: typing.Callable[[typing.Sequence[definition.consumer.Data]], typing.Awaitable[None]],
+        *,
+        max_records: int = 500,
+        timeout_ms: int = 1000,
+        commit_interval_seconds: float = 0,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        offsets: typing.MutableMapping[aiokafka.TopicPartition, int] = {}
+        committed_at = time.monotonic()
+        while True:
+            # returns as soon as anything is fetched, the timeout only bounds an idle wait
+            messages = await self._get_messages(
+                max_records=max_records,
+                timeout_ms=timeout_ms,
+            )
+
+            batch = []
+            for message in messages:
+                try:
+                    batch.append(libs.parsing.parse(message_cls, message.value))
+                except Exception as exc:
+                    if logger:
+                        logger.exception(exc)
+                offsets[aiokafka.TopicPartition(message.topic, message.partition)] = message.offset + 1
+
+            if batch:
+                try:
+                    await handler(batch)
+                except Exception as exc:
+                    if logger:
+                        logger.exception(exc)
+                    # offsets of a failed batch go out with the next handled one, as in consume
+                    continue
+
+            # one commit per batch at most, less often with an interval
+            if offsets and time.monotonic() - committed_at >= commit_interval_seconds:
+                await self._commit_offsets(offsets)
+                offsets = {}
+                committed_at = time.monotonic()
+
     async def consume(
         self,
         message_cls: typing.Type[definition.consumer.Data],
@@ -157,12 +235,113 @@ class Consumer(definition.consumer.Consumer):
                 await self._commit(message)
 
 
+class BroadcastConsumer(Consumer):
+    __slots__ = (
+        "_start_lag",
+        "_start_seconds_ago",
+        "_partitions",
+    )
+
+    def __init__(
+        self,
+        servers: typing.Sequence[str] = ("kafka:9093",),
+        user: str = "kafka",
+        password: str = "kafka_password",
+        topic: str = "topic",
+        start_lag: int = 0,
+        start_seconds_ago: float = 0,
+        partitions: typing.Sequence[int] = (),
+    ) -> None:
+        super().__init__(
+            servers=servers,
+            user=user,
+            password=password,
+            topic=topic,
+        )
+        self._start_lag = start_lag
+        self._start_seconds_ago = start_seconds_ago
+        # all partitions of the topic when empty
+        self._partitions = partitions
+
+    async def _seek(
+        self,
+        partitions: typing.Sequence[aiokafka.TopicPartition],
+    ) -> None:
+        end_offsets = await self._consumer.end_offsets(partitions)
+        if self._start_seconds_ago > 0:
+            timestamp_ms = int((time.time() - self._start_seconds_ago) * 1000)
+            offsets = await self._consumer.offsets_for_times({tp: timestamp_ms for tp in partitions})
+            for tp in partitions:
+                # nothing newer than the timestamp in the partition, start from its end
+                offset = offsets.get(tp)
+                self._consumer.seek(tp, end_offsets[tp] if offset is None else offset.offset)
+            return
+
+        if self._start_lag > 0:
+            beginning_offsets = await self._consumer.beginning_offsets(partitions)
+            for tp in partitions:
+                self._consumer.seek(tp, max(beginning_offsets[tp], end_offsets[tp] - self._start_lag))
+            return
+
+        for tp in partitions:
+            self._consumer.seek(tp, end_offsets[tp])
+
+    @libs.retry.retry(
+        attempts=Consumer._connect_retry_attempts,
+    )
+    async def open(self) -> None:
+        # every process reads the whole topic on its own: no group, no coordinator, no offsets to commit
+        self._consumer = aiokafka.AIOKafkaConsumer(
+            group_id=None,
+            bootstrap_servers=self._servers,
+            security_protocol="PLAINTEXT",
+            sasl_mechanism="PLAIN",
+            sasl_plain_username=self._user,
+            sasl_plain_password=self._password,
+            enable_auto_commit=False,
+        )
+        try:
+            await self._consumer.start()
+            await self._consumer.topics()
+            partition_ids = self._consumer.partitions_for_topic(self._topic)
+            if not partition_ids:
+                raise Error(f"Topic {self._topic} has no partitions")
+            if self._partitions:
+                unknown_ids = set(self._partitions) - partition_ids
+                if unknown_ids:
+                    raise Error(f"Topic {self._topic} has no partitions {sorted(unknown_ids)}")
+                partition_ids = set(self._partitions)
+
+            partitions = [aiokafka.TopicPartition(self._topic, partition_id) for partition_id in sorted(partition_ids)]
+            self._consumer.assign(partitions)
+            await self._seek(partitions)
+        except Exception:
+            await self._consumer.stop()
+            raise
+
+    async def _commit(
+        self,
+        message: _Message,
+    ) -> None:
+        ...
+
+    async def _commit_offsets(
+        self,
+        offsets: typing.Mapping[aiokafka.TopicPartition, int],
+    ) -> None:
+        ...
+
+
 class ConsumerFactory:
     __slots__ = (
         "_servers",
         "_user",
         "_password",
         "_topic",
+        "_broadcast",
+        "_start_lag",
+        "_start_seconds_ago",
+        "_partitions",
     )
 
     def __init__(
@@ -171,18 +350,37 @@ class ConsumerFactory:
         user: str = "kafka",
         password: str = "kafka_password",
         topic: str = "topic",
+        broadcast: bool = False,
+        start_lag: int = 0,
+        start_seconds_ago: float = 0,
+        partitions: typing.Sequence[int] = (),
     ) -> None:
         self._servers = servers
         self._user = user
         self._password = password
         self._topic = topic
+        self._broadcast = broadcast
+        self._start_lag = start_lag
+        self._start_seconds_ago = start_seconds_ago
+        self._partitions = partitions
 
     async def spawn(self) -> Consumer:
-        result = Consumer(
-            servers=self._servers,
-            user=self._user,
-            password=self._password,
-            topic=self._topic,
-        )
+        if self._broadcast:
+            result = BroadcastConsumer(
+                servers=self._servers,
+                user=self._user,
+                password=self._password,
+                topic=self._topic,
+                start_lag=self._start_lag,
+                start_seconds_ago=self._start_seconds_ago,
+                partitions=self._partitions,
+            )
+        else:
+            result = Consumer(
+                servers=self._servers,
+                user=self._user,
+                password=self._password,
+                topic=self._topic,
+            )
         await result.open()
         return result
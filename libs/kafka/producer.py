@@ -14,7 +14,38 @@ class Error(Exception):
     ...
 
 
-class Producer(definition.producer.Producer):
+class Profile(typing.NamedTuple):
+    linger_ms: int
+    max_batch_size: int
+    compression_type: typing.Optional[str]
+    max_in_flight: int
+
+
+PROFILES: typing.Mapping[str, Profile] = {
+    # every message goes out at once, for the fast paths
+    "latency": Profile(
+        linger_ms=0,
+        max_batch_size=16 * 1024,
+        compression_type=None,
+        max_in_flight=1024,
+    ),
+    "balanced": Profile(
+        linger_ms=5,
+        max_batch_size=64 * 1024,
+        compression_type="lz4",
+        max_in_flight=4096,
+    ),
+    # bursts are packed into few large compressed batches
+    "throughput": Profile(
+        linger_ms=20,
+        max_batch_size=256 * 1024,
+        compression_type="zstd",
+        max_in_flight=16384,
+    ),
+}
+
+
+class Producer(definition.producer.PipelinedProducer):
     _connect_retry_attempts: int = 5
     _retry_attempts: int = 3
     _stop_wait_time_seconds: int = 15
@@ -24,8 +55,15 @@ class Producer(definition.producer.Producer):
         "_user",
         "_password",
         "_topic",
+        "_get_key",
+        "_profile",
+        "_logger",
 
         "_producer",
+        "_in_flight",
+        "_deliveries",
+        "_delivered",
+        "_failed",
     )
 
     def __init__(
@@ -34,13 +72,24 @@ class Producer(definition.producer.Producer):
         user: str = "kafka",
         password: str = "kafka_password",
         topic: str = "topic",
+        get_key: typing.Optional[typing.Callable[[definition.producer.Message], typing.Hashable]] = None,
+        profile: str = "latency",
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
     ) -> None:
         self._servers = servers
         self._user = user
         self._password = password
         self._topic = topic
+        # messages with the same key go to the same partition and keep their order
+        self._get_key = get_key
+        self._profile = PROFILES[profile]
+        self._logger = logger
 
         self._producer: typing.Optional[aiokafka.AIOKafkaProducer] = None
+        self._in_flight = asyncio.Semaphore(self._profile.max_in_flight)
+        self._deliveries: typing.Set[asyncio.Future] = set()
+        self._delivered = 0
+        self._failed = 0
 
     @libs.retry.retry(
         attempts=_connect_retry_attempts,
@@ -52,6 +101,9 @@ class Producer(definition.producer.Producer):
             sasl_mechanism="PLAIN",
             sasl_plain_username=self._user,
             sasl_plain_password=self._password,
+            linger_ms=self._profile.linger_ms,
+            max_batch_size=self._profile.max_batch_size,
+            compression_type=self._profile.compression_type,
         )
         try:
             await self._producer.start()
@@ -59,12 +111,19 @@ class Producer(definition.producer.Producer):
             await self._producer.stop()
             raise
 
+    async def _stop(self) -> None:
+        # messages still lingering in batches are sent before the connection goes
+        await self._producer.flush()
+        if self._deliveries:
+            await asyncio.wait(tuple(self._deliveries))
+        await self._producer.stop()
+
     async def close(
         self,
         logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
     ) -> None:
         try:
-            await asyncio.wait_for(self._producer.stop(), self._stop_wait_time_seconds)
+            await asyncio.wait_for(self._stop(), self._stop_wait_time_seconds)
         except Exception as exc:
             if isinstance(exc, asyncio.TimeoutError):
                 return
@@ -72,6 +131,53 @@ class Producer(definition.producer.Producer):
             if logger is not None:
                 logger.exception(exc)
 
+    def _on_delivered(
+        self,
+        delivery: asyncio.Future,
+    ) -> None:
+        self._deliveries.discard(delivery)
+        self._in_flight.release()
+        if delivery.cancelled():
+            self._failed += 1
+            return
+
+        exc = delivery.exception()
+        if exc is None:
+            self._delivered += 1
+            return
+
+        # pipelined callers may never await the delivery, so the failure is reported here as well
+        self._failed += 1
+        if self._logger is not None:
+            self._logger.debug(f"[Topic: {self._topic}] Message delivery failed")
+            self._logger.exception(exc, exc_info=exc)
+
+    async def publish(
+        self,
+        message: definition.producer.Message,
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> typing.Awaitable[None]:
+        if key is None and self._get_key is not None:
+            key = self._get_key(message)
+        if not isinstance(message, bytes):
+            message = libs.json.dumps(message)
+
+        # a bounded number of messages waits for acks, a stuck broker slows producing down
+        await self._in_flight.acquire()
+        try:
+            delivery = await self._producer.send(
+                topic=self._topic,
+                value=message,
+                key=None if key is None else str(key).encode(),
+            )
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._on_delivered)
+        return delivery
+
     @libs.retry.retry(
         attempts=_retry_attempts,
     )
@@ -79,10 +185,12 @@ class Producer(definition.producer.Producer):
         self,
         message: definition.producer.Message,
     ) -> None:
-        if not isinstance(message, bytes):
-            message = libs.json.dumps(message)
-
-        await self._producer.send(
-            topic=self._topic,
-            value=message,
-        )
+        # returns once the broker has the message, a failed delivery is retried like a failed send
+        await (await self.publish(message))
+
+    def stats(self) -> typing.Mapping[str, int]:
+        return {
+            f"{self._topic}_messages_in_flight": len(self._deliveries),
+            f"{self._topic}_messages_delivered": self._delivered,
+            f"{self._topic}_messages_failed": self._failed,
+        }
@@ -0,0 +1,47 @@
+import dataclasses
+import datetime
+import typing
+
+import msgpack
+
+
+_Data = typing.TypeVar('_Data')
+
+
+def _default(
+    data: typing.Any,
+) -> typing.Any:
+    if dataclasses.is_dataclass(data):
+        return {
+            field.name: getattr(data, field.name)
+            for field in dataclasses.fields(data)
+        }
+    if isinstance(data, datetime.datetime):
+        return data.isoformat()
+    raise TypeError(f"Type is not msgpack serializable: {type(data).__name__}")
+
+
+def dumps(
+    data: _Data,
+) -> bytes:
+    return msgpack.packb(data, default=_default)
+
+
+def loads(
+    data: bytes,
+) -> typing.Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def join(
+    items: typing.Sequence[bytes],
+) -> bytes:
+    # already encoded items make up an array without decoding them again
+    size = len(items)
+    if size < 16:
+        header = bytes((0x90 | size,))
+    elif size < 2 ** 16:
+        header = b"\xdc" + size.to_bytes(2, "big")
+    else:
+        header = b"\xdd" + size.to_bytes(4, "big")
+    return header + b"".join(items)
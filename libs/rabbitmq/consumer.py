@@ -1,4 +1,6 @@
 import asyncio
+import collections
+import contextlib
 import functools
 import logging
 import typing
@@ -18,6 +20,118 @@ class Error(Exception):
     ...
 
 
+class _Acknowledger:
+    _failures_size: int = 10_000
+
+    __slots__ = (
+        "_channel",
+        "_commit",
+        "_max_attempts",
+
+        "_pending",
+        "_failures",
+        "_lock",
+    )
+
+    def __init__(
+        self,
+        channel: aiormq.Channel,
+        commit: typing.Callable[..., typing.Awaitable[None]],
+        max_attempts: int = 5,
+    ) -> None:
+        self._channel = channel
+        self._commit = commit
+        self._max_attempts = max_attempts
+
+        # delivery tags grow on a channel, so the order of insertion is the order of delivery
+        self._pending: typing.OrderedDict[int, bool] = collections.OrderedDict()
+        # a requeued message comes back with a new tag, so its failures are counted by body
+        self._failures: typing.OrderedDict[bytes, int] = collections.OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def track(
+        self,
+        delivery_tag: int,
+    ) -> None:
+        self._pending[delivery_tag] = False
+
+    async def _flush(self) -> None:
+        last_tag: typing.Optional[int] = None
+        while self._pending and next(iter(self._pending.values())):
+            last_tag, _ = self._pending.popitem(last=False)
+        if last_tag is None:
+            return
+
+        # one ack covers every handled delivery up to the tag, acks go out in tag order
+        async with self._lock:
+            await self._commit(
+                channel=self._channel,
+                delivery_tag=last_tag,
+                multiple=True,
+            )
+
+    async def ack(
+        self,
+        delivery_tag: int,
+        body: typing.Optional[bytes] = None,
+    ) -> None:
+        if body is not None:
+            self._failures.pop(body, None)
+        self._pending[delivery_tag] = True
+        await self._flush()
+
+    async def nack(
+        self,
+        delivery_tag: int,
+        body: bytes,
+    ) -> bool:
+        attempts = self._failures.pop(body, 0) + 1
+        # a message failing every time is rejected instead of going round forever
+        requeue = attempts < self._max_attempts
+        if requeue:
+            self._failures[body] = attempts
+            while len(self._failures) > self._failures_size:
+                self._failures.popitem(last=False)
+
+        self._pending.pop(delivery_tag, None)
+        async with self._lock:
+            await self._channel.basic_nack(
+                delivery_tag,
+                requeue=requeue,
+            )
+        await self._flush()
+        return requeue
+
+
+class _KeyLocks:
+    __slots__ = (
+        "_locks",
+    )
+
+    def __init__(self) -> None:
+        self._locks: typing.MutableMapping[typing.Hashable, typing.Tuple[asyncio.Lock, int]] = {}
+
+    @contextlib.asynccontextmanager
+    async def hold(
+        self,
+        key: typing.Hashable,
+    ) -> typing.AsyncIterator[None]:
+        lock, users = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users <= 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+
 class Consumer(definition.consumer.Consumer):
     _connect_retry_attempts: int = 5
     _retry_attempts: int = 3
@@ -28,6 +142,9 @@ class Consumer(definition.consumer.Consumer):
         "_user",
         "_password",
         "_queue",
+        "_prefetch_count",
+        "_concurrency",
+        "_max_attempts",
 
         "_connection",
     )
@@ -38,11 +155,18 @@ class Consumer(definition.consumer.Consumer):
         user: str = "rabbitmq",
         password: str = "rabbitmq_password",
         queue: str = "queue",
+        prefetch_count: int = 1,
+        concurrency: int = 1,
+        max_attempts: int = 5,
     ) -> None:
         self._address = address
         self._user = user
         self._password = password
         self._queue = queue
+        self._prefetch_count = prefetch_count
+        self._concurrency = concurrency
+        # handling attempts of a message before it is rejected (dead-lettered if the queue has an exchange for it)
+        self._max_attempts = max_attempts
 
         self._connection: typing.Optional[aiormq.Connection] = None
 
@@ -72,10 +196,13 @@ class Consumer(definition.consumer.Consumer):
     )
     async def _commit(
         self,
-        message: aiormq.types.DeliveredMessage,
+        channel: aiormq.Channel,
+        delivery_tag: int,
+        multiple: bool = False,
     ) -> None:
-        await message.channel.basic_ack(
-            message.delivery.delivery_tag,
+        await channel.basic_ack(
+            delivery_tag,
+            multiple=multiple,
         )
 
     async def _consume_message(
@@ -83,8 +210,15 @@ class Consumer(definition.consumer.Consumer):
         message: aiormq.types.DeliveredMessage,
         message_cls: typing.Type[definition.consumer.Data],
         handler: typing.Callable[[definition.consumer.Data], typing.Awaitable[None]],
+        acknowledger: _Acknowledger,
+        pool: asyncio.Semaphore,
+        key_locks: _KeyLocks,
+        get_key: typing.Optional[typing.Callable[[definition.consumer.Data], typing.Hashable]] = None,
         logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
     ) -> None:
+        delivery_tag = message.delivery.delivery_tag
+        acknowledger.track(delivery_tag)
+
         logger.debug(f"[Message ID {id(message)}] Processing message")
         try:
             data = libs.parsing.parse(message_cls, message.body)
@@ -92,18 +226,35 @@ class Consumer(definition.consumer.Consumer):
             logger.debug(f"[Message ID {id(message)}] Unknown message format, skipping")
             if logger:
                 logger.exception(exc)
-            await self._commit(message)
+            await acknowledger.ack(delivery_tag)
             return
 
         try:
-            await handler(data)
+            key = None if get_key is None else get_key(data)
         except Exception as exc:
-            logger.debug(f"[Message ID {id(message)}] Message processing failed")
             if logger:
                 logger.exception(exc)
-        else:
-            await self._commit(message)
+            key = None
+
+        # messages with the same key are handled one by one in delivery order, others run concurrently
+        async with (contextlib.nullcontext() if key is None else key_locks.hold(key)):
+            async with pool:
+                try:
+                    await handler(data)
+                except Exception as exc:
+                    logger.debug(f"[Message ID {id(message)}] Message processing failed")
+                    if logger:
+                        logger.exception(exc)
+                    is_handled = False
+                else:
+                    is_handled = True
+
+        if is_handled:
+            await acknowledger.ack(delivery_tag, message.body)
             logger.debug(f"[Message ID {id(message)}] Message processing done")
+        elif not await acknowledger.nack(delivery_tag, message.body):
+            if logger:
+                logger.info(f"[Message ID {id(message)}] Message processing failed too many times, rejecting")
 
     async def consume(
         self,
@@ -111,10 +262,11 @@ class Consumer(definition.consumer.Consumer):
         handler: typing.Callable[[definition.consumer.Data], typing.Awaitable[None]],
         *_,
         logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+        get_key: typing.Optional[typing.Callable[[definition.consumer.Data], typing.Hashable]] = None,
     ) -> None:
         channel = await self._connection.channel()
         await channel.basic_qos(
-            prefetch_count=1,
+            prefetch_count=self._prefetch_count,
         )
 
         try:
@@ -124,6 +276,14 @@ class Consumer(definition.consumer.Consumer):
                     self._consume_message,
                     message_cls=message_cls,
                     handler=handler,
+                    acknowledger=_Acknowledger(
+                        channel=channel,
+                        commit=self._commit,
+                        max_attempts=self._max_attempts,
+                    ),
+                    pool=asyncio.Semaphore(self._concurrency),
+                    key_locks=_KeyLocks(),
+                    get_key=get_key,
                     logger=logger,
                 ),
                 no_ack=False,
@@ -15,7 +15,7 @@ class Error(Exception):
     ...
 
 
-class Producer(definition.producer.Producer):
+class Producer(definition.producer.PipelinedProducer):
     _channels_count: int = 25
     _connect_retry_attempts: int = 5
     _retry_attempts: int = 3
@@ -26,10 +26,13 @@ class Producer(definition.producer.Producer):
         "_user",
         "_password",
         "_exchange",
+        "_window_size",
 
         "_lock",
         "_connection",
         "_channels",
+        "_windows",
+        "_deliveries",
     )
 
     def __init__(
@@ -38,15 +41,19 @@ class Producer(definition.producer.Producer):
         user: str = "rabbitmq",
         password: str = "rabbitmq_password",
         exchange: str = "",
+        window_size: int = 32,
     ) -> None:
         self._address = address
         self._user = user
         self._password = password
         self._exchange = exchange
+        self._window_size = window_size
 
         self._lock = asyncio.Lock()
         self._connection: typing.Optional[aiormq.Connection] = None
         self._channels: typing.MutableSequence[aiormq.Channel] = []
+        self._windows: typing.MutableSequence[asyncio.Semaphore] = []
+        self._deliveries: typing.Set[asyncio.Task] = set()
 
     @libs.retry.retry(
         attempts=_connect_retry_attempts,
@@ -56,11 +63,16 @@ class Producer(definition.producer.Producer):
             f"amqp://{self._user}:{self._password}@{self._address}//",
         )
         self._channels = []
+        self._windows = []
 
     async def close(
         self,
         logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
     ) -> None:
+        if self._deliveries:
+            # let already published messages get their confirmations
+            await asyncio.wait(self._deliveries, timeout=self._stop_wait_time_seconds)
+
         for src in (*self._channels, self._connection):
             try:
                 await src.close(timeout=self._stop_wait_time_seconds)
@@ -69,12 +81,91 @@ class Producer(definition.producer.Producer):
                     if logger is not None:
                         logger.exception(e)
 
-    async def _get_channel(self) -> aiormq.Channel:
-        if len(self._channels) < self._channels_count:
+    async def _open_channels(
+        self,
+        count: int,
+    ) -> None:
+        if len(self._channels) < count:
             async with self._lock:
-                if len(self._channels) < self._channels_count:
-                    self._channels.append(await self._connection.channel())  # noqa
-        return random.choice(self._channels)
+                while len(self._channels) < count:
+                    self._channels.append(await self._connection.channel(  # noqa
+                        publisher_confirms=True,
+                    ))
+                    self._windows.append(asyncio.Semaphore(self._window_size))
+
+    async def _acquire_channel(
+        self,
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> typing.Tuple[aiormq.Channel, asyncio.Semaphore]:
+        if key is not None:
+            # messages with the same key share a channel, so the broker gets them in publish order
+            index = hash(key) % self._channels_count
+            await self._open_channels(index + 1)
+        else:
+            await self._open_channels(min(len(self._channels) + 1, self._channels_count))
+
+            # prefer a channel with free window slots, otherwise wait for a random one to confirm something
+            free = [index for index, window in enumerate(self._windows) if not window.locked()]
+            index = random.choice(free) if free else random.randrange(len(self._windows))
+
+        window = self._windows[index]
+        await window.acquire()
+
+        if self._channels[index].is_closed:
+            try:
+                async with self._lock:
+                    if self._channels[index].is_closed:
+                        self._channels[index] = await self._connection.channel(  # noqa
+                            publisher_confirms=True,
+                        )
+            except BaseException:
+                window.release()
+                raise
+
+        return self._channels[index], window
+
+    async def _deliver(
+        self,
+        channel: aiormq.Channel,
+        window: asyncio.Semaphore,
+        message: bytes,
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> None:
+        try:
+            await channel.basic_publish(
+                exchange=self._exchange,
+                body=message,
+            )
+        except Exception:
+            if key is not None:
+                # later messages of the key may be confirmed already, a retry would go after them
+                raise
+        else:
+            return
+        finally:
+            window.release()
+
+        # nack or broken channel, an unkeyed message goes through the regular retried path
+        await self.produce(message)
+
+    async def publish(
+        self,
+        message: definition.producer.Message,
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> asyncio.Future:
+        if not isinstance(message, bytes):
+            message = libs.json.dumps(message)
+
+        channel, window = await self._acquire_channel(key)
+        delivery = asyncio.get_event_loop().create_task(self._deliver(
+            channel=channel,
+            window=window,
+            message=message,
+            key=key,
+        ))
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._deliveries.discard)
+        return delivery
 
     @libs.retry.retry(
         attempts=_retry_attempts,
@@ -86,8 +177,11 @@ class Producer(definition.producer.Producer):
         if not isinstance(message, bytes):
             message = libs.json.dumps(message)
 
-        channel = await self._get_channel()
-        await channel.basic_publish(
-            exchange=self._exchange,
-            body=message,
-        )
+        channel, window = await self._acquire_channel()
+        try:
+            await channel.basic_publish(
+                exchange=self._exchange,
+                body=message,
+            )
+        finally:
+            window.release()
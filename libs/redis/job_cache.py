@@ -0,0 +1,96 @@
+import logging
+import typing
+
+import aioredis
+
+import definition.entity.job
+import definition.job_cache
+
+import libs.in_memory.job_cache
+import libs.json
+import libs.parsing
+
+
+class Cache(definition.job_cache.Cache):
+    __slots__ = (
+        "_local",
+        "_logger",
+        "_redis_dsn",
+        "_ttl_seconds",
+        "_prefix",
+
+        "_redis_connection",
+    )
+
+    def __init__(
+        self,
+        local: libs.in_memory.job_cache.Cache,
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        redis_dsn: str = "redis://redis:6379/",
+        ttl_seconds: int = 60 * 60,
+        prefix: str = "job_meta_",
+    ) -> None:
+        self._local = local
+        self._logger = logger
+        self._redis_dsn = redis_dsn
+        self._ttl_seconds = ttl_seconds
+        self._prefix = prefix
+
+        self._redis_connection: typing.Optional[aioredis.Redis] = None
+
+    async def open(self) -> None:
+        self._redis_connection = aioredis.Redis.from_url(
+            url=self._redis_dsn,
+        )
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        if self._redis_connection:
+            try:
+                await self._redis_connection.close()
+            except Exception as exc:
+                if logger is not None:
+                    logger.exception(exc)
+
+    async def get(
+        self,
+        task_id: str,
+    ) -> typing.Optional[definition.entity.job.JobStorageMetadata]:
+        entry = self._local.get_local(task_id)
+        if entry is not None:
+            return entry
+
+        try:
+            value = await self._redis_connection.get(f"{self._prefix}{task_id}")
+        except Exception as exc:
+            # the database is still there behind the cache
+            self._logger.exception(exc)
+            return None
+        if value is None:
+            return None
+
+        entry = libs.parsing.parse(definition.entity.job.JobStorageMetadata, value)
+        self._local.put_local(entry)
+        return entry
+
+    async def put(
+        self,
+        entry: definition.entity.job.JobStorageMetadata,
+    ) -> None:
+        self._local.put_local(entry)
+        try:
+            await self._redis_connection.set(
+                name=f"{self._prefix}{entry.task_id}",
+                value=libs.json.dumps(entry),
+                ex=self._ttl_seconds,
+            )
+        except Exception as exc:
+            self._logger.exception(exc)
+
+    def update(
+        self,
+        data: definition.entity.job.JobTransferMetadata,
+    ) -> bool:
+        return self._local.update(data)
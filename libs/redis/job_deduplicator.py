@@ -0,0 +1,109 @@
+import logging
+import typing
+
+import aioredis
+
+import definition.entity.job
+import definition.job_deduplicator
+
+import libs.in_memory.job_deduplicator
+
+
+class Deduplicator(definition.job_deduplicator.Deduplicator):
+    __slots__ = (
+        "_redis_dsn",
+        "_window_seconds",
+        "_prefix",
+        "_local",
+        "_logger",
+
+        "_redis_connection",
+        "_shared_duplicated",
+        "_errors",
+    )
+
+    def __init__(
+        self,
+        local: libs.in_memory.job_deduplicator.Deduplicator,
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        redis_dsn: str = "redis://redis:6379/",
+        window_seconds: int = 60,
+        prefix: str = "job_dedup_",
+    ) -> None:
+        self._redis_dsn = redis_dsn
+        self._window_seconds = window_seconds
+        self._prefix = prefix
+        self._local = local
+        self._logger = logger
+
+        self._redis_connection: typing.Optional[aioredis.Redis] = None
+        self._shared_duplicated = 0
+        self._errors = 0
+
+    async def open(self) -> None:
+        self._redis_connection = aioredis.Redis.from_url(
+            url=self._redis_dsn,
+        )
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        if self._redis_connection:
+            try:
+                await self._redis_connection.close()
+            except Exception as exc:
+                if logger is not None:
+                    logger.exception(exc)
+
+    def _get_name(
+        self,
+        key: libs.in_memory.job_deduplicator.Key,
+    ) -> str:
+        height, challenge_hash = key
+        return f"{self._prefix}{height}_{challenge_hash}"
+
+    async def claim(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> bool:
+        key = libs.in_memory.job_deduplicator.get_key(job)
+        # copies from the same pod never reach redis
+        if not self._local.claim_key(key):
+            return False
+
+        try:
+            is_claimed = bool(await self._redis_connection.set(
+                name=self._get_name(key),
+                value=1,
+                nx=True,
+                ex=self._window_seconds,
+            ))
+        except Exception as exc:
+            # downstream deduplication still holds, a lost window only costs a duplicate publish
+            self._errors += 1
+            self._logger.exception(exc)
+            return True
+
+        if not is_claimed:
+            self._shared_duplicated += 1
+        return is_claimed
+
+    async def release(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> None:
+        key = libs.in_memory.job_deduplicator.get_key(job)
+        self._local.release_key(key)
+        try:
+            await self._redis_connection.delete(self._get_name(key))
+        except Exception as exc:
+            self._errors += 1
+            self._logger.exception(exc)
+
+    def stats(self) -> typing.Mapping[str, int]:
+        return {
+            **self._local.stats(),
+            "jobs_shared_deduplicated": self._shared_duplicated,
+            "jobs_deduplicator_errors": self._errors,
+        }
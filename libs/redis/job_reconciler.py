@@ -0,0 +1,148 @@
+import asyncio
+import functools
+import logging
+import typing
+
+import aioredis
+
+import definition.entity.job
+import definition.job_reconciler
+import definition.producer
+import definition.timer_wheel
+
+
+class Reconciler(definition.job_reconciler.Reconciler):
+    __slots__ = (
+        "_timer_wheel",
+        "_job_producer",
+        "_logger",
+        "_redis_dsn",
+        "_delay_seconds",
+        "_attempts",
+        "_prefix",
+
+        "_redis_connection",
+        "_checks",
+        "_tracked",
+        "_republished",
+        "_lost",
+    )
+
+    def __init__(
+        self,
+        timer_wheel: definition.timer_wheel.TimerWheel,
+        job_producer: definition.producer.Producer,
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        redis_dsn: str = "redis://redis:6379/",
+        delay_seconds: int = 30,
+        attempts: int = 3,
+        prefix: str = "job_",
+    ) -> None:
+        self._timer_wheel = timer_wheel
+        self._job_producer = job_producer
+        self._logger = logger
+        self._redis_dsn = redis_dsn
+        self._delay_seconds = delay_seconds
+        self._attempts = attempts
+        # the mark process_job_worker sets once the job is persisted
+        self._prefix = prefix
+
+        self._redis_connection: typing.Optional[aioredis.Redis] = None
+        self._checks: typing.Set[asyncio.Task] = set()
+        self._tracked = 0
+        self._republished = 0
+        self._lost = 0
+
+    async def open(self) -> None:
+        self._redis_connection = aioredis.Redis.from_url(
+            url=self._redis_dsn,
+        )
+
+    async def close(
+        self,
+        logger: typing.Optional[typing.Union[logging.Logger, logging.LoggerAdapter]] = None,
+    ) -> None:
+        for check in tuple(self._checks):
+            check.cancel()
+
+        if self._redis_connection:
+            try:
+                await self._redis_connection.close()
+            except Exception as exc:
+                if logger is not None:
+                    logger.exception(exc)
+
+    def _schedule(
+        self,
+        job: definition.entity.job.JobInput,
+        attempt: int,
+    ) -> None:
+        self._timer_wheel.schedule(
+            delay_seconds=self._delay_seconds,
+            callback=functools.partial(
+                self._start_check,
+                job=job,
+                attempt=attempt,
+            ),
+        )
+
+    def _start_check(
+        self,
+        job: definition.entity.job.JobInput,
+        attempt: int,
+    ) -> None:
+        check = asyncio.get_event_loop().create_task(self._check(
+            job=job,
+            attempt=attempt,
+        ))
+        self._checks.add(check)
+        check.add_done_callback(self._checks.discard)
+
+    async def _check(
+        self,
+        job: definition.entity.job.JobInput,
+        attempt: int,
+    ) -> None:
+        log_prefix = f"[Height: {job.block_height}][Task: {job.task_id}]"
+        try:
+            if await self._redis_connection.exists(f"{self._prefix}{job.task_id}"):
+                return
+
+            if attempt >= self._attempts:
+                self._lost += 1
+                self._logger.info(f"{log_prefix} Broadcast job is still not persisted, giving up")
+                return
+
+            # persistence is idempotent, the job keeps its task id and is not broadcast again
+            self._logger.info(f"{log_prefix} Broadcast job is not persisted, publishing it again")
+            await self._job_producer.produce(job)
+            self._republished += 1
+        except Exception as exc:
+            self._logger.exception(exc)
+            if attempt >= self._attempts:
+                # the job is not rescheduled forever while Redis is failing
+                self._lost += 1
+                self._logger.info(f"{log_prefix} Broadcast job persistence could not be checked, giving up")
+                return
+
+        self._schedule(
+            job=job,
+            attempt=attempt + 1,
+        )
+
+    def track(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> None:
+        self._tracked += 1
+        self._schedule(
+            job=job,
+            attempt=0,
+        )
+
+    def stats(self) -> typing.Mapping[str, int]:
+        return {
+            "jobs_tracked": self._tracked,
+            "jobs_republished": self._republished,
+            "jobs_lost": self._lost,
+        }
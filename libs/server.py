@@ -10,17 +10,25 @@ import libs.asyncio
 class Server(definition.server.Server):
     __slots__ = (
         "_port",
+        "_reuse_port",
+        "_subprotocols",
         
         "_stop_marker",
+        "_server",
     )
 
     def __init__(
         self,
         port: int = 8000,
+        reuse_port: bool = False,
+        subprotocols: typing.Sequence[str] = (),
     ) -> None:
         self._port = port
+        self._reuse_port = reuse_port
+        self._subprotocols = subprotocols
 
         self._stop_marker: typing.Optional[asyncio.Future] = None
+        self._server = None
 
     @staticmethod
     async def _complete_all_tasks(
@@ -43,7 +51,10 @@ class Server(definition.server.Server):
             handler,
             host="",
             port=self._port,
+            reuse_port=self._reuse_port,
+            subprotocols=self._subprotocols or None,
         )
+        self._server = server
         try:
             async with server:
                 await self._stop_marker
@@ -51,6 +62,11 @@ class Server(definition.server.Server):
             # just to be completely sure that all connections are stopped here
             await asyncio.shield(self._complete_all_tasks(server))
 
+    def stats(self) -> typing.Mapping[str, int]:
+        if self._server is None:
+            return {"connections": 0}
+        return {"connections": len(self._server.ws_server.websockets)}
+
     def stop(
         self,
         exception: typing.Optional[Exception] = None,
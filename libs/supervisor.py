@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.process
+import os
+import queue
+import signal
+import time
+import typing
+
+
+Stats = typing.Mapping[str, typing.Union[int, float]]
+
+
+async def report_stats(
+    get_stats: typing.Callable[[], Stats],
+    logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+    interval_seconds: int = 60,
+    stats_queue: typing.Optional[multiprocessing.Queue] = None,
+) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            stats = get_stats()
+            if stats_queue is not None:
+                stats_queue.put_nowait((os.getpid(), dict(stats)))
+            else:
+                logger.info(f"[Stats] {_format(stats)}")
+        except Exception as exc:
+            logger.exception(exc)
+
+
+def _format(
+    stats: Stats,
+) -> str:
+    return " ".join(f"{key}={value}" for key, value in stats.items())
+
+
+def _bootstrap(
+    target: typing.Callable[[multiprocessing.Queue], None],
+    stats_queue: multiprocessing.Queue,
+) -> None:
+    # the child drains itself on its own stop marker, supervisor only forwards the signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    target(stats_queue)
+
+
+class Supervisor:
+    _poll_interval_seconds: float = 1
+
+    __slots__ = (
+        "_target",
+        "_processes",
+        "_logger",
+        "_stop_wait_time_seconds",
+        "_stats_interval_seconds",
+
+        "_context",
+        "_stats_queue",
+        "_children",
+        "_stats",
+        "_stopping",
+    )
+
+    def __init__(
+        self,
+        target: typing.Callable[[multiprocessing.Queue], None],
+        processes: int,
+        logger: typing.Union[logging.Logger, logging.LoggerAdapter],
+        stop_wait_time_seconds: int = 30,
+        stats_interval_seconds: int = 60,
+    ) -> None:
+        self._target = target
+        self._processes = processes
+        self._logger = logger
+        self._stop_wait_time_seconds = stop_wait_time_seconds
+        self._stats_interval_seconds = stats_interval_seconds
+
+        self._context = multiprocessing.get_context("spawn")
+        self._stats_queue: multiprocessing.Queue = self._context.Queue()
+        self._children: typing.MutableSequence[typing.Optional[multiprocessing.process.BaseProcess]] = [None] * processes
+        self._stats: typing.MutableMapping[int, Stats] = {}
+        self._stopping = False
+
+    def _spawn(
+        self,
+        index: int,
+    ) -> None:
+        child = self._context.Process(
+            target=_bootstrap,
+            args=(self._target, self._stats_queue),
+            daemon=False,
+        )
+        child.start()
+        self._children[index] = child
+        self._logger.debug(f"[Supervisor][Process {child.pid}] Started")
+
+    def _stop(self, *_) -> None:
+        self._stopping = True
+
+    def _collect_stats(self) -> None:
+        while True:
+            try:
+                pid, stats = self._stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._stats[pid] = stats
+
+    def _log_stats(self) -> None:
+        alive = {child.pid for child in self._children if child is not None and child.is_alive()}
+        self._stats = {pid: stats for pid, stats in self._stats.items() if pid in alive}
+
+        total: typing.MutableMapping[str, typing.Union[int, float]] = {}
+        for stats in self._stats.values():
+            for key, value in stats.items():
+                total[key] = total.get(key, 0) + value
+        self._logger.info(f"[Supervisor][Stats] processes={len(alive)} {_format(total)}")
+
+    def _drain(self) -> None:
+        children = [child for child in self._children if child is not None]
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self._stop_wait_time_seconds
+        for child in children:
+            child.join(max(deadline - time.monotonic(), 0))
+            if child.is_alive():
+                self._logger.debug(f"[Supervisor][Process {child.pid}] Did not stop in time, killing")
+                child.kill()
+                child.join()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        for index in range(self._processes):
+            self._spawn(index)
+
+        stats_logged_at = time.monotonic()
+        try:
+            while not self._stopping:
+                time.sleep(self._poll_interval_seconds)
+                self._collect_stats()
+
+                for index, child in enumerate(self._children):
+                    if self._stopping or child.is_alive():
+                        continue
+                    self._logger.debug(f"[Supervisor][Process {child.pid}] Exited with {child.exitcode}, restarting")
+                    self._spawn(index)
+
+                if time.monotonic() - stats_logged_at >= self._stats_interval_seconds:
+                    stats_logged_at = time.monotonic()
+                    self._log_stats()
+        finally:
+            self._logger.debug(f"[Supervisor] Stopping processes")
+            self._drain()
+            self._logger.debug(f"[Supervisor] Stopped")
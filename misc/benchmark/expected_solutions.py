@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import random
+import time
+import typing
+
+import simple_dataclass_settings
+
+import libs.in_memory.routing_index
+import libs.in_memory.timer_wheel
+import libs.logger
+
+
+@simple_dataclass_settings.settings
+class _Log:
+    name: str = "expected-solutions-benchmark"
+    level: str = "INFO"
+    root_level: str = "ERROR"
+
+
+@simple_dataclass_settings.settings
+class _Benchmark:
+    connections: typing.Sequence[str] = simple_dataclass_settings.field.list(
+        var="BENCHMARK_CONNECTIONS",
+        default=("1", "10", "100", "1000"),
+    )
+    # jobs waited by a connection within the wait time, e.g. one job per 15 seconds for 20 minutes
+    waits: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_WAITS",
+        default=80,
+    )
+    solutions: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_SOLUTIONS",
+        default=10_000,
+    )
+
+
+@simple_dataclass_settings.settings
+class Settings:
+    log: _Log
+    benchmark: _Benchmark
+
+
+class _Item(typing.NamedTuple):
+    height: int
+    target: int
+    created_at: float
+
+
+class _ListStorage:
+    # per-connection list storage node_server used before the routing index
+    __slots__ = (
+        "_storage",
+    )
+
+    def __init__(self) -> None:
+        self._storage: typing.MutableSequence[_Item] = []
+
+    def wait(
+        self,
+        height: int,
+        target: int,
+        created_at: float,
+    ) -> None:
+        self._storage.append(_Item(
+            height=height,
+            target=target,
+            created_at=created_at,
+        ))
+
+    def is_waits(
+        self,
+        height: int,
+        target: int,
+    ) -> bool:
+        return next((
+            item for item in self._storage
+            if (item.height == height) and (item.target <= target)
+        ), None) is not None
+
+    def cleanup(
+        self,
+        now: float,
+        ttl_seconds: int,
+    ) -> None:
+        self._storage = [
+            item for item in self._storage
+            if now - item.created_at < ttl_seconds
+        ]
+
+
+def _measure(
+    fn: typing.Callable[[], typing.Any],
+    iterations: int,
+) -> float:
+    started_at = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started_at) / iterations
+
+
+def _get_solutions(
+    waits: int,
+    count: int,
+) -> typing.Sequence[typing.Tuple[int, int]]:
+    # most solutions are for the latest heights, some are below the target
+    return [
+        (waits - random.randint(1, 3), random.choice((50, 100, 200)))
+        for _ in range(count)
+    ]
+
+
+def _run_list(
+    connections_count: int,
+    waits: int,
+    solutions: typing.Sequence[typing.Tuple[int, int]],
+) -> typing.Tuple[float, float]:
+    storages = [_ListStorage() for _ in range(connections_count)]
+    for storage in storages:
+        for height in range(waits):
+            storage.wait(height=height, target=100, created_at=time.monotonic())
+
+    iterator = iter(solutions * 2)
+
+    def _route():
+        height, target = next(iterator)
+        return [storage for storage in storages if storage.is_waits(height, target)]
+
+    def _cleanup():
+        now = time.monotonic()
+        for storage in storages:
+            storage.cleanup(now=now, ttl_seconds=20 * 60)
+
+    return _measure(_route, len(solutions)), _measure(_cleanup, 10)
+
+
+def _run_index(
+    connections_count: int,
+    waits: int,
+    solutions: typing.Sequence[typing.Tuple[int, int]],
+) -> typing.Tuple[float, float]:
+    timer_wheel = libs.in_memory.timer_wheel.TimerWheel(
+        logger=logging.getLogger(),
+    )
+    index = libs.in_memory.routing_index.Index(
+        timer_wheel=timer_wheel,
+        wait_time_seconds=20 * 60,
+    )
+    for subscription in range(connections_count):
+        for height in range(waits):
+            index.add(subscription=subscription, height=height, target=100)
+
+    iterator = iter(solutions * 2)
+
+    def _route():
+        return index.route(*next(iterator))
+
+    # a wheel tick replaces a cleanup pass, it touches only the slot that comes up
+    return _measure(_route, len(solutions)), _measure(timer_wheel._advance, 10)  # noqa
+
+
+async def main(
+    cfg: Settings,
+) -> None:
+    logger = libs.logger.get(
+        name=cfg.log.name,
+        level=cfg.log.level,
+    )
+
+    logger.info(
+        f"{'connections':>12} {'list route, us':>15} {'index route, us':>16} "
+        f"{'list cleanup, us':>17} {'wheel tick, us':>15}"
+    )
+    for connections_count in map(int, cfg.benchmark.connections):
+        solutions = _get_solutions(
+            waits=cfg.benchmark.waits,
+            count=cfg.benchmark.solutions,
+        )
+        list_route, list_cleanup = _run_list(
+            connections_count=connections_count,
+            waits=cfg.benchmark.waits,
+            solutions=solutions,
+        )
+        index_route, wheel_tick = _run_index(
+            connections_count=connections_count,
+            waits=cfg.benchmark.waits,
+            solutions=solutions,
+        )
+        logger.info(
+            f"{connections_count:>12} {list_route * 1_000_000:>15.2f} {index_route * 1_000_000:>16.2f} "
+            f"{list_cleanup * 1_000_000:>17.2f} {wheel_tick * 1_000_000:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    settings = simple_dataclass_settings.populate(Settings)
+    libs.logger.configure(
+        level=settings.log.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=settings,
+    ))
@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+import functools
+import time
+import typing
+import uuid
+
+import simple_dataclass_settings
+
+import definition.entity.job
+
+import apps.worker_server.usecase
+
+import libs.codec
+import libs.in_memory.frame_cache
+import libs.in_memory.job_priority_shield
+import libs.logger
+
+
+@simple_dataclass_settings.settings
+class _Log:
+    name: str = "job-broadcast-benchmark"
+    level: str = "INFO"
+    root_level: str = "ERROR"
+
+
+@simple_dataclass_settings.settings
+class _Benchmark:
+    connections: typing.Sequence[str] = simple_dataclass_settings.field.list(
+        var="BENCHMARK_CONNECTIONS",
+        default=("10", "100", "1000", "5000"),
+    )
+    broadcasts: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_BROADCASTS",
+        default=20,
+    )
+
+
+@simple_dataclass_settings.settings
+class Settings:
+    log: _Log
+    benchmark: _Benchmark
+
+
+class _Connection:
+    __slots__ = (
+        "frames",
+    )
+
+    def __init__(self) -> None:
+        self.frames = 0
+
+    async def send(
+        self,
+        message: bytes,
+    ) -> None:
+        self.frames += 1
+
+
+def _get_job(
+    block_height: int,
+) -> definition.entity.job.JobTransferMetadata:
+    return definition.entity.job.JobTransferMetadata(
+        task_id=str(uuid.uuid4()),
+        epoch_challenge={
+            "epoch_number": 123,
+            "epoch_block_hash": "ab1" * 21,
+            "degree": 8191,
+        },
+        block_height=block_height,
+        created_at=datetime.datetime.utcnow(),
+    )
+
+
+async def _run(
+    connections_count: int,
+    broadcasts: int,
+    shared_cache: bool,
+    logger,
+) -> float:
+    cache = libs.in_memory.frame_cache.Cache()
+    handlers = [
+        functools.partial(
+            apps.worker_server.usecase._handle_job,  # noqa
+            logger=logger,
+            priority_shield=libs.in_memory.job_priority_shield.Shield(),
+            job_frame_cache=cache if shared_cache else libs.in_memory.frame_cache.Cache(),
+            codec=libs.codec.JSON,
+            connection=_Connection(),
+        )
+        for _ in range(connections_count)
+    ]
+
+    started_at = time.process_time()
+    for height in range(1, broadcasts + 1):
+        job = _get_job(block_height=height)
+        for handler in handlers:
+            await handler(job)
+    return (time.process_time() - started_at) / broadcasts
+
+
+async def main(
+    cfg: Settings,
+) -> None:
+    logger = libs.logger.get(
+        name=cfg.log.name,
+        level=cfg.log.level,
+    )
+
+    logger.info(f"{'connections':>12} {'per-connection, ms':>20} {'shared, ms':>12} {'speedup':>8}")
+    for connections_count in map(int, cfg.benchmark.connections):
+        per_connection = await _run(
+            connections_count=connections_count,
+            broadcasts=cfg.benchmark.broadcasts,
+            shared_cache=False,
+            logger=logger,
+        )
+        shared = await _run(
+            connections_count=connections_count,
+            broadcasts=cfg.benchmark.broadcasts,
+            shared_cache=True,
+            logger=logger,
+        )
+        logger.info(
+            f"{connections_count:>12} {per_connection * 1000:>20.3f} "
+            f"{shared * 1000:>12.3f} {per_connection / shared:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    settings = simple_dataclass_settings.populate(Settings)
+    libs.logger.configure(
+        level=settings.log.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=settings,
+    ))
@@ -0,0 +1,224 @@
+import asyncio
+import datetime
+import logging
+import random
+import statistics
+import time
+import typing
+import uuid
+
+import simple_dataclass_settings
+
+import definition.entity.job
+
+import apps.node_server.usecase
+import apps.process_job_worker.usecase
+
+import libs.logger
+
+
+@simple_dataclass_settings.settings
+class _Log:
+    name: str = "job-latency-benchmark"
+    level: str = "INFO"
+    root_level: str = "ERROR"
+
+
+@simple_dataclass_settings.settings
+class _Benchmark:
+    jobs: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_JOBS",
+        default=200,
+    )
+    # mean hop latencies, each call takes from half to one and a half of it
+    rabbitmq_ms: float = simple_dataclass_settings.field.float(
+        var="BENCHMARK_RABBITMQ_MS",
+        default=2,
+    )
+    postgres_ms: float = simple_dataclass_settings.field.float(
+        var="BENCHMARK_POSTGRES_MS",
+        default=3,
+    )
+    redis_ms: float = simple_dataclass_settings.field.float(
+        var="BENCHMARK_REDIS_MS",
+        default=0.5,
+    )
+    kafka_ms: float = simple_dataclass_settings.field.float(
+        var="BENCHMARK_KAFKA_MS",
+        default=2,
+    )
+
+
+@simple_dataclass_settings.settings
+class Settings:
+    log: _Log
+    benchmark: _Benchmark
+
+
+async def _hop(
+    latency_ms: float,
+) -> None:
+    await asyncio.sleep(random.uniform(0.5, 1.5) * latency_ms / 1000)
+
+
+class _Broadcaster:
+    __slots__ = (
+        "_latency_ms",
+        "broadcast_at",
+    )
+
+    def __init__(
+        self,
+        latency_ms: float,
+    ) -> None:
+        self._latency_ms = latency_ms
+        self.broadcast_at: typing.MutableMapping[int, float] = {}
+
+    async def produce(
+        self,
+        message: definition.entity.job.JobTransferMetadata,
+    ) -> None:
+        await _hop(self._latency_ms)
+        self.broadcast_at.setdefault(message.block_height, time.perf_counter())
+
+
+class _Storage:
+    __slots__ = (
+        "_postgres_ms",
+        "_redis_ms",
+    )
+
+    def __init__(
+        self,
+        postgres_ms: float,
+        redis_ms: float,
+    ) -> None:
+        self._postgres_ms = postgres_ms
+        self._redis_ms = redis_ms
+
+    async def store(
+        self,
+        entry: definition.entity.job.JobInput,
+    ) -> typing.Tuple[bool, definition.entity.job.JobStorageMetadata]:
+        await _hop(self._postgres_ms)
+        await _hop(self._redis_ms)
+        return True, definition.entity.job.JobStorageMetadata(
+            task_id=entry.task_id or str(uuid.uuid4()),
+            block_height=entry.block_height,
+            created_at=datetime.datetime.utcnow(),
+        )
+
+    async def mark_stored(
+        self,
+        entry: definition.entity.job.JobStorageMetadata,
+    ) -> bool:
+        await _hop(self._redis_ms)
+        return True
+
+
+class _Reconciler:
+    def track(
+        self,
+        job: definition.entity.job.JobInput,
+    ) -> None:
+        ...
+
+
+def _get_job(
+    block_height: int,
+) -> definition.entity.job.JobInput:
+    return definition.entity.job.JobInput(
+        epoch_challenge={
+            "epoch_number": 123,
+            "epoch_block_hash": "ab1" * 21,
+            "degree": 8191,
+        },
+        proof_target=2 ** 40,
+        block_height=block_height,
+    )
+
+
+async def _ingest(
+    job: definition.entity.job.JobInput,
+    cfg: _Benchmark,
+    fast_path: bool,
+    broadcaster: _Broadcaster,
+    logger: logging.Logger,
+) -> None:
+    if fast_path:
+        await apps.node_server.usecase._broadcast_job(  # noqa
+            job=job,
+            logger=logger,
+            job_broadcaster=broadcaster,
+            job_reconciler=_Reconciler(),
+            log_prefix="",
+        )
+
+    # node_server publish confirmation, then process_job_worker picks the job up
+    await _hop(cfg.rabbitmq_ms)
+    await apps.process_job_worker.usecase.persist_and_broadcast_job(
+        job=job,
+        logger=logger,
+        job_storage=_Storage(
+            postgres_ms=cfg.postgres_ms,
+            redis_ms=cfg.redis_ms,
+        ),
+        job_producer=broadcaster,
+    )
+
+
+async def _run(
+    cfg: _Benchmark,
+    fast_path: bool,
+    logger: logging.Logger,
+) -> typing.Sequence[float]:
+    broadcaster = _Broadcaster(
+        latency_ms=cfg.kafka_ms,
+    )
+    received_at: typing.MutableMapping[int, float] = {}
+    for height in range(cfg.jobs):
+        received_at[height] = time.perf_counter()
+        await _ingest(
+            job=_get_job(block_height=height),
+            cfg=cfg,
+            fast_path=fast_path,
+            broadcaster=broadcaster,
+            logger=logger,
+        )
+    return [broadcaster.broadcast_at[height] - received_at[height] for height in received_at]
+
+
+async def main(
+    cfg: Settings,
+) -> None:
+    logger = libs.logger.get(
+        name=cfg.log.name,
+        level=cfg.log.level,
+    )
+    silent_logger = libs.logger.get(
+        name=f"{cfg.log.name}-usecase",
+        level="ERROR",
+    )
+
+    logger.info(f"{'mode':>10} {'p50, ms':>8} {'p99, ms':>8} {'max, ms':>8}")
+    for mode, fast_path in (("persisted", False), ("fast path", True)):
+        latencies = sorted(await _run(
+            cfg=cfg.benchmark,
+            fast_path=fast_path,
+            logger=silent_logger,
+        ))
+        logger.info(
+            f"{mode:>10} {statistics.median(latencies) * 1000:>8.2f} "
+            f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>8.2f} {latencies[-1] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    settings = simple_dataclass_settings.populate(Settings)
+    libs.logger.configure(
+        level=settings.log.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=settings,
+    ))
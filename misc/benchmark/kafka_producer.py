@@ -0,0 +1,265 @@
+import asyncio
+import collections
+import random
+import statistics
+import string
+import time
+import typing
+import uuid
+
+import aiokafka.record.default_records
+import simple_dataclass_settings
+
+import definition.entity.solution
+
+import libs.json
+import libs.kafka.producer
+import libs.logger
+
+
+@simple_dataclass_settings.settings
+class _Log:
+    name: str = "kafka-producer-benchmark"
+    level: str = "INFO"
+    root_level: str = "ERROR"
+
+
+@simple_dataclass_settings.settings
+class _Benchmark:
+    profiles: typing.Sequence[str] = simple_dataclass_settings.field.list(
+        var="BENCHMARK_PROFILES",
+        default=tuple(libs.kafka.producer.PROFILES),
+    )
+    messages: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_MESSAGES",
+        default=20_000,
+    )
+    # solutions per second of a burst
+    rate: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_RATE",
+        default=20_000,
+    )
+    # simulated broker link
+    rtt_ms: float = simple_dataclass_settings.field.float(
+        var="BENCHMARK_RTT_MS",
+        default=1,
+    )
+    bandwidth_mbit: float = simple_dataclass_settings.field.float(
+        var="BENCHMARK_BANDWIDTH_MBIT",
+        default=50,
+    )
+
+
+@simple_dataclass_settings.settings
+class Settings:
+    log: _Log
+    benchmark: _Benchmark
+
+
+_COMPRESSION_CODES = {
+    None: 0,
+    "gzip": 1,
+    "snappy": 2,
+    "lz4": 3,
+    "zstd": 4,
+}
+
+
+def _get_random_string(
+    alphabet: str,
+    size: int,
+) -> str:
+    return "".join(random.choices(alphabet, k=size))
+
+
+def _get_message(
+    height: int,
+) -> bytes:
+    return libs.json.dumps(definition.entity.solution.SolutionTransferData(
+        task_id=str(uuid.uuid4()),
+        solution_target=random.randint(2 ** 20, 2 ** 40),
+        solution={
+            "partial_solution": {
+                "address": "aleo1" + _get_random_string(string.ascii_lowercase + string.digits, 58),
+                "nonce": random.getrandbits(63),
+                "commitment": "puzzle1" + _get_random_string(string.ascii_lowercase + string.digits, 60),
+            },
+            "proof.w": {
+                "x": _get_random_string(string.digits, 76),
+                "y": _get_random_string(string.digits, 76),
+                "infinity": False,
+            },
+        },
+        solution_height=height,
+    ))
+
+
+class _Sender:
+    # a single partition leader: one request in flight, batches fill up while it is busy, as in aiokafka
+    __slots__ = (
+        "_profile",
+        "_rtt_seconds",
+        "_bytes_per_second",
+
+        "_batch",
+        "_batch_indices",
+        "_batch_created_at",
+        "_full_batches",
+        "_wakeup",
+        "delivered_at",
+        "sent_bytes",
+    )
+
+    def __init__(
+        self,
+        profile: libs.kafka.producer.Profile,
+        rtt_ms: float,
+        bandwidth_mbit: float,
+        messages: int,
+    ) -> None:
+        self._profile = profile
+        self._rtt_seconds = rtt_ms / 1000
+        self._bytes_per_second = bandwidth_mbit * 1_000_000 / 8
+
+        self._batch: typing.Optional[aiokafka.record.default_records.DefaultRecordBatchBuilder] = None
+        self._batch_indices: typing.MutableSequence[int] = []
+        self._batch_created_at = 0.
+        self._full_batches: typing.Deque[typing.Tuple[typing.Any, typing.Sequence[int]]] = collections.deque()
+        self._wakeup = asyncio.Event()
+        self.delivered_at: typing.MutableSequence[float] = [0.] * messages
+        self.sent_bytes = 0
+
+    def _open_batch(self) -> None:
+        self._batch = aiokafka.record.default_records.DefaultRecordBatchBuilder(
+            magic=2,
+            compression_type=_COMPRESSION_CODES[self._profile.compression_type],
+            is_transactional=0,
+            producer_id=-1,
+            producer_epoch=-1,
+            base_sequence=-1,
+            batch_size=self._profile.max_batch_size,
+        )
+        self._batch_indices = []
+        self._batch_created_at = time.perf_counter()
+
+    def append(
+        self,
+        index: int,
+        key: bytes,
+        value: bytes,
+    ) -> None:
+        if self._batch is None:
+            self._open_batch()
+
+        if self._batch.append(len(self._batch_indices), timestamp=None, key=key, value=value, headers=[]) is None:
+            self._full_batches.append((self._batch, self._batch_indices))
+            self._open_batch()
+            self._batch.append(0, timestamp=None, key=key, value=value, headers=[])
+        self._batch_indices.append(index)
+        self._wakeup.set()
+
+    async def _take(self) -> typing.Tuple[typing.Any, typing.Sequence[int]]:
+        while True:
+            if self._full_batches:
+                return self._full_batches.popleft()
+
+            if self._batch is not None:
+                lingered_seconds = time.perf_counter() - self._batch_created_at
+                if lingered_seconds >= self._profile.linger_ms / 1000:
+                    result = (self._batch, self._batch_indices)
+                    self._batch = None
+                    return result
+                timeout = self._profile.linger_ms / 1000 - lingered_seconds
+            else:
+                timeout = None
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> None:
+        while True:
+            batch, indices = await self._take()
+            data = batch.build()
+            self.sent_bytes += len(data)
+            await asyncio.sleep(self._rtt_seconds + len(data) / self._bytes_per_second)
+
+            delivered_at = time.perf_counter()
+            for index in indices:
+                self.delivered_at[index] = delivered_at
+
+
+async def _run(
+    cfg: _Benchmark,
+    profile: libs.kafka.producer.Profile,
+    messages: typing.Sequence[typing.Tuple[bytes, bytes]],
+) -> typing.Tuple[float, typing.Sequence[float], float]:
+    sender = _Sender(
+        profile=profile,
+        rtt_ms=cfg.rtt_ms,
+        bandwidth_mbit=cfg.bandwidth_mbit,
+        messages=len(messages),
+    )
+    sender_task = asyncio.get_event_loop().create_task(sender.run())
+
+    produced_at: typing.MutableSequence[float] = []
+    started_at = time.perf_counter()
+    for index, (key, value) in enumerate(messages):
+        # solutions come in at the burst rate, the loop catches up after every sleep
+        delay = started_at + index / cfg.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        produced_at.append(time.perf_counter())
+        sender.append(index, key, value)
+
+    while not all(sender.delivered_at):
+        await asyncio.sleep(0.001)
+    sender_task.cancel()
+
+    latencies = [delivered - produced for produced, delivered in zip(produced_at, sender.delivered_at)]
+    throughput = len(messages) / (max(sender.delivered_at) - started_at)
+    return throughput, latencies, sender.sent_bytes / len(messages)
+
+
+async def main(
+    cfg: Settings,
+) -> None:
+    logger = libs.logger.get(
+        name=cfg.log.name,
+        level=cfg.log.level,
+    )
+
+    messages = [
+        (str(height).encode(), _get_message(height))
+        for height in (random.randint(1, 10) for _ in range(cfg.benchmark.messages))
+    ]
+
+    logger.info(
+        f"{'profile':>10} {'codec':>5} {'msg/s':>8} {'p50, ms':>8} {'p99, ms':>8} {'B/msg':>6}"
+    )
+    for name in cfg.benchmark.profiles:
+        profile = libs.kafka.producer.PROFILES[name]
+        throughput, latencies, bytes_per_message = await _run(
+            cfg=cfg.benchmark,
+            profile=profile,
+            messages=messages,
+        )
+        latencies = sorted(latencies)
+        logger.info(
+            f"{name:>10} {profile.compression_type or '-':>5} {throughput:>8.0f} "
+            f"{statistics.median(latencies) * 1000:>8.2f} "
+            f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>8.2f} {bytes_per_message:>6.0f}"
+        )
+
+
+if __name__ == "__main__":
+    settings = simple_dataclass_settings.populate(Settings)
+    libs.logger.configure(
+        level=settings.log.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=settings,
+    ))
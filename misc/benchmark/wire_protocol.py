@@ -0,0 +1,124 @@
+import asyncio
+import time
+import typing
+
+import simple_dataclass_settings
+
+import definition.entity.job
+import definition.entity.solution
+import definition.entity.worker
+
+import libs.codec
+import libs.logger
+import libs.parsing
+
+
+@simple_dataclass_settings.settings
+class _Log:
+    name: str = "wire-protocol-benchmark"
+    level: str = "INFO"
+    root_level: str = "ERROR"
+
+
+@simple_dataclass_settings.settings
+class _Benchmark:
+    iterations: int = simple_dataclass_settings.field.int(
+        var="BENCHMARK_ITERATIONS",
+        default=100_000,
+    )
+
+
+@simple_dataclass_settings.settings
+class Settings:
+    log: _Log
+    benchmark: _Benchmark
+
+
+_EPOCH_CHALLENGE = {
+    "epoch_number": 123,
+    "epoch_block_hash": "ab1" * 21,
+    "degree": 8191,
+}
+_SOLUTION = {
+    "partial_solution": {
+        "address": "aleo1" + "x" * 58,
+        "nonce": 2 ** 63 + 12345,
+        "commitment": "puzzle1" + "y" * 60,
+    },
+    "proof.w": {
+        "x": "1" * 76,
+        "y": "2" * 76,
+        "infinity": False,
+    },
+}
+
+# frame name, inbound message class (None for outbound-only frames), frame content
+_FRAMES: typing.Sequence[typing.Tuple[str, typing.Optional[type], typing.Any]] = (
+    ("worker welcome", definition.entity.worker.Worker, {
+        "ip": "127.0.0.1",
+        "address": "127.0.0.1",
+        "hardware": "Test worker",
+        "hardware_id": "test-worker",
+        "caption": "BENCHMARK",
+    }),
+    ("worker job", None, definition.entity.job.JobOutput(
+        task_id="3f1c7a4e-8d2b-4c55-9a61-0e7b5d2f9c10",
+        epoch_challenge=_EPOCH_CHALLENGE,
+    )),
+    ("worker solution", definition.entity.solution.RawSolutionInput, {
+        "task_id": "3f1c7a4e-8d2b-4c55-9a61-0e7b5d2f9c10",
+        "solution": _SOLUTION,
+        "solution_target": 2 ** 40,
+    }),
+    ("node job", definition.entity.job.JobInput, {
+        "epoch_challenge": _EPOCH_CHALLENGE,
+        "proof_target": 2 ** 40,
+        "block_height": 123456,
+    }),
+    ("node solution", None, _SOLUTION),
+)
+
+
+def _measure(
+    fn: typing.Callable[[], typing.Any],
+    iterations: int,
+) -> float:
+    started_at = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started_at) / iterations
+
+
+async def main(
+    cfg: Settings,
+) -> None:
+    logger = libs.logger.get(
+        name=cfg.log.name,
+        level=cfg.log.level,
+    )
+
+    iterations = cfg.benchmark.iterations
+    logger.info(f"{'frame':>16} {'codec':>8} {'bytes':>6} {'encode, us':>11} {'decode+parse, us':>17}")
+    for name, message_cls, content in _FRAMES:
+        for codec in (libs.codec.JSON, libs.codec.MSGPACK):
+            frame = codec.dumps(content)
+            encode = _measure(lambda: codec.dumps(content), iterations)
+            if message_cls is None:
+                decode = _measure(lambda: codec.loads(frame), iterations)
+            else:
+                decode = _measure(lambda: libs.parsing.parse(message_cls, codec.loads(frame)), iterations)
+            logger.info(
+                f"{name:>16} {codec.name:>8} {len(frame):>6} "
+                f"{encode * 1_000_000:>11.2f} {decode * 1_000_000:>17.2f}"
+            )
+
+
+if __name__ == "__main__":
+    settings = simple_dataclass_settings.populate(Settings)
+    libs.logger.configure(
+        level=settings.log.root_level,
+    )
+
+    asyncio.run(main(
+        cfg=settings,
+    ))
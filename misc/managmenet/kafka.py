@@ -39,3 +39,19 @@ def ensure_topic(
         print(f"[Kafka] Topic \"{topic_name}\" already exists.")
     else:
         print(f"[Kafka] Topic \"{topic_name}\" created.")
+        return
+
+    try:
+        admin_client.create_partitions(
+            topic_partitions={
+                topic_name: kafka.admin.NewPartitions(
+                    total_count=num_partitions,
+                ),
+            },
+            validate_only=False,
+        )
+    except kafka.errors.InvalidPartitionsError:
+        # partitions can only be added, the topic already has as many or more
+        print(f"[Kafka] Topic \"{topic_name}\" partitions are kept.")
+    else:
+        print(f"[Kafka] Topic \"{topic_name}\" extended to {num_partitions} partitions.")
@@ -24,10 +24,35 @@ def create_exchange_and_queues(
         )
         print(f"[RabbitMQ] Exchange declared \"{exchange}\"")
 
+        # messages consumers reject after too many failed attempts are kept in "<queue>.dead"
+        dead_letter_exchange = f"{exchange}.dead"
+        await channel.exchange_declare(
+            exchange=dead_letter_exchange,
+            exchange_type="direct",
+            durable=True,
+        )
+        print(f"[RabbitMQ] Exchange declared \"{dead_letter_exchange}\"")
+
         for queue in queues:
+            dead_letter_queue = f"{queue}.dead"
+            await channel.queue_declare(
+                queue=dead_letter_queue,
+                durable=True,
+            )
+            await channel.queue_bind(
+                queue=dead_letter_queue,
+                exchange=dead_letter_exchange,
+                routing_key=queue,
+            )
+            print(f"[RabbitMQ] Queue declared \"{dead_letter_queue}\"")
+
             await channel.queue_declare(
                 queue=queue,
                 durable=True,
+                arguments={
+                    "x-dead-letter-exchange": dead_letter_exchange,
+                    "x-dead-letter-routing-key": queue,
+                },
             )
             await channel.queue_bind(
                 queue=queue,
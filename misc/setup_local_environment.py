@@ -39,6 +39,10 @@ class _Kafka:
         var="KAFKA_SOLUTION_TOPIC_RETENTION_MILLISECONDS",
         default=25 * 60 * 1000,
     )
+    solution_topic_partitions: int = simple_dataclass_settings.field.int(
+        var="KAFKA_SOLUTION_TOPIC_PARTITIONS",
+        default=6,
+    )
 
     job_topic: str = simple_dataclass_settings.field.str(
         var="KAFKA_JOB_TOPIC",
@@ -48,6 +52,10 @@ class _Kafka:
         var="KAFKA_JOB_TOPIC_RETENTION_MILLISECONDS",
         default=25 * 60 * 1000,
     )
+    job_topic_partitions: int = simple_dataclass_settings.field.int(
+        var="KAFKA_JOB_TOPIC_PARTITIONS",
+        default=6,
+    )
 
 
 @simple_dataclass_settings.settings
@@ -107,6 +115,7 @@ def setup(
         user=cfg.kafka.user,
         password=cfg.kafka.password,
         topic_name=cfg.kafka.solution_topic,
+        num_partitions=cfg.kafka.solution_topic_partitions,
         topic_retention_milliseconds=cfg.kafka.solution_topic_retention_milliseconds,
     )
     misc.managmenet.kafka.ensure_topic(
@@ -114,6 +123,7 @@ def setup(
         user=cfg.kafka.user,
         password=cfg.kafka.password,
         topic_name=cfg.kafka.job_topic,
+        num_partitions=cfg.kafka.job_topic_partitions,
         topic_retention_milliseconds=cfg.kafka.job_topic_retention_milliseconds,
     )
 